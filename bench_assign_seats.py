@@ -0,0 +1,89 @@
+"""Benchmark guest_seat_gem.assign_seats against the old per-group concat loop.
+
+Usage: python bench_assign_seats.py
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+import guest_seat_gem
+from guest_seat_gem import STANDARD_TABLE_CAPACITY, DIRAJA_TABLE_CAPACITY
+
+SCALES = [(500, 50), (5000, 500), (50000, 5000)]  # (guests, group files)
+MENUS = ['Daging', 'Ayam', 'Ikan', 'Vegetarian']
+
+def legacy_assign_seats(guests_df):
+    """The per-group assign_seats loop this benchmark compares against."""
+    main_guests = []
+    table_counter = guests_df['gp_id'].min()
+
+    for gp_id, group_df in guests_df.groupby('gp_id'):
+        table_counter = max(table_counter, gp_id)
+        group_df = group_df.sort_values(by='original_order').reset_index(drop=True)
+        gp_name = group_df['gp_name'].iloc[0]
+
+        if gp_name.lower() == "diraja" or gp_name.lower() == "ramli":
+            guests_per_table = DIRAJA_TABLE_CAPACITY
+        else:
+            guests_per_table = STANDARD_TABLE_CAPACITY
+
+        num_guests = len(group_df)
+        num_tables = (num_guests + guests_per_table - 1) // guests_per_table
+        remaining_seats = num_tables * guests_per_table - num_guests
+
+        if remaining_seats > 0:
+            reserve_data = [{'name': 'Simpanan', 'menu': 'N/A', 'gp_id': 0, 'gp_name': 'RESERVE_SEAT', 'original_order': -1}] * remaining_seats
+            group_df = pd.concat([group_df, pd.DataFrame(reserve_data)], ignore_index=True)
+
+        for table_num_in_group in range(num_tables):
+            start_index = table_num_in_group * guests_per_table
+            table_df = group_df.iloc[start_index:start_index + guests_per_table].copy()
+            table_df['table_number'] = table_counter
+            table_df['seat'] = table_df.index - start_index + 1
+            main_guests.append(table_df)
+            table_counter += 1
+
+    main_guests_df = pd.concat(main_guests, ignore_index=True)
+    main_guests_df = main_guests_df.sort_values(by=['table_number', 'seat']).reset_index(drop=True)
+    return main_guests_df[['table_number', 'seat', 'name', 'menu', 'gp_id', 'gp_name']]
+
+def make_guests(num_guests, num_groups, seed=0):
+    """Random guests spread over num_groups groups, shaped like process_guest_files output."""
+    rng = np.random.default_rng(seed)
+    gp_ids = np.sort(rng.choice(np.arange(1, num_groups * 2), size=num_groups, replace=False))
+    gp_names = np.array([f'group{i}' for i in range(num_groups)], dtype=object)
+    gp_names[::97] = 'Diraja'
+
+    # Every group gets at least one guest, the rest are spread unevenly
+    group_of_guest = np.concatenate([np.arange(num_groups), rng.integers(0, num_groups, num_guests - num_groups)])
+    group_of_guest.sort()
+
+    return pd.DataFrame({
+        'name': [f'Guest {i}' for i in range(num_guests)],
+        'menu': rng.choice(MENUS, size=num_guests),
+        'gp_id': gp_ids[group_of_guest],
+        'gp_name': gp_names[group_of_guest],
+        'original_order': np.arange(num_guests),
+    })
+
+def best_of(fn, df, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(df.copy())
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+if __name__ == '__main__':
+    print(f"{'guests':>8} {'groups':>7} {'legacy (s)':>11} {'vectorized (s)':>15} {'speed-up':>9}")
+    for num_guests, num_groups in SCALES:
+        guests_df = make_guests(num_guests, num_groups)
+        repeat = 1 if num_guests >= 50000 else 3
+        old_df, old_time = best_of(legacy_assign_seats, guests_df, repeat)
+        new_df, new_time = best_of(guest_seat_gem.assign_seats, guests_df, repeat)
+
+        # Same bytes as the old guest_seat.csv
+        assert old_df.to_csv(index=False) == new_df.to_csv(index=False), "outputs differ"
+
+        print(f"{num_guests:>8} {num_groups:>7} {old_time:>11.3f} {new_time:>15.4f} {old_time / new_time:>8.0f}x")
@@ -0,0 +1,114 @@
+"""Load test for checkin_server.py: CLIENTS door tablets checking guests in at the same time.
+
+Starts the server on a local port over a throw-away seating database and has every client
+check in its share of the guests by name over one keep-alive connection, as a tablet would.
+
+Usage: python bench_checkin.py [--guests 2000] [--clients 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from contextlib import closing
+
+import checkin_server
+import seating_db
+from bench_seat_summary import make_seating
+
+GUESTS = 2000
+CLIENTS = 10
+
+async def tablet(port, names, latencies):
+    """One door tablet: check every name in, one request at a time."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    statuses = []
+    for name in names:
+        body = json.dumps({'name': name}).encode('utf-8')
+        start = time.perf_counter()
+        writer.write(b'POST /checkin HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+                     + f'Content-Length: {len(body)}\r\n\r\n'.encode() + body)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while (line := await reader.readline()) not in (b'\r\n', b''):
+            if line.lower().startswith(b'content-length:'):
+                length = int(line.split(b':')[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+        statuses.append(status)
+    writer.close()
+    return statuses
+
+async def check_failed_commit(db_file):
+    """A repeat check-in during a commit that then fails gets the error too, not "already"."""
+    server = checkin_server.CheckinServer(db_file)
+    committing = asyncio.Event()
+
+    def failing_commit(guest_ids):
+        committing.set()
+        time.sleep(0.2)
+        raise OSError('disk full')
+
+    server._commit = failing_commit
+    listener = await server.start('127.0.0.1', 0)
+    guest = next(iter(server.index.guests.values()))
+    first = asyncio.create_task(server.check_in(guest))
+    await committing.wait()
+    repeat = asyncio.create_task(server.check_in(guest))
+    results = await asyncio.gather(first, repeat, return_exceptions=True)
+    listener.close()
+    await listener.wait_closed()
+    server.close()
+    assert all(isinstance(result, OSError) for result in results), results
+    assert guest['guest_id'] not in server.checked_in and not server.pending
+
+async def run(num_guests, num_clients, db_file):
+    seating = make_seating(num_guests)
+    # Vacant seats as well, whose NULL guest_id once made the ids lose precision
+    seating.loc[seating.index % 50 == 7, ['name', 'gp_id', 'gp_name']] = [seating_db.VACANT_NAME, *seating_db.VACANT_GROUP]
+    with closing(seating_db.connect(db_file)) as conn:
+        seating_db.import_seating(conn, seating)
+    names = seating.loc[~seating['name'].isin(['Simpanan', seating_db.VACANT_NAME]), 'name'].tolist()
+
+    await check_failed_commit(db_file)
+    server = checkin_server.CheckinServer(db_file)
+    listener = await server.start('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+
+    # A malformed request gets an answer, not a dropped connection
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b'POST /checkin HTTP/1.1\r\nHost: localhost\r\nContent-Length: abc\r\n\r\n')
+    await writer.drain()
+    assert int((await reader.readline()).split()[1]) == 400
+    writer.close()
+
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*(tablet(port, names[i::num_clients], latencies) for i in range(num_clients)))
+    elapsed = time.perf_counter() - start
+    batches = server.batches
+    listener.close()
+    await listener.wait_closed()
+    server.close()
+
+    with closing(seating_db.connect(db_file)) as conn:
+        stored = conn.execute('SELECT COUNT(*) FROM attendance WHERE tindakan = ?', (seating_db.CHECKED_IN,)).fetchone()[0]
+    ok = sum(status == 200 for statuses in results for status in statuses)
+    latencies.sort()
+    print(f"{len(names)} check-ins from {num_clients} clients in {elapsed:.2f}s "
+          f"= {len(names) / elapsed * 60:,.0f} per minute")
+    print(f"latency p50 {statistics.median(latencies) * 1000:.0f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:.0f} ms")
+    print(f"{ok} answered 200, {stored} attendance rows stored in {batches} commits")
+    assert ok == stored == len(names)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load test the door check-in server.")
+    parser.add_argument('--guests', type=int, default=GUESTS)
+    parser.add_argument('--clients', type=int, default=CLIENTS)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as folder:
+        asyncio.run(run(args.guests, args.clients, os.path.join(folder, 'seating.db')))
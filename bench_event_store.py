@@ -0,0 +1,71 @@
+"""Compare loading the seating from guest_seat.csv (pandas type guessing) and from the event store.
+
+Usage: python bench_event_store.py
+"""
+import csv
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import event_store
+import seat_alloc
+from bench_seat_summary import make_seating
+
+SEAT_COUNTS = [10000, 100000, 1000000]
+REPEATS = 3
+
+def best_time(fn):
+    """Best wall time of REPEATS calls, and the last result."""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def frame_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+def check_seat_alloc_csv(folder, store_file):
+    """A guest_seat.csv written by seat_alloc.py after the store (no gp_id or gp_name) is read,
+    its seats in the reserve group."""
+    csv_file = os.path.join(folder, 'guest_seat.csv')
+    bookings = [('Ali', 3, 'Tetamu'), ('Siti', 0, 'Tajaan'), ('Abu', 9, 'Tajaan'), ('Chong', 2, 'Tetamu')]
+    with open(csv_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(seat_alloc.FIELDNAMES)
+        writer.writerows(seat_alloc.seat_rows(bookings))
+    os.utime(csv_file, ns=(os.stat(store_file).st_mtime_ns + 10**9,) * 2)
+    assert event_store.seating_file(store_file, csv_file, None) == csv_file
+    df = event_store.load_seating(csv_file)
+    expected = pd.read_csv(csv_file, keep_default_na=False)
+    assert list(df.columns) == event_store.SEATING_SCHEMA.names
+    assert (df['name'].astype(str).to_numpy() == expected['name'].to_numpy()).all()
+    assert (df['table_number'].to_numpy() == expected['table_number'].to_numpy()).all()
+    assert (df['gp_id'] == event_store.RESERVE_GROUP['gp_id']).all()
+    assert (df['gp_name'] == event_store.RESERVE_GROUP['gp_name']).all()
+    assert df['guest_id'].is_unique
+
+if __name__ == '__main__':
+    print(f"{'seats':>8} {'csv MB':>7} {'parquet MB':>11} {'csv load (s)':>13} {'store load (s)':>15} "
+          f"{'csv frame MB':>13} {'store frame MB':>15}")
+    with tempfile.TemporaryDirectory() as folder:
+        csv_file = os.path.join(folder, 'guest_seat.csv')
+        store_file = os.path.join(folder, 'guest_seat.parquet')
+        for num_seats in SEAT_COUNTS:
+            df = make_seating(num_seats)
+            event_store.write_seating(df, store_file, csv_file)
+
+            csv_time, csv_df = best_time(lambda: pd.read_csv(csv_file))
+            store_time, store_df = best_time(lambda: event_store.load_seating(store_file))
+
+            assert (store_df['name'].astype(str).to_numpy() == csv_df['name'].to_numpy()).all()
+            assert (store_df['table_number'].to_numpy() == csv_df['table_number'].to_numpy()).all()
+            assert store_df['guest_id'].is_unique
+            print(f"{num_seats:>8} {os.path.getsize(csv_file) / 1e6:>7.1f} {os.path.getsize(store_file) / 1e6:>11.1f} "
+                  f"{csv_time:>13.3f} {store_time:>15.3f} {frame_mb(csv_df):>13.1f} {frame_mb(store_df):>15.1f}")
+        check_seat_alloc_csv(folder, store_file)
+        print("seat_alloc.py CSV newer than the store: read, reserve groups filled in")
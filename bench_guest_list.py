@@ -0,0 +1,89 @@
+"""Time the old guest_list (list of dicts, drawString per cell) against the streaming generate_guest_list.
+
+Usage: python bench_guest_list.py [--run-rows N]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from reportlab.pdfgen import canvas
+
+from guest_list import RUN_ROWS, generate_guest_list, read_guest_rows
+
+GUEST_COUNTS = [1000, 10000, 100000]
+TITLES = ['', '', '', "Dato' ", 'Datuk ', 'Tan Sri ', 'Dr ', 'Puan ']
+FIRST_NAMES = ['Ahmad', 'abdul', 'Siti', 'Mohd', 'Nur', 'Lim', 'Raj', 'Zainab', 'Émilie', 'Tan']
+LAST_NAMES = ['Bin Ali', 'Binti Hassan', 'Kumar', 'Wei Ming', 'Bin Abu', 'Abdullah', 'Ismail']
+
+def write_seating(path, num_guests, seed=0):
+    """Write a guest_seat.csv shaped file with num_guests titled, mixed-case names."""
+    rng = np.random.default_rng(seed)
+    names = (np.array(TITLES)[rng.integers(0, len(TITLES), num_guests)].astype(object)
+             + np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), num_guests)].astype(object) + ' '
+             + np.array(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), num_guests)].astype(object) + ' '
+             + np.arange(num_guests).astype(str).astype(object))
+    pd.DataFrame({
+        'table_number': np.arange(num_guests) // 8 + 1,
+        'seat': np.arange(num_guests) % 8 + 1,
+        'name': names,
+        'menu': 'Daging',
+        'gp_id': 1,
+        'gp_name': 'group',
+    }).to_csv(path, index=False)
+
+def legacy_guest_list(csv_file, output_file):
+    """The old generate_guest_list."""
+    guests = read_guest_rows(csv_file)
+    guests.sort(key=lambda x: x['name'])
+
+    c = canvas.Canvas(output_file)
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(150, 750, "Senarai Tetamu")
+    c.setFont("Helvetica", 10)
+    c.drawString(150, 735, f"Berakhir pada: {datetime.now().strftime('%d-%m-%Y %H:%M:%S')}")
+    c.setFont("Helvetica-Bold", 13)
+    c.drawString(50, 700, "Tetamu")
+    c.drawString(350, 700, "Meja")
+    c.drawString(400, 700, "Siri")
+
+    c.setFont("Helvetica", 12)
+    y_position = 685
+    for guest in guests:
+        c.drawString(50, y_position, guest['name'])
+        c.drawString(350, y_position, guest['table'])
+        c.drawString(400, y_position, guest['seat'])
+        y_position -= 15
+        if y_position < 50:
+            c.showPage()
+            c.setFont("Helvetica", 12)
+            y_position = 750
+    c.save()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--run-rows', type=int, default=RUN_ROWS,
+                        help="rows sorted in memory per run (lower it to exercise the on-disk merge)")
+    args = parser.parse_args()
+
+    print(f"{'guests':>7} {'legacy (s)':>11} {'streaming (s)':>14} {'speed-up':>9} {'pdf size':>10}")
+    with tempfile.TemporaryDirectory() as folder:
+        seating_file = os.path.join(folder, 'guest_seat.csv')
+        for num_guests in GUEST_COUNTS:
+            write_seating(seating_file, num_guests)
+
+            start = time.perf_counter()
+            legacy_guest_list(seating_file, os.path.join(folder, 'legacy.pdf'))
+            legacy_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            count = generate_guest_list(seating_file, os.path.join(folder, 'streaming.pdf'), run_rows=args.run_rows)
+            streaming_time = time.perf_counter() - start
+
+            assert count == num_guests, "guests missing from the list"
+            size = os.path.getsize(os.path.join(folder, 'streaming.pdf'))
+            print(f"{num_guests:>7} {legacy_time:>11.2f} {streaming_time:>14.2f} "
+                  f"{legacy_time / streaming_time:>8.1f}x {size / 1024:>8.0f}kB")
@@ -0,0 +1,62 @@
+"""Time main.py's old str.contains filter against a guest_search.GuestIndex lookup.
+
+Usage: python bench_guest_search.py
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from guest_search import GuestIndex
+
+GUEST_COUNTS = [1000, 10000, 100000]
+QUERIES = ['ahmad', 'ahmd', "dato' siti", 'kol', '12', 'intake27']
+FIRST_NAMES = np.array(['Ahmad', 'Siti', 'Mohd', 'Nur', 'Azman', 'Rubendran', 'Tan', 'Zainal', 'Hafiz', 'Aisyah'])
+TITLES = np.array(['', '', '', "Dato' ", 'Dr ', 'Tan Sri ', 'Puan '])
+RANKS = np.array(['', '', ' Kol (B)', ' Lt Jen (B)', ' Kapten'])
+MENUS = np.array(['Daging', 'Ayam', 'Ikan', 'Vegetarian'])
+
+def make_guests(num_guests, seed=0):
+    """A main.py shaped DataFrame (Nama, Meja, Menu, Kluster)."""
+    rng = np.random.default_rng(seed)
+    first = FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), num_guests)]
+    father = FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), num_guests)]
+    names = (TITLES[rng.integers(0, len(TITLES), num_guests)] + first + ' ' + rng.integers(0, 10000, num_guests).astype(str).astype(object)
+             + ' Bin ' + father + RANKS[rng.integers(0, len(RANKS), num_guests)])
+    return pd.DataFrame({
+        'Nama': names,
+        'Meja': np.arange(num_guests) // 10 + 1,
+        'Menu': MENUS[rng.integers(0, len(MENUS), num_guests)],
+        'Kluster': 'intake' + (np.arange(num_guests) // 40 % 60).astype(str).astype(object),
+    })
+
+def legacy_search(df, query):
+    """The old main.py filter over every column in turn."""
+    hits = pd.Series(False, index=df.index)
+    for column in df.columns:
+        hits |= df[column].astype(str).str.contains(query, case=False, na=False)
+    return df[hits]
+
+if __name__ == '__main__':
+    print(f"{'guests':>7} {'build (s)':>10} {'contains (ms)':>14} {'index (ms)':>11} {'speed-up':>9}")
+    for num_guests in GUEST_COUNTS:
+        df = make_guests(num_guests)
+
+        start = time.perf_counter()
+        index = GuestIndex(df)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for query in QUERIES:
+            legacy_search(df, query)
+        legacy_time = (time.perf_counter() - start) / len(QUERIES)
+
+        start = time.perf_counter()
+        for query in QUERIES:
+            index.search(query)
+        index_time = (time.perf_counter() - start) / len(QUERIES)
+
+        # Every guest the old filter finds by name is also found by the index
+        found = set(index.search('ahmad', limit=num_guests).index)
+        assert set(legacy_search(df[['Nama']], 'ahmad').index) <= found
+        print(f"{num_guests:>7} {build_time:>10.2f} {legacy_time * 1000:>14.1f} {index_time * 1000:>11.1f} {legacy_time / index_time:>8.1f}x")
@@ -0,0 +1,83 @@
+"""Time guest_seat_pdf.generate_pdf in one process vs page-aligned chunks in a process pool.
+
+Usage: python bench_guest_seat_pdf.py [--workers N]
+"""
+import argparse
+import io
+import os
+import re
+import tempfile
+import time
+
+from reportlab.pdfgen import canvas
+
+from guest_seat_pdf import MAX_WORKERS, generate_pdf
+from pdf_concat import concat_pdfs, page_numbers, read_objects
+
+TABLE_COUNTS = [60, 600, 6000]
+SEATS_PER_TABLE = 8
+MENUS = ['Daging', 'Ayam', 'Ikan', 'Vegetarian']
+
+def make_guests(num_tables):
+    """A table -> entries mapping shaped like read_guest_list's, with full tables."""
+    return {
+        str(table): {
+            'gp_name': f'group{(table - 1) // 3 + 1}',
+            'entries': [(f'Guest {table}-{seat} Bin Abu', str(seat), MENUS[(table + seat) % len(MENUS)])
+                        for seat in range(1, SEATS_PER_TABLE + 1)],
+        }
+        for table in range(1, num_tables + 1)
+    }
+
+def page_contents(pdf_file):
+    """The content stream of every page, in page order, to check both paths lay out the same."""
+    with open(pdf_file, 'rb') as f:
+        objects, root = read_objects(f.read())
+    contents = []
+    for num in page_numbers(objects, root):
+        ref = int(re.search(rb'/Contents\s+(\d+)\s+0\s+R', objects[num]).group(1))
+        contents.append(objects[ref].split(b'stream', 1)[1])
+    return contents
+
+def check_endobj_in_stream(folder):
+    """A part whose page content holds the word endobj is joined whole."""
+    parts = []
+    for text, compress in (('guest endobj 1', 0), ('guest 2', 1)):
+        buffer = io.BytesIO()
+        c = canvas.Canvas(buffer, pageCompression=compress)
+        c.drawString(100, 100, text)
+        c.showPage()
+        c.save()
+        parts.append(buffer.getvalue())
+    output = os.path.join(folder, 'joined.pdf')
+    assert concat_pdfs(parts, output) == 2
+    assert b'(guest endobj 1) Tj' in page_contents(output)[0], "stream cut at endobj"
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+
+    print(f"workers: {args.workers}")
+    print(f"{'tables':>6} {'pages':>6} {'single (s)':>11} {'chunked (s)':>12} {'speed-up':>9}")
+    with tempfile.TemporaryDirectory() as folder:
+        single_file = os.path.join(folder, 'single.pdf')
+        chunked_file = os.path.join(folder, 'chunked.pdf')
+        check_endobj_in_stream(folder)
+        for num_tables in TABLE_COUNTS:
+            guests = make_guests(num_tables)
+
+            start = time.perf_counter()
+            generate_pdf(guests, single_file, workers=1)
+            single_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            generate_pdf(guests, chunked_file, workers=args.workers)
+            chunked_time = time.perf_counter() - start
+
+            # Page 1 carries the timestamp, which may tick over between the two runs
+            single_pages, chunked_pages = page_contents(single_file), page_contents(chunked_file)
+            assert len(single_pages) == len(chunked_pages), "chunked PDF has a different page count"
+            assert single_pages[1:] == chunked_pages[1:], "chunked PDF pages differ"
+            print(f"{num_tables:>6} {len(single_pages):>6} {single_time:>11.2f} {chunked_time:>12.2f} "
+                  f"{single_time / chunked_time:>8.2f}x")
@@ -0,0 +1,70 @@
+"""Time reading tempahan group files: one pd.read_csv per file vs guest_loader.load_group_files.
+
+Usage: python bench_ingest.py
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from guest_loader import DEFAULT_MENU, list_group_files, load_group_files, parse_group_filename
+from guest_seat_gem import clean_guest_data
+
+FILE_COUNTS = [10, 1000, 10000]
+MENUS = ['Daging', 'Ayam', 'Ikan', 'Vegetarian']
+
+def write_group_files(folder, num_files, seed=0):
+    """Write num_files small grpN-name.csv files of 1 to 16 guests."""
+    rng = np.random.default_rng(seed)
+    for i in range(1, num_files + 1):
+        size = int(rng.integers(1, 17))
+        rows = [f" guest {i} {j} bin abu , {MENUS[(i + j) % len(MENUS)]}" for j in range(size)]
+        with open(os.path.join(folder, f'grp{i}-group{i}.csv'), 'w', encoding='utf-8') as f:
+            f.write('name,menu\n' + '\n'.join(rows) + '\n')
+
+def sequential_load(folder):
+    """The old process_guest_files intake: read, clean and tag one file at a time."""
+    guests = []
+    for file in list_group_files(folder):
+        group_df = clean_guest_data(pd.read_csv(os.path.join(folder, file)))
+        gp_id, gp_name = parse_group_filename(file)
+        group_df['gp_id'] = gp_id
+        group_df['gp_name'] = gp_name
+        guests.append(group_df)
+    guests_df = pd.concat(guests, ignore_index=True)
+    guests_df['original_order'] = range(len(guests_df))
+    return guests_df
+
+def check_untidy_file():
+    """A group file with a row missing its menu is read, that guest on DEFAULT_MENU, not refused."""
+    with tempfile.TemporaryDirectory() as folder:
+        write_group_files(folder, 3)
+        with open(os.path.join(folder, 'grp2-group2.csv'), 'a', encoding='utf-8') as f:
+            f.write('tetamu tanpa menu\n')
+        old_df = sequential_load(folder)
+        new_df = load_group_files(folder)
+        assert old_df[['name', 'gp_id', 'gp_name']].astype(str).equals(
+            new_df[['name', 'gp_id', 'gp_name']].astype(str)), "loaders disagree on a short row"
+        short = new_df['name'] == 'Tetamu Tanpa Menu'
+        assert short.sum() == 1 and (new_df.loc[short, 'menu'] == DEFAULT_MENU).all()
+
+if __name__ == '__main__':
+    check_untidy_file()
+    print(f"{'files':>6} {'guests':>7} {'sequential (s)':>15} {'load_group_files (s)':>21} {'speed-up':>9}")
+    for num_files in FILE_COUNTS:
+        with tempfile.TemporaryDirectory() as folder:
+            write_group_files(folder, num_files)
+
+            start = time.perf_counter()
+            old_df = sequential_load(folder)
+            old_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            new_df = load_group_files(folder)
+            new_time = time.perf_counter() - start
+
+            assert old_df[['name', 'menu', 'gp_id', 'gp_name']].astype(str).equals(
+                new_df[['name', 'menu', 'gp_id', 'gp_name']].astype(str)), "loaders disagree"
+            print(f"{num_files:>6} {len(new_df):>7} {old_time:>15.3f} {new_time:>21.3f} {old_time / new_time:>8.1f}x")
@@ -0,0 +1,54 @@
+"""Time name_normalizer with a large alias table against one regex pass per alias (the old sed approach).
+
+Usage: python bench_name_normalizer.py
+"""
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from name_normalizer import build_normalizer, load_aliases, normalize_series
+
+NUM_NAMES = 50000
+ALIAS_COUNTS = [31, 300, 1000, 5000]
+SEQUENTIAL_LIMIT = 300  # one pass per alias gets too slow to wait for beyond this
+
+def random_words(rng, count, length):
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    return [''.join(rng.choice(letters, size=length)) for _ in range(count)]
+
+def sequential_replace(series, aliases):
+    """One case-insensitive regex pass per alias, like the old sed block."""
+    for alias, replacement in aliases.items():
+        series = series.str.replace(re.escape(alias), replacement.replace('\\', r'\\'), flags=re.IGNORECASE, regex=True)
+    return series
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    base_aliases = load_aliases()
+    extra_words = random_words(rng, max(ALIAS_COUNTS), 6)
+    vocabulary = np.array(random_words(rng, 20000, 7) + extra_words[:2000] + list(base_aliases), dtype=object)
+    names = pd.Series([' '.join(words).title() for words in rng.choice(vocabulary, size=(NUM_NAMES, 4))])
+
+    print(f"{'aliases':>8} {'compile (s)':>12} {'normalize (s)':>14} {'one pass per alias (s)':>23}")
+    for count in ALIAS_COUNTS:
+        aliases = dict(base_aliases)
+        aliases.update({word: word.upper() for word in extra_words[:count - len(base_aliases)]})
+
+        start = time.perf_counter()
+        normalize = build_normalizer(aliases)
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        normalize_series(names, normalize)
+        normalize_time = time.perf_counter() - start
+
+        if count <= SEQUENTIAL_LIMIT:
+            start = time.perf_counter()
+            sequential_replace(names, aliases)
+            sequential = f"{time.perf_counter() - start:.2f}"
+        else:
+            sequential = 'skipped'
+
+        print(f"{count:>8} {compile_time:>12.3f} {normalize_time:>14.3f} {sequential:>23}")
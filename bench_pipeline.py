@@ -0,0 +1,108 @@
+"""Time every pipeline script on synthetic events of 500, 5k and 50k guests.
+
+Each scale gets a fresh event folder from make_synthetic_event.py. Every stage runs as
+its own process in that folder, as proc.sh runs it, so a time includes the imports;
+the peak RSS is that process's own. Results go to bench_pipeline.json as well as the console.
+
+Usage: python bench_pipeline.py [--guests 500 5000] [--stages guest_list guest_tab_tag] [--keep DIR]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import make_synthetic_event
+
+SCALES = [500, 5000, 50000]
+RESULTS_FILE = 'bench_pipeline.json'
+STAGE_TIMEOUT = 900  # seconds before a stage is reported as timed out
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# In run order: the other assigners first, since they overwrite guest_seat.csv,
+# then guest_seat_gem, whose seating every later stage reads.
+STAGES = [
+    ('seat_alloc', 'seat_alloc.py'),
+    ('guest_seat_gemini', 'guest_seat_gemini.py'),
+    ('guest_seat_gem', 'guest_seat_gem.py'),
+    ('guest_seat_pdf', 'guest_seat_pdf.py'),
+    ('guest_summary', 'guest_summary.py'),
+    ('guest_summary_v1', 'guest_summary_v1.py'),
+    ('guest_seat_analyzer', 'guest_seat_analyzer.py'),
+    ('guest_list', 'guest_list.py'),
+    ('guest_tab_tag', 'guest_tab_tag.py'),
+]
+
+def run_stage(script, folder):
+    """Run one script in folder; returns (wall seconds, CPU seconds, peak RSS MB, exit code, output tail)."""
+    log_path = os.path.join(folder, f'{script}.log')
+    start = time.perf_counter()
+    with open(log_path, 'wb') as log:
+        proc = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, script)], cwd=folder,
+                                stdout=log, stderr=subprocess.STDOUT)
+        deadline = start + STAGE_TIMEOUT
+        while True:
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.perf_counter() > deadline:
+                proc.kill()
+                pid, status, usage = os.wait4(proc.pid, 0)
+                break
+            time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    with open(log_path, encoding='utf-8', errors='replace') as f:
+        tail = f.read()[-300:].strip()
+    return elapsed, usage.ru_utime + usage.ru_stime, usage.ru_maxrss / 1024, proc.returncode, tail
+
+def bench_scale(num_guests, stages, folder):
+    """Build an event of num_guests in folder and time each stage on it."""
+    num_groups = make_synthetic_event.make_event(folder, num_guests)
+    results = []
+    for name, script in stages:
+        wall, cpu, peak_mb, code, tail = run_stage(script, folder)
+        result = {'guests': num_guests, 'groups': num_groups, 'stage': name, 'wall_s': round(wall, 3),
+                  'cpu_s': round(cpu, 3), 'peak_rss_mb': round(peak_mb, 1), 'exit_code': code}
+        if code != 0:
+            result['error'] = tail
+        results.append(result)
+        status = '' if code == 0 else f"  ❌ exit {code}"
+        print(f"{num_guests:>7} {name:<20} {wall:>8.2f} {cpu:>8.2f} {peak_mb:>9.0f}{status}")
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time each pipeline stage on synthetic events.")
+    parser.add_argument('--guests', type=int, nargs='+', default=SCALES)
+    parser.add_argument('--stages', nargs='+', choices=[name for name, _ in STAGES],
+                        help="only these stages (guest_seat_gem is still needed for the ones after it)")
+    parser.add_argument('--output', default=RESULTS_FILE)
+    parser.add_argument('--keep', help="write the events under this folder and keep them")
+    args = parser.parse_args()
+
+    stages = [(name, script) for name, script in STAGES if not args.stages or name in args.stages]
+    root = args.keep or tempfile.mkdtemp(prefix='bench_pipeline_')
+    print(f"{'guests':>7} {'stage':<20} {'wall (s)':>8} {'cpu (s)':>8} {'peak MB':>9}")
+    results = []
+    try:
+        for num_guests in args.guests:
+            results.extend(bench_scale(num_guests, stages, os.path.join(root, f'event{num_guests}')))
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.output}")
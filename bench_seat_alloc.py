@@ -0,0 +1,61 @@
+"""Time seat_alloc's streaming and batch modes on a tempahan.csv of 1M booked seats, with peak memory.
+
+Each mode runs in a fresh process so its peak resident memory can be read on its own.
+
+Usage: python bench_seat_alloc.py
+"""
+import filecmp
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import seat_alloc
+
+BOOKED_SEATS = 1000000
+CATEGORIES = ['Tajaan', 'Tetamu']
+
+def make_bookings(csv_file, booked_seats, seed=0):
+    """Bookings of 1 to 12 guests (most of 1 to 4) adding up to booked_seats, with some
+    bookings of 0 guests, some blank counts (1 guest) and some blank categories."""
+    rng = np.random.default_rng(seed)
+    sizes = rng.choice(np.arange(0, 13), size=booked_seats,
+                       p=np.array([1, 6, 8, 6, 8, 3, 3, 2, 4, 1, 1, 1, 1]) / 45)
+    sizes = sizes[:np.searchsorted(np.cumsum(sizes), booked_seats) + 1]
+    sizes[-1] -= sizes.sum() - booked_seats
+    counts = sizes.astype(str).astype(object)
+    counts[(sizes == 1) & (rng.random(len(sizes)) < 0.2)] = ''
+    pd.DataFrame({
+        'Nama': [f'booking {i}' for i in range(len(sizes))],
+        'Kategori': rng.choice(CATEGORIES + [''], size=len(sizes), p=[0.45, 0.45, 0.1]),
+        'Bil_tetamu': counts,
+        'Wakil': 'Sekretariat',
+    }).to_csv(csv_file, index=False)
+    return len(sizes)
+
+def run_mode(batch, csv_file, output_file):
+    """Worker entry point: seat the file, return (seconds, peak RSS in MB)."""
+    start = time.perf_counter()
+    seat_alloc.main(batch, csv_file, output_file)
+    elapsed = time.perf_counter() - start
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as folder:
+        csv_file = os.path.join(folder, 'tempahan.csv')
+        num_bookings = make_bookings(csv_file, BOOKED_SEATS)
+        print(f"{num_bookings} bookings, {BOOKED_SEATS} booked seats")
+        print(f"{'mode':<8} {'seconds':>8} {'rows/s':>10} {'peak RSS MB':>12}")
+        outputs = {}
+        for mode, batch in (('stream', False), ('batch', True)):
+            outputs[mode] = os.path.join(folder, f'{mode}.csv')
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                elapsed, peak_mb = pool.submit(run_mode, batch, csv_file, outputs[mode]).result()
+            with open(outputs[mode]) as f:
+                rows = sum(1 for _ in f) - 1
+            print(f"{mode:<8} {elapsed:>8.2f} {rows / elapsed:>10.0f} {peak_mb:>12.0f}")
+        assert filecmp.cmp(outputs['stream'], outputs['batch'], shallow=False), "modes disagree"
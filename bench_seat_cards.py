@@ -0,0 +1,178 @@
+"""Time the seat card PDF for 5,000 guests against drawing every card as a fresh QR drawing,
+after checking that a card's QR id finds its guest at the check-in server and is stored, and
+that seat_cards.py's QR codes and text (drawn through reportlab internals) still come out
+as reportlab's public QrCodeWidget and canvas would draw them.
+
+Usage: python bench_seat_cards.py
+"""
+import io
+import os
+import re
+import tempfile
+import time
+import zlib
+from contextlib import closing
+
+from reportlab.graphics import renderPDF
+from reportlab.graphics.barcode.qr import QrCodeWidget
+from reportlab.graphics.shapes import Drawing
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+import checkin_server
+import event_store
+import seat_cards
+import seating_db
+from bench_seat_summary import make_seating
+
+NUM_CARDS = 5000
+BASELINE_CARDS = 500  # the widget-per-card way is timed on fewer cards and scaled up
+
+def widget_cards(cards):
+    """The straightforward way: every card drawn from scratch, the QR code as a widget Drawing."""
+    card_w, card_h = seat_cards.card_size()
+    origins = seat_cards.card_origins()
+    c = canvas.Canvas(io.BytesIO(), pagesize=A4)
+    for i, (guest_id, name, group, table, seat, menu) in enumerate(cards):
+        slot = i % len(origins)
+        if i and slot == 0:
+            c.showPage()
+        x, y = origins[slot]
+        c.rect(x, y, card_w, card_h)
+        c.setFont('Helvetica', 8)
+        c.drawString(x + 14, y + card_h - 22, seat_cards.EVENT_TITLE)
+        c.setFont('Helvetica-Bold', 13)
+        c.drawString(x + 14, y + card_h - 46, name)
+        c.setFont('Helvetica', 9)
+        c.drawString(x + 14, y + card_h - 60, group)
+        c.setFont('Helvetica-Bold', 28)
+        c.drawString(x + 14, y + 38, table)
+        c.drawString(x + 84, y + 38, seat)
+        c.setFont('Helvetica-Bold', 12)
+        c.drawString(x + 44, y + 26, menu)
+        drawing = Drawing(seat_cards.QR_SIZE, seat_cards.QR_SIZE)
+        drawing.add(QrCodeWidget(str(guest_id), barLevel=seat_cards.QR_LEVEL,
+                                 barWidth=seat_cards.QR_SIZE, barHeight=seat_cards.QR_SIZE))
+        renderPDF.draw(drawing, c, x + card_w - 14 - seat_cards.QR_SIZE, y + 14)
+    c.save()
+
+# QR format information: 2 error correction level bits (ISO/IEC 18004 values), 3 mask bits
+QR_LEVEL_BITS = {'L': 1, 'M': 0, 'Q': 3, 'H': 2}
+QR_FORMAT_POLY = 0b10100110111
+QR_FORMAT_MASK = 0b101010000010010
+
+def format_bits(level, mask):
+    """The 15 format information bits of a QR code with this level and mask pattern."""
+    data = QR_LEVEL_BITS[level] << 3 | mask
+    rem = data << 10
+    for bit in range(14, 9, -1):
+        if rem >> bit & 1:
+            rem ^= QR_FORMAT_POLY << (bit - 10)
+    return (data << 10 | rem) ^ QR_FORMAT_MASK
+
+def read_format(modules):
+    """(level, mask) from the format information next to the top-left finder pattern."""
+    size = len(modules)
+    rows = [i if i < 6 else i + 1 if i < 8 else size - 15 + i for i in range(15)]
+    bits = sum(bool(modules[row][8]) << i for i, row in enumerate(rows))
+    found = [(level, mask) for level in QR_LEVEL_BITS for mask in range(8) if format_bits(level, mask) == bits]
+    assert found, f"no valid QR format information ({bits:015b})"
+    return found[0]
+
+def widget_modules(value):
+    """The QR code of value as drawn by the public QrCodeWidget, read back from its rectangles."""
+    widget = QrCodeWidget(value, barLevel=seat_cards.QR_LEVEL)
+    group = widget.draw()
+    frame, rects = group.contents[0], group.contents[1:]
+    size = round(frame.width / rects[0].height) - 2 * widget.barBorder
+    box = frame.width / (size + 2 * widget.barBorder)
+    modules = [[False] * size for _ in range(size)]
+    for rect in rects:
+        row = round((frame.height - rect.y) / box) - widget.barBorder - 1
+        col = round(rect.x / box) - widget.barBorder
+        for c in range(col, col + round(rect.width / box)):
+            modules[row][c] = True
+    return modules
+
+def check_qr(value):
+    """seat_cards.qr_modules draws the widget's own symbol when given the widget's mask, and
+    a valid level/QR_MASK symbol of the same size with the pinned mask."""
+    expected = widget_modules(value)
+    level, mask = read_format(expected)
+    assert level == seat_cards.QR_LEVEL
+    pinned = seat_cards.QR_MASK
+    try:
+        seat_cards.QR_MASK = mask
+        assert [list(map(bool, row)) for row in seat_cards.qr_modules(value)] == expected, \
+            f"seat_cards QR code for {value} differs from QrCodeWidget"
+    finally:
+        seat_cards.QR_MASK = pinned
+    modules = seat_cards.qr_modules(value)
+    assert len(modules) == len(expected)
+    assert read_format(modules) == (level, mask if pinned is None else pinned)
+
+def page_text(pdf):
+    """The page content streams of a PDF, inflated."""
+    streams = re.findall(rb'\bstream\r?\n(.*?)endstream', pdf, re.S)
+    contents = []
+    for stream in streams:
+        try:
+            contents.append(zlib.decompressobj().decompress(stream))
+        except zlib.error:
+            contents.append(stream)
+    return b'\n'.join(contents)
+
+def check_card_render(card):
+    """A card's text block names fonts the PDF defines and holds the guest's fields."""
+    pdf = seat_cards.render_cards([card])
+    text = page_text(pdf)
+    fonts = dict(re.findall(rb'/(F\d+) (\d+) 0 R', pdf))
+    for ref in set(re.findall(rb'/(F\d+) [\d.]+ Tf', text)):
+        assert ref in fonts, f"font /{ref.decode()} used but not defined"
+    assert b'/BaseFont /Helvetica-Bold' in pdf and b'/BaseFont /Helvetica' in pdf
+    for field in card[1:]:
+        assert f'({seat_cards.pdf_string(str(field))}) Tj'.encode('latin-1') in text, f"{field!r} missing"
+
+def check_card_ids(seating, folder, samples=50):
+    """Cards printed from the store and from seating.db carry the same ids, and each one
+    resolves through the check-in server's index and stores a check-in."""
+    db_file = os.path.join(folder, 'seating.db')
+    with closing(seating_db.connect(db_file)) as conn:
+        seating_db.import_seating(conn, seating)
+        from_store = seat_cards.seated_guests(event_store.to_store_table(seating).to_pandas())
+        from_db = seat_cards.seated_guests(event_store.load_seating(db_file))
+        assert [card[0] for card in from_store] == [card[0] for card in from_db], "card ids depend on the source"
+        index = checkin_server.CheckinIndex(event_store.load_seating(db_file))
+        sample = from_db[::max(1, len(from_db) // samples)]
+        for guest_id, name, *_ in sample:
+            found = index.lookup(int(str(guest_id)))  # the QR code holds the id as text
+            assert [guest['name'] for guest in found] == [name], f"card {guest_id} not found"
+        assert seating_db.check_in(conn, [card[0] for card in sample]) == [], "card check-ins not stored"
+
+if __name__ == '__main__':
+    seating = make_seating(NUM_CARDS * 6 // 5)
+    # Vacant seats get no card, but make guest_id NULL in the database
+    seating.loc[seating.index % 50 == 7, ['name', 'gp_id', 'gp_name']] = [seating_db.VACANT_NAME, *seating_db.VACANT_GROUP]
+    with tempfile.TemporaryDirectory() as folder:
+        check_card_ids(seating, folder)
+    df = event_store.to_store_table(seating).to_pandas()
+    cards = seat_cards.seated_guests(df)[:NUM_CARDS]
+    for card in cards[:20]:
+        check_qr(str(card[0]))
+    check_card_render(cards[0])
+
+    start = time.perf_counter()
+    widget_cards(cards[:BASELINE_CARDS])
+    baseline = (time.perf_counter() - start) * NUM_CARDS / BASELINE_CARDS
+    print(f"{'method':<34} {'cards':>6} {'seconds':>8} {'ms/card':>8}")
+    print(f"{'widget Drawing per card (scaled)':<34} {NUM_CARDS:>6} {baseline:>8.1f} {baseline / NUM_CARDS * 1000:>8.2f}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        output = os.path.join(folder, 'seat_cards.pdf')
+        for workers in sorted({1, seat_cards.MAX_WORKERS}):
+            start = time.perf_counter()
+            seat_cards.generate_cards(cards, output, workers)
+            elapsed = time.perf_counter() - start
+            label = f"seat_cards.py, {workers} worker(s)"
+            print(f"{label:<34} {len(cards):>6} {elapsed:>8.1f} {elapsed / len(cards) * 1000:>8.2f}")
+        print(f"PDF size: {os.path.getsize(output) / 1e6:.1f} MB")
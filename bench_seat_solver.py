@@ -0,0 +1,31 @@
+"""Tables and Simpanan seats of seat_solver against guest_seat_gem.assign_seats on random groups.
+
+Usage: python bench_seat_solver.py
+"""
+import time
+
+import guest_seat_gem
+import seat_solver
+from bench_assign_seats import make_guests
+
+SCALES = [(800, 100), (8000, 1000), (20000, 1000)]  # (guests, groups)
+
+if __name__ == '__main__':
+    print(f"{'guests':>7} {'groups':>7} {'greedy tables':>14} {'solver tables':>14} {'bound':>6} "
+          f"{'seats saved':>12} {'layouts':>8} {'solver (s)':>11}")
+    for num_guests, num_groups in SCALES:
+        guests_df = make_guests(num_guests, num_groups)
+        greedy_df = guest_seat_gem.assign_seats(guests_df.copy())
+
+        start = time.perf_counter()
+        seating_df, stats = seat_solver.solve_seating(guests_df, venue_file=None)
+        elapsed = time.perf_counter() - start
+
+        # Every guest seated once, every table within its capacity
+        seated = seating_df[seating_df['name'] != 'Simpanan']
+        assert sorted(seated['name']) == sorted(guests_df['name'])
+        assert (seating_df.groupby('table_number').size() <= seat_solver.TABLE_CAPACITY).all()
+
+        saved = (greedy_df['name'] == 'Simpanan').sum() - (seating_df['name'] == 'Simpanan').sum()
+        print(f"{num_guests:>7} {num_groups:>7} {greedy_df['table_number'].nunique():>14} {stats['tables']:>14} "
+              f"{stats['lower_bound']:>6} {saved:>12} {stats['iterations']:>8} {elapsed:>11.2f}")
@@ -0,0 +1,59 @@
+"""Time the old per-table summary loop against seat_summary.summarize.
+
+Usage: python bench_seat_summary.py
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from seat_summary import summarize, summary_report
+
+SEAT_COUNTS = [1000, 10000, 100000]
+MENUS = np.array(['Daging', 'Ayam', 'Ikan', 'Vegetarian', 'N/A'])
+
+def make_seating(num_seats, seed=0):
+    """A guest_seat.csv shaped DataFrame with some reserve seats."""
+    rng = np.random.default_rng(seed)
+    reserved = rng.random(num_seats) < 0.05
+    return pd.DataFrame({
+        'table_number': np.arange(num_seats) // 8 + 1,
+        'seat': np.arange(num_seats) % 8 + 1,
+        'name': np.where(reserved, 'Simpanan', 'Guest ' + np.arange(num_seats).astype(str)),
+        'menu': MENUS[rng.integers(0, 4, num_seats)],
+        'gp_id': np.arange(num_seats) // 20 + 1,
+        'gp_name': 'group' + (np.arange(num_seats) // 20 + 1).astype(str),
+    })
+
+def legacy_summary(df):
+    """The old guest_summary_v1.summarize_tables loop."""
+    summary = {}
+    for table_num, group in df.groupby('table_number'):
+        summary[table_num] = {
+            'gp_name': group['gp_name'].iloc[0],
+            'total_guests': len(group),
+            'simpanan_count': group['name'].str.contains('simpanan', case=False).sum(),
+            'daging_count': group['menu'].str.contains('Daging', case=False).sum(),
+            'ayam_count': group['menu'].str.contains('Ayam', case=False).sum(),
+            'ikan_count': group['menu'].str.contains('Ikan', case=False).sum(),
+            'vege_count': group['menu'].str.contains('Vegetarian', case=False).sum(),
+        }
+    return pd.DataFrame.from_dict(summary, orient='index')
+
+if __name__ == '__main__':
+    print(f"{'seats':>7} {'legacy (s)':>11} {'summarize (s)':>14} {'speed-up':>9}")
+    for num_seats in SEAT_COUNTS:
+        df = make_seating(num_seats)
+
+        start = time.perf_counter()
+        old = legacy_summary(df)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tables, groups = summarize(df)
+        summary_report(tables, {'table_number': 'Table Number', 'gp_name': 'Table Name'})
+        new_time = time.perf_counter() - start
+
+        assert (old['simpanan_count'].to_numpy() == tables['Reserved'].to_numpy()).all()
+        assert (old['ikan_count'].to_numpy() == tables['Ikan'].to_numpy()).all()
+        print(f"{num_seats:>7} {legacy_time:>11.3f} {new_time:>14.3f} {legacy_time / new_time:>8.1f}x")
@@ -0,0 +1,74 @@
+"""Time re-runs of the pipeline jobs cold (proc.sh's separate scripts, one seat_worker.py
+process) and on a warm seat_worker, on synthetic events.
+
+Every run is a fresh client process in the event folder, as proc.sh would start it; the
+warm worker is started once per event and its first run is left out of the timings.
+
+Usage: python bench_seat_worker.py [--guests 500 5000] [--repeat 3]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import make_synthetic_event
+
+SCALES = [500, 5000, 50000]
+REPEAT = 3
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKER = os.path.join(REPO_DIR, 'seat_worker.py')
+JOB_SETS = [['pdf', 'tags'], ['tags'], ['reassign', 'pdf', 'tags']]
+# The scripts proc.sh runs for each job
+JOB_SCRIPTS = {
+    'reassign': ['guest_seat_gem.py'],
+    'pdf': ['guest_seat_pdf.py', 'guest_summary_v1.py', 'guest_list.py'],
+    'tags': ['guest_tab_tag.py'],
+}
+
+def timed_run(commands, folder):
+    """Run commands one after another in folder; returns the wall seconds for all of them."""
+    start = time.perf_counter()
+    for command in commands:
+        subprocess.run(command, cwd=folder, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def best_of(commands, folder, repeat):
+    return min(timed_run(commands, folder) for _ in range(repeat))
+
+def bench_scale(num_guests, folder, repeat):
+    make_synthetic_event.make_event(folder, num_guests)
+    timed_run([[sys.executable, os.path.join(REPO_DIR, 'guest_seat_gem.py')]], folder)
+    rows = {}
+    for jobs in JOB_SETS:
+        scripts = [[sys.executable, os.path.join(REPO_DIR, script)] for job in jobs for script in JOB_SCRIPTS[job]]
+        rows[' '.join(jobs)] = [best_of(scripts, folder, repeat),
+                                best_of([[sys.executable, WORKER, 'run', *jobs]], folder, repeat)]
+
+    subprocess.run([sys.executable, WORKER, 'start'], cwd=folder, check=True, stdout=subprocess.DEVNULL)
+    try:
+        for jobs in JOB_SETS:
+            command = [[sys.executable, WORKER, 'run', '--no-cold', *jobs]]
+            timed_run(command, folder)  # the worker's first read of the seating
+            rows[' '.join(jobs)].append(best_of(command, folder, repeat))
+    finally:
+        subprocess.run([sys.executable, WORKER, 'stop'], cwd=folder, stdout=subprocess.DEVNULL)
+
+    for jobs, (scripts, cold, warm) in rows.items():
+        print(f"{num_guests:>7} {jobs:<20} {scripts:>10.2f} {cold:>10.2f} {warm:>10.2f} {scripts / warm:>8.1f}x")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time cold and warm re-runs of the pipeline jobs.")
+    parser.add_argument('--guests', type=int, nargs='+', default=SCALES)
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='bench_seat_worker_')
+    print(f"{'guests':>7} {'jobs':<20} {'scripts':>10} {'cold run':>10} {'warm run':>10} {'speedup':>9}")
+    try:
+        for num_guests in args.guests:
+            bench_scale(num_guests, os.path.join(root, f'event{num_guests}'), args.repeat)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
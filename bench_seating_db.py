@@ -0,0 +1,67 @@
+"""Time a single-guest lookup and edit on the seating database against the CSV round trip it replaces.
+
+Usage: python bench_seating_db.py
+"""
+import os
+import tempfile
+import time
+from contextlib import closing
+
+import pandas as pd
+
+import event_store
+import seating_db
+from bench_seat_summary import make_seating
+
+SEAT_COUNTS = [10000, 100000]
+EDITS = 20
+
+def csv_move(csv_file, name, table_number, seat):
+    """The old way: re-parse the whole file, swap two rows' places, rewrite the whole file."""
+    df = pd.read_csv(csv_file, keep_default_na=False)
+    row = df.index[df['name'] == name][0]
+    target = df.index[(df['table_number'] == table_number) & (df['seat'] == seat)][0]
+    place = ['table_number', 'seat']
+    df.loc[[row, target], place] = df.loc[[target, row], place].to_numpy()
+    df.sort_values(place).to_csv(csv_file, index=False)
+
+def csv_lookup(csv_file, name):
+    df = pd.read_csv(csv_file, keep_default_na=False)
+    return df[df['name'] == name]
+
+def per_call_ms(fn, calls):
+    start = time.perf_counter()
+    for args in calls:
+        fn(*args)
+    return (time.perf_counter() - start) / len(calls) * 1000
+
+if __name__ == '__main__':
+    print(f"{'seats':>7} {'csv lookup':>11} {'db lookup':>10} {'csv edit':>9} {'db edit':>8}   (ms per call)")
+    with tempfile.TemporaryDirectory() as folder:
+        for num_seats in SEAT_COUNTS:
+            df = make_seating(num_seats)
+            # Some vacant seats, as a padded seating has: their guest_id is NULL in the database
+            df.loc[df.index % 50 == 7, ['name', 'gp_id', 'gp_name']] = [seating_db.VACANT_NAME, *seating_db.VACANT_GROUP]
+            csv_file = os.path.join(folder, 'guest_seat.csv')
+            df.to_csv(csv_file, index=False)
+            db_file = os.path.join(folder, f'seating{num_seats}.db')
+
+            with closing(seating_db.connect(db_file)) as conn:
+                seating_db.import_seating(conn, df)
+                # The ids must survive the round trip exactly: they are what check-ins and seat cards use
+                expected = df.assign(guest_id=event_store.guest_ids(df)).sort_values(['table_number', 'seat'])
+                assert (seating_db.seating_frame(conn)['guest_id'].to_numpy()
+                        == expected['guest_id'].to_numpy()).all(), "seating_frame changed guest ids"
+                sample = df[df['name'] != 'Simpanan'].sample(EDITS, random_state=0)
+                names = [(name,) for name in sample['name']]
+                targets = list(zip(sample['table_number'][::-1], sample['seat'][::-1]))
+
+                ids = [int(seating_db.find_guests(conn, name)['guest_id'].iloc[0]) for name, in names]
+                db_lookup = per_call_ms(lambda name: seating_db.find_guests(conn, name), names)
+                db_edit = per_call_ms(lambda guest_id, table, seat: seating_db.move_guest(conn, guest_id, table, seat),
+                                      [(guest_id, int(t), int(s)) for guest_id, (t, s) in zip(ids, targets)])
+
+            csv_lookup_ms = per_call_ms(lambda name: csv_lookup(csv_file, name), names[:5])
+            csv_edit_ms = per_call_ms(lambda name, table, seat: csv_move(csv_file, name, table, seat),
+                                      [(name, t, s) for (name,), (t, s) in list(zip(names, targets))[:5]])
+            print(f"{num_seats:>7} {csv_lookup_ms:>11.1f} {db_lookup:>10.2f} {csv_edit_ms:>9.1f} {db_edit:>8.2f}")
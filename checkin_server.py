@@ -0,0 +1,256 @@
+"""Door check-in service: a small asyncio HTTP server over an in-memory index of the seating.
+
+Every door tablet talks to the same server. A lookup or check-in is a dictionary lookup on
+guest_id, the folded name or the name without titles, so the answer (table and seat) does not
+depend on the size of the guest list. Check-ins are written to the attendance table of the
+seating database (seating_db.py) by one writer, in batches: whatever arrived during the last
+COMMIT_INTERVAL seconds is committed in one transaction, and each tablet gets its answer once
+its check-in is on disk. `python seating_db.py export` writes them to tetamu.csv.
+
+    python checkin_server.py [--port 8765]
+
+    POST /checkin   {"guest_id": 123} or {"name": "Dato' Ahmad Zamroni"}
+                    -> 200 {"guest": {...table_number, seat...}, "already": false}
+                       404 unknown name, 409 {"candidates": [...]} when a name is ambiguous
+    GET  /guest?name=ahmad zamroni   the same lookup without checking in
+    GET  /stats                      guests, checked in, batches committed
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from urllib.parse import parse_qs, urlsplit
+
+import event_store
+import seating_db
+from guest_search import query_words
+from name_normalizer import fold_name
+
+# --- CONFIGURATION ---
+HOST = '0.0.0.0'
+PORT = 8765
+COMMIT_INTERVAL = 0.02  # seconds a check-in may wait to share a commit with others
+MAX_BATCH = 500        # check-ins per commit at most
+MAX_BODY = 64 * 1024
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               409: 'Conflict', 413: 'Payload Too Large', 503: 'Service Unavailable'}
+
+class CheckinIndex:
+    """Guests by guest_id, by folded name and by folded name without titles or ranks."""
+
+    def __init__(self, seating_df):
+        self.guests = {}
+        self.by_name = {}
+        self.by_words = {}
+        seated = seating_df[~((seating_df['name'].astype(str) == seating_db.VACANT_NAME)
+                              & (seating_df['gp_name'].astype(str) == seating_db.VACANT_GROUP[1]))]
+        ids = seating_db.signed_ids(seated['guest_id'].to_numpy()).tolist()
+        columns = [seated[col].astype(str).tolist() for col in ('name', 'menu', 'gp_name')]
+        tables = seated['table_number'].astype(int).tolist()
+        seats = seated['seat'].astype(int).tolist()
+        for guest_id, name, menu, gp_name, table_number, seat in zip(ids, *columns, tables, seats):
+            self.guests[guest_id] = {'guest_id': guest_id, 'name': name, 'table_number': table_number,
+                                     'seat': seat, 'menu': menu, 'group': gp_name}
+            folded = fold_name(name)
+            self.by_name.setdefault(folded, []).append(guest_id)
+            self.by_words.setdefault(' '.join(query_words(folded)), []).append(guest_id)
+
+    def lookup(self, guest_id=None, name=None):
+        """Guests matching a guest_id, or else a name (exactly, then ignoring titles)."""
+        if guest_id is not None:
+            guest = self.guests.get(guest_id)
+            return [guest] if guest else []
+        folded = fold_name(name or '')
+        ids = self.by_name.get(folded) or self.by_words.get(' '.join(query_words(folded)), [])
+        return [self.guests[i] for i in ids]
+
+class CheckinServer:
+    """HTTP front end, in-memory index and group-committing attendance writer."""
+
+    def __init__(self, db_file=event_store.DB_FILE, commit_interval=COMMIT_INTERVAL, max_batch=MAX_BATCH):
+        self.db_file = db_file
+        self.commit_interval = commit_interval
+        self.max_batch = max_batch
+        if not os.path.exists(db_file):
+            with closing(seating_db.connect(db_file)) as conn:
+                seating_db.import_csvs(conn)
+        self.index = CheckinIndex(event_store.load_seating(db_file))
+        with closing(seating_db.connect(db_file)) as conn:
+            self.checked_in = {row[0] for row in conn.execute(
+                'SELECT guest_id FROM attendance WHERE guest_id IS NOT NULL AND tindakan = ?', (seating_db.CHECKED_IN,))}
+        self.pending = {}  # guest_id -> future resolved once its batch is committed
+        self.queue = None
+        self.batches = 0
+        # One writer thread owns the database connection
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='checkin-writer')
+        self._conn = None
+
+    # --- writes ---
+    def _commit(self, guest_ids):
+        """Store a batch of check-ins; returns the guest_ids the database has no guest for."""
+        if self._conn is None:
+            self._conn = seating_db.connect(self.db_file)
+        return set(seating_db.check_in(self._conn, guest_ids))
+
+    async def committer(self):
+        """Commit queued check-ins in batches, at most every commit_interval seconds."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            await asyncio.sleep(self.commit_interval)
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            # The futures stay in pending until they are resolved, so a repeat check-in of a
+            # guest in this batch waits for the commit instead of being told it is stored
+            try:
+                missing = await loop.run_in_executor(self._writer, self._commit, batch)
+            except Exception as e:
+                print(f"⚠️ Check-in commit of {len(batch)} guests failed: {e}")
+                self.checked_in.difference_update(batch)
+                for guest_id in batch:
+                    self.pending.pop(guest_id).set_exception(e)
+                continue
+            self.batches += 1
+            if missing:
+                # Nothing was stored for these, so their tablets must not be told otherwise
+                print(f"⚠️ {len(missing)} check-ins not stored: guest not in {self.db_file}")
+                self.checked_in.difference_update(missing)
+            for guest_id in batch:
+                future = self.pending.pop(guest_id)
+                if guest_id in missing:
+                    future.set_exception(LookupError(f"guest {guest_id} is not in the database"))
+                else:
+                    future.set_result(None)
+
+    async def check_in(self, guest):
+        """Record a guest's arrival; returns True if the guest had already checked in."""
+        guest_id = guest['guest_id']
+        if guest_id in self.pending:
+            await asyncio.shield(self.pending[guest_id])
+            return True
+        if guest_id in self.checked_in:
+            return True
+        future = asyncio.get_running_loop().create_future()
+        self.pending[guest_id] = future
+        self.checked_in.add(guest_id)
+        self.queue.put_nowait(guest_id)
+        await asyncio.shield(future)  # a tablet that hangs up does not cancel the batch's future
+        return False
+
+    # --- HTTP ---
+    async def route(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == '/stats' and method == 'GET':
+            return 200, {'guests': len(self.index.guests), 'checked_in': len(self.checked_in),
+                         'pending': len(self.pending), 'batches': self.batches}
+
+        if url.path == '/guest' and method == 'GET':
+            params = parse_qs(url.query)
+            guest_id = params.get('guest_id', [None])[0]
+            try:
+                found = self.index.lookup(int(guest_id) if guest_id else None, params.get('name', [''])[0])
+            except ValueError:
+                return 400, {'error': 'guest_id must be a number'}
+            return (200, {'guests': found}) if found else (404, {'error': 'guest not found'})
+
+        if url.path == '/checkin':
+            if method != 'POST':
+                return 405, {'error': 'use POST'}
+            try:
+                request = json.loads(body or b'{}')
+                guest_id = request.get('guest_id')
+                found = self.index.lookup(int(guest_id) if guest_id is not None else None, request.get('name'))
+            except (ValueError, TypeError, AttributeError):
+                return 400, {'error': 'expected {"guest_id": ...} or {"name": ...}'}
+            if not found:
+                return 404, {'error': 'guest not found'}
+            if len(found) > 1:
+                return 409, {'error': 'more than one guest has this name', 'candidates': found}
+            try:
+                already = await self.check_in(found[0])
+            except Exception:
+                return 503, {'error': 'check-in could not be saved, try again'}
+            return 200, {'guest': found[0], 'already': already}
+
+        return 404, {'error': f'no such endpoint {url.path}'}
+
+    async def handle(self, reader, writer):
+        """Serve one keep-alive connection: read requests, answer them in order."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    status, payload, body = 400, {'error': 'bad Content-Length'}, None
+                elif length > MAX_BODY:
+                    status, payload, body = 413, {'error': 'request too large'}, None
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = await self.route(method, target, body)
+
+                # The body of a refused request is still unread, so the connection cannot be reused
+                keep_alive = (headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                              and body is not None)
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=HOST, port=PORT):
+        """Start listening and committing; returns the asyncio server."""
+        self.queue = asyncio.Queue()
+        self._committer = asyncio.create_task(self.committer())
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        self._committer.cancel()
+        self._writer.submit(lambda: self._conn and self._conn.close()).result()
+        self._writer.shutdown()
+
+async def serve(db_file, host, port):
+    server = CheckinServer(db_file)
+    listener = await server.start(host, port)
+    print(f"✅ Check-in server for {len(server.index.guests)} guests on http://{host}:{port}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Door check-in server.")
+    parser.add_argument('--db', default=event_store.DB_FILE)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.db, args.host, args.port))
+    except KeyboardInterrupt:
+        print("Check-in server stopped.")
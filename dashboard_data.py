@@ -0,0 +1,75 @@
+"""Parsed data, metrics and floor plan HTML for the app.py dashboard, cached per data version.
+
+A Streamlit server runs every viewer session in one process, so the cache below is shared
+by all screens. It is keyed on the content of the CSV files: a file is only re-hashed when
+its mtime or size changes, and only re-parsed when its content really did change.
+"""
+import functools
+
+import pandas as pd
+
+import event_store
+import floor_plan
+from file_util import clear_versions, file_version
+
+# --- CONFIGURATION ---
+SEATING_FILE = event_store.STORE_FILE
+TAJAAN_FILE = 'tajaan.csv'
+TEMPAHAN_FILE = 'tempahan.csv'
+DASHBOARD_FILES = (SEATING_FILE, TAJAAN_FILE, TEMPAHAN_FILE)
+
+def data_version(files=DASHBOARD_FILES):
+    """Version key of the dashboard data: one content hash per file."""
+    return tuple(file_version(path) for path in files)
+
+def dummy_frames():
+    """Stand-in data for when one of the CSV files is missing."""
+    data = {'table_number': list(range(1, 50)), 'name': [f'Guest {i}' for i in range(1, 50)], 'menu': ['Daging', 'Ayam'] * 24 + ['Ikan']}
+    tetamu_df = pd.DataFrame(data)
+    tajaan_df = pd.DataFrame({'Jumlah': [25000, 30000]})
+    tempah_df = pd.DataFrame({'Nama': [f'Wakil {chr(65+i)}' for i in range(49)]})
+    return tetamu_df, tajaan_df, tempah_df
+
+@functools.lru_cache(maxsize=4)
+def _build_dashboard(version, files, venue_version, venue_file):
+    missing = [path for path, file_hash in zip(files, version) if file_hash is None]
+    if missing:
+        tetamu_df, tajaan_df, tempah_df = dummy_frames()
+    else:
+        seating_file, tajaan_file, tempahan_file = files
+        tetamu_df = event_store.load_seating(seating_file)
+        tajaan_df = pd.read_csv(tajaan_file)
+        tempah_df = pd.read_csv(tempahan_file)
+
+    total_simpanan = int(tetamu_df['name'].str.contains('simpanan', case=False).sum())
+    return {
+        'version': version,
+        'missing': missing,
+        'tetamu_df': tetamu_df,
+        'tajaan_df': tajaan_df,
+        'tempah_df': tempah_df,
+        'total_collections': tajaan_df['Jumlah'].sum(),
+        'total_simpanan': total_simpanan,
+        'total_guests': len(tetamu_df) - total_simpanan,
+        'menu_counts': list(tetamu_df['menu'].value_counts().items()),
+        'floor_plan_html': floor_plan.floor_plan_html(floor_plan.load_venue(venue_file),
+                                                      floor_plan.booked_tables(tetamu_df),
+                                                      floor_plan.wakil_by_table(tempah_df)),
+    }
+
+def clear_cache():
+    """Forget every cached dashboard and file hash, so the next load reads the files again."""
+    clear_versions()
+    _build_dashboard.cache_clear()
+
+def load_dashboard(files=None, venue_file=floor_plan.VENUE_FILE):
+    """Frames, metrics and floor plan HTML for the current data, reused until a file's content changes.
+
+    files defaults to DASHBOARD_FILES, with the seating read from event_store.seating_file()
+    (the seating database when there is one). The result is shared between sessions and reruns;
+    treat the frames as read-only.
+    """
+    if files is None:
+        files = (event_store.seating_file(),) + DASHBOARD_FILES[1:]
+    files = tuple(files)
+    return _build_dashboard(data_version(files), files, file_version(venue_file), venue_file)
@@ -0,0 +1,79 @@
+"""Background watcher that tells the dashboard when its CSV files have changed.
+
+One pipeline run rewrites several files within a second or two. Events are debounced,
+so the whole burst bumps the generation (and clears the dashboard cache) once, after
+the files have been quiet for DEBOUNCE_SECONDS.
+"""
+import os
+import threading
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+import dashboard_data
+import event_store
+import floor_plan
+
+# --- CONFIGURATION ---
+WATCHED_FILES = dashboard_data.DASHBOARD_FILES + (event_store.CSV_EXPORT_FILE, event_store.DB_FILE,
+                                                  floor_plan.VENUE_FILE)
+DEBOUNCE_SECONDS = 2.0
+
+class DataWatcher(FileSystemEventHandler):
+    """Watch a set of files and count settled bursts of changes to them."""
+
+    def __init__(self, files=WATCHED_FILES, debounce=DEBOUNCE_SECONDS, on_change=None):
+        super().__init__()
+        self.paths = {os.path.abspath(path) for path in files}
+        self.debounce = debounce
+        self.on_change = on_change
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._timer = None
+        self._observer = None
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        # Writers that save through a temporary file show up as a move onto the watched name
+        touched = {os.path.abspath(event.src_path), os.path.abspath(getattr(event, 'dest_path', '') or '')}
+        if touched & self.paths:
+            self._schedule()
+
+    def _schedule(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._settle)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _settle(self):
+        with self._lock:
+            self._timer = None
+        if self.on_change is not None:
+            self.on_change()
+        with self._lock:
+            self.generation += 1
+        print(f"🔄 Data changed, dashboard refresh #{self.generation}")
+
+    def start(self):
+        """Start watching the folders that hold the files."""
+        self._observer = Observer()
+        for folder in {os.path.dirname(path) for path in self.paths}:
+            self._observer.schedule(self, folder, recursive=False)
+        self._observer.daemon = True
+        self._observer.start()
+        return self
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+
+def start_watcher(files=WATCHED_FILES, debounce=DEBOUNCE_SECONDS):
+    """Start a watcher that clears the dashboard cache once per burst of changes."""
+    return DataWatcher(files, debounce, on_change=dashboard_data.clear_cache).start()
@@ -0,0 +1,149 @@
+"""The seating plan as one typed Parquet file, read by every stage through load_seating().
+
+guest_seat.parquet holds the seating with a fixed schema instead of the types pandas
+guesses from guest_seat.csv: small integers for tables and seats, dictionary-encoded
+(categorical) menu and group names, and a guest_id that stays the same for a guest across
+re-runs and re-seating. guest_seat.csv is still written next to it for people and for the
+per-menu tag files, and is read (with the same schema) when there is no Parquet file yet,
+or when it is newer than the Parquet file: a script that writes only the CSV (seat_alloc.py,
+guest_seat_assign.py) or a hand edit changed it since, and it is read with a warning.
+
+Once a seating database has been built (seating_db.py), it is the copy load_seating() reads,
+unless a newer guest_seat.csv or store has been written since.
+"""
+import os
+from contextlib import closing
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+# --- CONFIGURATION ---
+STORE_FILE = 'guest_seat.parquet'
+CSV_EXPORT_FILE = 'guest_seat.csv'
+DB_FILE = 'seating.db'
+_warned = set()  # (newer, older) pairs already warned about in this process
+SEATING_COLUMNS = ['table_number', 'seat', 'name', 'menu', 'gp_id', 'gp_name']
+SEATING_SCHEMA = pa.schema([
+    ('table_number', pa.int32()),
+    ('seat', pa.int8()),
+    ('name', pa.string()),
+    ('menu', pa.dictionary(pa.int8(), pa.string())),
+    ('gp_id', pa.int32()),
+    ('gp_name', pa.dictionary(pa.int32(), pa.string())),
+    ('guest_id', pa.uint64()),
+])
+# Names stay Arrow strings in pandas; a million guest names as Python objects cost ~60MB more
+PANDAS_TYPES = {pa.string(): pd.ArrowDtype(pa.string())}
+# Group of the seats in a CSV written without groups (seat_alloc.py), as guest_seat_gem pads tables
+RESERVE_GROUP = {'gp_id': 0, 'gp_name': 'RESERVE_SEAT'}
+CSV_SCHEMA = pa.schema([(field.name, pa.string() if pa.types.is_dictionary(field.type) else field.type)
+                        for field in SEATING_SCHEMA if field.name in SEATING_COLUMNS])
+
+def guest_ids(df):
+    """A stable 64-bit id per guest, from the group name, the guest name and which of the
+    same-named guests in that group it is (so the Simpanan seats of a group get 1, 2, 3...).
+
+    Table and seat do not count, so a guest keeps the id when re-seated.
+    """
+    gp_name = df['gp_name'].astype(str).to_numpy()
+    name = df['name'].astype(str).to_numpy()
+    keys = pd.DataFrame({'gp_name': gp_name, 'name': name})
+    keys['nth'] = keys.groupby(['gp_name', 'name'], sort=False).cumcount()
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+def to_store_table(df):
+    """The seating DataFrame as an Arrow table with SEATING_SCHEMA, guest_id added if missing."""
+    df = df.reset_index(drop=True)
+    columns = {}
+    for field in SEATING_SCHEMA:
+        if field.name == 'guest_id':
+            values = df['guest_id'].to_numpy() if 'guest_id' in df.columns else guest_ids(df)
+            columns['guest_id'] = pa.array(values, pa.uint64())
+        elif pa.types.is_dictionary(field.type):
+            columns[field.name] = pa.array(df[field.name].astype(str), pa.string()).dictionary_encode() \
+                                    .cast(field.type)
+        elif pa.types.is_integer(field.type):
+            columns[field.name] = pa.array(pd.to_numeric(df[field.name]).to_numpy(), field.type)
+        else:
+            columns[field.name] = pa.array(df[field.name].astype(str), field.type)
+    return pa.table(columns, schema=SEATING_SCHEMA)
+
+def typed_frame(df):
+    """The seating DataFrame with the types load_seating() gives it, built in memory."""
+    return to_store_table(df).to_pandas(types_mapper=PANDAS_TYPES.get)
+
+def write_seating(df, path=STORE_FILE, csv_file=CSV_EXPORT_FILE):
+    """Write the seating to the store, and to csv_file for people and glabels unless it is None.
+
+    Returns the Arrow table written.
+    """
+    table = to_store_table(df)
+    # The CSV first, so the store is never older than a CSV written with it (see seating_file)
+    if csv_file:
+        df[SEATING_COLUMNS].to_csv(csv_file, index=False)
+    tmp_path = path + '.tmp'
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)  # readers such as the dashboard never see a half-written file
+    return table
+
+def read_seating_csv(csv_file=CSV_EXPORT_FILE):
+    """A seating CSV read with the store's types, guest_id added.
+
+    A CSV without gp_id and gp_name (seat_alloc.py writes name, seat, table_number, menu
+    and category) gets RESERVE_GROUP for them; other extra columns are dropped.
+    """
+    table = pacsv.read_csv(
+        csv_file,
+        convert_options=pacsv.ConvertOptions(
+            column_types=CSV_SCHEMA,
+            strings_can_be_null=False,  # 'N/A' menus stay text
+        ),
+    )
+    df = table.to_pandas()
+    for column, value in RESERVE_GROUP.items():
+        if column not in df.columns:
+            df[column] = value
+    return to_store_table(df[SEATING_COLUMNS])
+
+def seating_file(path=STORE_FILE, csv_file=CSV_EXPORT_FILE, db_file=DB_FILE):
+    """The file load_seating reads by default: the newest of the seating database, the store
+    and the CSV, preferred in that order when they are as new.
+
+    Every save writes the CSV, then the store, then re-imports an existing database, so a
+    newer CSV was written without them (or edited by hand); it is read, with a warning.
+    """
+    candidates = [c for c in (db_file, path, csv_file) if c and os.path.exists(c)]
+    if not candidates:
+        return path
+    newest = max(candidates, key=lambda c: os.stat(c).st_mtime_ns)  # the first of equals
+    if newest == csv_file and len(candidates) > 1 and (csv_file, candidates[0]) not in _warned:
+        _warned.add((csv_file, candidates[0]))
+        hint = f"; `python seating_db.py import` brings {db_file} up to date" if candidates[0] == db_file else ''
+        print(f"⚠️ {csv_file} is newer than {candidates[0]} (written without the store, or edited by hand): "
+              f"reading {csv_file}{hint}")
+    return newest
+
+def load_seating(path=None, columns=None):
+    """The seating as a DataFrame with categorical menu and gp_name and Arrow-backed names.
+
+    path is a seating database, the Parquet store or a seating CSV (seating_file() by
+    default); when the store does not exist yet the CSV export is read instead. columns
+    limits what is read (all of SEATING_SCHEMA by default).
+    """
+    if path is None:
+        path = seating_file()
+    if path.endswith('.db'):
+        import seating_db  # seating_db builds on this module
+        with closing(seating_db.connect(path)) as conn:
+            table = to_store_table(seating_db.seating_frame(conn))
+    elif path.endswith('.csv'):
+        table = read_seating_csv(path)
+    elif not os.path.exists(path) and os.path.exists(CSV_EXPORT_FILE):
+        table = read_seating_csv(CSV_EXPORT_FILE)
+    else:
+        table = pq.read_table(path, columns=columns)
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas(types_mapper=PANDAS_TYPES.get)
@@ -0,0 +1,34 @@
+"""Content versions of files, shared by the dashboard data and the guest sheet source.
+
+A file is only re-hashed when its mtime or size changes, so asking for the version of an
+unchanged file costs one stat.
+"""
+import hashlib
+import os
+import threading
+
+_hash_lock = threading.Lock()
+_file_hashes = {}  # path -> ((mtime_ns, size), sha256)
+
+def file_version(path):
+    """sha256 of a file's content, recomputed only when its mtime or size changes; None if missing."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _hash_lock:
+        cached = _file_hashes.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    with _hash_lock:
+        _file_hashes[path] = (signature, digest)
+    return digest
+
+def clear_versions():
+    """Forget every cached hash, so the next file_version reads the files again."""
+    with _hash_lock:
+        _file_hashes.clear()
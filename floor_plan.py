@@ -0,0 +1,141 @@
+"""Table grid for the app.py dashboard, laid out from a venue definition.
+
+The venue (venue.json, or DEFAULT_VENUE when there is none) gives the grid size, the head
+tables shown above the grid and the grid cells left empty for aisles or the stage:
+
+    {"rows": 7, "columns": 9, "head_tables": ["Diraja 1", "Diraja 2"], "gaps": [[4, 5]]}
+
+Tables are numbered row by row from first_table, skipping the gaps.
+"""
+import html
+import json
+import os
+
+import pandas as pd
+
+# --- CONFIGURATION ---
+VENUE_FILE = 'venue.json'
+DEFAULT_VENUE = {
+    'rows': 7,
+    'columns': 9,
+    'first_table': 1,
+    'head_tables': ['Diraja 1', 'Diraja 2'],
+    'gaps': [],  # [row, column] cells, counted from 1
+}
+CELL_WIDTH = 88  # px, used to size the grid for wide halls
+
+FLOOR_PLAN_CSS = """
+<style>
+    .head-table-container {
+        display: flex;
+        justify-content: center;
+        gap: 20px;
+        margin: 0 auto 5px auto;
+        max-width: %(max_width)dpx;
+    }
+    .head-box {
+        background-color: #FF9900; /* Orange color */
+        border: 1px solid #444;
+        color: white;
+        padding: 10px;
+        text-align: center;
+        font-weight: bold;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        height: 50px;
+        width: 250px;
+    }
+    .table-grid {
+        display: grid;
+        grid-template-columns: repeat(%(columns)d, 1fr);
+        grid-template-rows: repeat(%(rows)d, 1fr);
+        gap: 5px;
+        margin: 0 auto;
+        max-width: %(max_width)dpx;
+    }
+    .table-cell {
+        border: 1px solid #444;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        font-size: 12px;
+        color: black;
+        padding: 10px;
+        text-align: center;
+        flex-direction: column;
+        aspect-ratio: 1 / 1; /* Added for square cells */
+    }
+    .booked { background-color: #00FFFF; } /* Aqua */
+    .vacant { background-color: #778899; } /* Grey */
+    .gap { visibility: hidden; }
+    @media (max-width: 600px) {
+        .table-cell {
+            font-size: 10px;
+            padding: 5px;
+        }
+    }
+</style>
+"""
+
+def load_venue(venue_file=VENUE_FILE):
+    """The venue definition from venue_file, with DEFAULT_VENUE filling anything it leaves out."""
+    venue = dict(DEFAULT_VENUE)
+    if venue_file and os.path.exists(venue_file):
+        with open(venue_file, encoding='utf-8') as f:
+            venue.update(json.load(f))
+    return venue
+
+def grid_cells(venue):
+    """Every grid cell in row order as (row, column, table_number), with None for a gap."""
+    gaps = {tuple(cell) for cell in venue['gaps']}
+    table_number = venue['first_table']
+    cells = []
+    for row in range(1, venue['rows'] + 1):
+        for col in range(1, venue['columns'] + 1):
+            if (row, col) in gaps:
+                cells.append((row, col, None))
+            else:
+                cells.append((row, col, table_number))
+                table_number += 1
+    return cells
+
+def booked_tables(seating_df):
+    """Set of numbered tables that have at least one seat in the seating plan."""
+    numbers = pd.to_numeric(seating_df['table_number'], errors='coerce').dropna()
+    return set(numbers.astype(int).unique().tolist())
+
+def wakil_by_table(tempahan_df):
+    """Booking name per table number.
+
+    Bookings are listed one table per row in table order, so row n is table n unless the
+    file has its own table_number (or Meja) column.
+    """
+    names = tempahan_df['Nama'].astype(str).tolist()
+    for col in ('table_number', 'Meja'):
+        if col in tempahan_df.columns:
+            tables = pd.to_numeric(tempahan_df[col], errors='coerce')
+            return {int(t): name for t, name in zip(tables, names) if pd.notna(t)}
+    return dict(enumerate(names, start=1))
+
+def floor_plan_html(venue, booked, wakil):
+    """Head tables and the table grid as one HTML block, CSS included."""
+    max_width = max(800, venue['columns'] * CELL_WIDTH)
+    parts = [FLOOR_PLAN_CSS % {'columns': venue['columns'], 'rows': venue['rows'], 'max_width': max_width}]
+
+    if venue['head_tables']:
+        parts.append('<div class="head-table-container">')
+        parts.extend(f'<div class="head-box">{html.escape(str(name))}</div>' for name in venue['head_tables'])
+        parts.append('</div>')
+
+    parts.append('<div class="table-grid">')
+    for row, col, table_number in grid_cells(venue):
+        if table_number is None:
+            parts.append('<div class="table-cell gap"></div>')
+        elif table_number not in booked:
+            parts.append(f'<div class="table-cell vacant">R{table_number}</div>')
+        else:
+            name = html.escape(wakil.get(table_number, 'No Wakil'))
+            parts.append(f'<div class="table-cell booked">R{table_number} | {name}</div>')
+    parts.append('</div>')
+    return ''.join(parts)
@@ -1,58 +1,284 @@
+import argparse
 import csv
-from reportlab.pdfgen import canvas
+import heapq
+import io
+import itertools
+import os
+import tempfile
 from datetime import datetime
 
-def generate_guest_list():
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from reportlab import rl_config
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+
+import event_store
+from name_normalizer import collation_keys
+from pdf_concat import concat_pdfs
+from stage_trace import span
+
+# --- CONFIGURATION ---
+SEATING_FILE = event_store.STORE_FILE
+OUTPUT_FILE = 'guest_list.pdf'
+SKIP_PREFIX = 'Ahli Keluarga'
+GUEST_COLUMNS = ['name', 'table_number', 'seat']
+BATCH_ROWS = 65536      # rows read from the input at a time
+RUN_ROWS = 200000       # rows sorted in memory before a sorted run is spilled to disk
+MERGE_BATCH_ROWS = 4096  # rows per run held in memory while runs are merged
+PART_PAGES = 100        # pages held by reportlab before they are written out
+
+# Page layout (A4, points)
+COLUMNS = 2
+FONT = 'Helvetica'
+FONT_SIZE = 9
+LEADING = 11
+MARGIN = 40
+HEADING_TOP = 800       # title and timestamp, first page only
+COLUMN_HEADING_TOP = 760
+COLUMN_GAP = 15
+
+def read_guest_rows(csv_file):
+    """Read guest name, table and seat from the seating CSV."""
     guests = []
-    
-    # Read CSV file
-    with open('guest_seat.csv', 'r', encoding='utf-8') as csvfile:
+    with open(csv_file, 'r', encoding='utf-8') as csvfile:
         reader = csv.DictReader(csvfile)
-        # next(reader)  # Skip header row
         for row in reader:
-            if row['name'].startswith('Ahli Keluarga'):
+            if row['name'].startswith(SKIP_PREFIX):
                 continue
             guests.append({
                 'name': row['name'],
                 'table': row['table_number'],
                 'seat': row['seat']
             })
-    
-    # Sort by name ascending
-    guests.sort(key=lambda x: x['name'])
-    
-    # Create PDF
-    c = canvas.Canvas("guest_list.pdf")
+    return guests
+
+def iter_batches(source):
+    """Yield Arrow record batches of name, table_number and seat (as strings) from a source.
+
+    source is a seating CSV, a parquet or Arrow IPC file, a DataFrame, or a list of
+    guest dicts as returned by read_guest_rows.
+    """
+    string_schema = pa.schema([(col, pa.string()) for col in GUEST_COLUMNS])
+
+    if isinstance(source, pd.DataFrame):
+        table = pa.Table.from_pandas(source[GUEST_COLUMNS].astype(str), preserve_index=False)
+        yield from table.to_batches(BATCH_ROWS)
+    elif isinstance(source, list):
+        for start in range(0, len(source), BATCH_ROWS):
+            chunk = source[start:start + BATCH_ROWS]
+            yield pa.record_batch([
+                pa.array([g['name'] for g in chunk], pa.string()),
+                pa.array([g['table'] for g in chunk], pa.string()),
+                pa.array([g['seat'] for g in chunk], pa.string()),
+            ], schema=string_schema)
+    elif source.endswith('.parquet'):
+        for batch in pq.ParquetFile(source).iter_batches(BATCH_ROWS, columns=GUEST_COLUMNS):
+            yield batch.cast(string_schema)
+    elif source.endswith(('.arrow', '.feather')):
+        with pa.memory_map(source) as f:
+            reader = pa.ipc.open_file(f)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).select(GUEST_COLUMNS).cast(string_schema)
+    else:
+        reader = pacsv.open_csv(
+            source,
+            read_options=pacsv.ReadOptions(block_size=1 << 20),
+            convert_options=pacsv.ConvertOptions(
+                column_types=string_schema,
+                include_columns=GUEST_COLUMNS,
+                strings_can_be_null=False,
+            ),
+        )
+        yield from reader
+
+def keyed_batches(source):
+    """Yield batches of key, name, table_number and seat for every listed guest, in input order."""
+    for batch in iter_batches(source):
+        batch = batch.filter(pc.invert(pc.starts_with(pc.fill_null(batch.column(0), ''), SKIP_PREFIX)))
+        yield pa.record_batch([collation_keys(batch.column(0))] + batch.columns, names=['key'] + GUEST_COLUMNS)
+
+def sorted_runs(source, run_rows=RUN_ROWS):
+    """Yield tables of about run_rows guests each, every one sorted by collation key."""
+    batches, rows = [], 0
+    for batch in keyed_batches(source):
+        batches.append(batch)
+        rows += batch.num_rows
+        if rows >= run_rows:
+            table = pa.Table.from_batches(batches)
+            yield table.take(pc.sort_indices(table, [('key', 'ascending')]))
+            batches, rows = [], 0
+    if rows:
+        table = pa.Table.from_batches(batches)
+        yield table.take(pc.sort_indices(table, [('key', 'ascending')]))
+
+def table_rows(batches):
+    """Yield (key, name, table, seat) tuples from record batches."""
+    for batch in batches:
+        yield from zip(*(column.to_pylist() for column in batch.columns))
+
+def _write_run(table, folder, number):
+    path = os.path.join(folder, f'run{number}.arrow')
+    with pa.OSFile(path, 'wb') as f, pa.ipc.new_file(f, table.schema) as writer:
+        writer.write_table(table, max_chunksize=MERGE_BATCH_ROWS)
+    return path
+
+def _read_run(path):
+    with pa.OSFile(path) as f:
+        reader = pa.ipc.open_file(f)
+        yield from table_rows(reader.get_batch(i) for i in range(reader.num_record_batches))
+
+def sorted_guests(source, run_rows=RUN_ROWS):
+    """Yield (name, table, seat) sorted by collation key, holding about run_rows guests in memory.
+
+    Guests are sorted in runs; when there is more than one run they are spilled to a
+    temporary folder as Arrow files and merged back in one pass.
+    """
+    runs = sorted_runs(source, run_rows)
+    first_run = next(runs, None)
+    second_run = next(runs, None)
+    if second_run is None:
+        if first_run is not None:
+            for key, name, table, seat in table_rows(first_run.to_batches(BATCH_ROWS)):
+                yield name, table, seat
+        return
+
+    with tempfile.TemporaryDirectory(prefix='guest_list_') as folder:
+        paths = [_write_run(first_run, folder, 0), _write_run(second_run, folder, 1)]
+        del first_run, second_run
+        for number, run in enumerate(runs, start=2):
+            paths.append(_write_run(run, folder, number))
+        for key, name, table, seat in heapq.merge(*(_read_run(path) for path in paths)):
+            yield name, table, seat
+
+def fit_text(text, max_width):
+    """Shorten text with an ellipsis so it fits max_width points."""
+    if pdfmetrics.stringWidth(text, FONT, FONT_SIZE) <= max_width:
+        return text
+    while text and pdfmetrics.stringWidth(text + '...', FONT, FONT_SIZE) > max_width:
+        text = text[:-1]
+    return text + '...'
+
+def column_layout(columns=COLUMNS):
+    """x positions of the name, table and seat in every column, and the width left for names."""
+    page_width = A4[0]
+    column_width = (page_width - 2 * MARGIN - (columns - 1) * COLUMN_GAP) / columns
+    table_offset = column_width - 55
+    seat_offset = column_width - 22
+    origins = [MARGIN + i * (column_width + COLUMN_GAP) for i in range(columns)]
+    return [(x, x + table_offset, x + seat_offset) for x in origins], table_offset - 5
+
+# Standard fonts are WinAnsi encoded: map each byte of a cp1252 string to its PDF string form
+PDF_ESCAPES = {i: f'\\{i:03o}' for i in list(range(32)) + list(range(127, 256))}
+PDF_ESCAPES.update({ord('('): '\\(', ord(')'): '\\)', ord('\\'): '\\\\'})
+
+def pdf_string(text):
+    return text.encode('cp1252', 'replace').decode('latin-1').translate(PDF_ESCAPES)
+
+def draw_lines(c, x, top, lines):
+    """Draw lines downwards from (x, top) as one text object, written as a single block of Tj/T* operators."""
+    text = c.beginText(x, top)
+    text.setFont(FONT, FONT_SIZE, LEADING)
+    begin = text.getCode()[:-len('ET')]  # position and font, without the closing ET
+    c.addLiteral(begin + '(' + ') Tj T* ('.join(map(pdf_string, lines)) + ') Tj ET')
+
+def draw_page(c, page_rows, rows_per_column, positions, name_width):
+    """Draw one page of rows, filling each column top to bottom, with one text object per field."""
+    c.setFont("Helvetica-Bold", FONT_SIZE + 1)
+    for name_x, table_x, seat_x in positions:
+        c.drawString(name_x, COLUMN_HEADING_TOP, "Tetamu")
+        c.drawString(table_x, COLUMN_HEADING_TOP, "Meja")
+        c.drawString(seat_x, COLUMN_HEADING_TOP, "Siri")
+
+    top = COLUMN_HEADING_TOP - LEADING - 4
+    for col, (name_x, table_x, seat_x) in enumerate(positions):
+        column_rows = page_rows[col * rows_per_column:(col + 1) * rows_per_column]
+        if not column_rows:
+            break
+        names, tables, seats = zip(*column_rows)
+        draw_lines(c, name_x, top, [fit_text(name, name_width) for name in names])
+        draw_lines(c, table_x, top, tables)
+        draw_lines(c, seat_x, top, seats)
+
+def draw_heading(c):
+    """Title and timestamp at the top of the first page."""
     c.setFont("Helvetica-Bold", 16)
-    c.drawString(150, 750, "Senarai Tetamu")
-    
+    c.drawString(MARGIN, HEADING_TOP, "Senarai Tetamu")
+
     # Add timestamp
     c.setFont("Helvetica", 10)
     timestamp = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
-    c.drawString(150, 735, f"Berakhir pada: {timestamp}")
-    
-    # Add table headers
-    c.setFont("Helvetica-Bold", 13)
-    c.drawString(50, 700, "Tetamu")
-    c.drawString(350, 700, "Meja")
-    c.drawString(400, 700, "Siri")
-    
-    # Add guest data
-    c.setFont("Helvetica", 12)
-    y_position = 685
-    for guest in guests:
-        c.drawString(50, y_position, guest['name'])
-        c.drawString(350, y_position, guest['table'])
-        c.drawString(400, y_position, guest['seat'])
-        y_position -= 15
-        
-        # Add new page if needed
-        if y_position < 50:
+    c.drawString(MARGIN, HEADING_TOP - 15, f"Berakhir pada: {timestamp}")
+
+def render_part(pages, rows_per_column, positions, name_width, heading=False):
+    """Render a batch of pages to PDF bytes; reportlab holds a document in memory until save."""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    if heading:
+        draw_heading(c)
+    for number, page_rows in enumerate(pages):
+        if number:
             c.showPage()
-            c.setFont("Helvetica", 12)
-            y_position = 750
-    
+        draw_page(c, page_rows, rows_per_column, positions, name_width)
     c.save()
+    return buffer.getvalue()
+
+def generate_guest_list(source=None, output_file=OUTPUT_FILE, columns=COLUMNS, run_rows=RUN_ROWS):
+    """Write the alphabetical guest list PDF from a seating file, DataFrame or list of guests.
+
+    source defaults to event_store.seating_file() (the seating database, the event store
+    or guest_seat.csv). Rows are streamed from the source, sorted by collation key in bounded memory and
+    drawn PART_PAGES pages at a time; the compressed parts are joined at the end.
+    Returns the number of guests listed.
+    """
+    if source is None:
+        source = event_store.seating_file(SEATING_FILE)
+    if isinstance(source, str) and source.endswith('.db'):
+        source = event_store.load_seating(source)
+    positions, name_width = column_layout(columns)
+    rows_per_column = int((COLUMN_HEADING_TOP - LEADING - 4 - MARGIN) // LEADING) + 1
+    rows_per_page = rows_per_column * columns
+
+    guests = sorted_guests(source, run_rows)
+    pages = iter(lambda: list(itertools.islice(guests, rows_per_page)), [])
+    parts = []
+    count = 0
+
+    # Binary page streams: reportlab's pure-Python ASCII85 encoder costs more than drawing
+    use_a85 = rl_config.useA85
+    rl_config.useA85 = 0
+    try:
+        while True:
+            # Pulling pages runs the streamed read and merge sort
+            with span('sort'):
+                batch = list(itertools.islice(pages, PART_PAGES))
+            if not batch and parts:
+                break
+            rows = sum(len(page_rows) for page_rows in batch)
+            with span('render') as step:
+                parts.append(render_part(batch, rows_per_column, positions, name_width, heading=not parts))
+                step.rows = rows
+            count += rows
+    finally:
+        rl_config.useA85 = use_a85
+
+    if len(parts) == 1:
+        with span('write'), open(output_file, 'wb') as f:
+            f.write(parts[0])
+    else:
+        concat_pdfs(parts, output_file)
+    return count
 
 if __name__ == "__main__":
-    generate_guest_list()
+    parser = argparse.ArgumentParser(description="Write the alphabetical guest list PDF.")
+    parser.add_argument('source', nargs='?', default=None,
+                        help="seating CSV, parquet or Arrow file (default: guest_seat.parquet)")
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--columns', type=int, default=COLUMNS)
+    args = parser.parse_args()
+
+    generate_guest_list(args.source, args.output, args.columns)
@@ -0,0 +1,120 @@
+import csv
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+# --- CONFIGURATION ---
+TEMPAHAN_FOLDER = 'tempahan'
+DEFAULT_MENU = 'Daging'
+MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# The only columns taken from a group file; anything else in the file is ignored.
+GROUP_FILE_SCHEMA = pa.schema([('name', pa.string()), ('menu', pa.string())])
+GUEST_SCHEMA = pa.schema([
+    ('name', pa.string()),
+    ('menu', pa.string()),
+    ('gp_id', pa.int64()),
+    ('gp_name', pa.string()),
+])
+
+def list_group_files(tempahan_folder=TEMPAHAN_FOLDER):
+    """Return the grp*.csv files in the folder, ordered by group number."""
+    group_files = [f for f in os.listdir(tempahan_folder) if f.startswith('grp') and f.endswith('.csv')]
+    group_files.sort(key=lambda x: int(re.search(r'\d+', x).group()) if re.search(r'\d+', x) else 0)
+    return group_files
+
+def parse_group_filename(file):
+    """Extract gp_id and gp_name from a file name such as grp12-weststar.csv."""
+    gp_id_match = re.search(r'grp(\d+)', file)
+    gp_id = int(gp_id_match.group(1)) if gp_id_match else 0
+    gp_name_match = re.search(r'-(.*?)\.csv$', file)
+    gp_name = gp_name_match.group(1).strip() if gp_name_match else "unknown"
+    return gp_id, gp_name
+
+def read_header(file_path):
+    """Return the column names of a CSV file, lower-cased, or None for an empty file."""
+    with open(file_path, newline='', encoding='utf-8-sig') as f:
+        header = next(csv.reader(f), None)
+    return [col.strip().lower() for col in header] if header else None
+
+def clean_group_table(table):
+    """Strip and title-case names, default empty menus and drop rows without a name."""
+    name = pc.utf8_title(pc.utf8_trim_whitespace(pc.fill_null(table['name'], '')))
+    menu = pc.utf8_trim_whitespace(pc.fill_null(table['menu'], ''))
+    menu = pc.if_else(pc.equal(menu, ''), DEFAULT_MENU, menu)
+    valid = pc.and_(pc.not_equal(name, ''), pc.not_equal(name, 'Nan'))
+    return pa.table([name, menu], schema=GROUP_FILE_SCHEMA).filter(valid)
+
+def skip_long_row(row):
+    """invalid_row_handler for group files: skip a row with more fields than the header,
+    stop on one with fewer (read_untidy_group_table reads those)."""
+    if row.actual_columns > row.expected_columns:
+        print(f"Warning: skipped line {row.number} with {row.actual_columns} fields: {row.text!r}")
+        return 'skip'
+    return 'error'
+
+def read_untidy_group_table(file_path, header):
+    """Read a group file with pandas, as before the fixed schema: short rows get empty
+    trailing fields (so a missing menu becomes DEFAULT_MENU) and long rows are skipped."""
+    df = pd.read_csv(file_path, names=header, skiprows=1, dtype=str, encoding='utf-8-sig',
+                     on_bad_lines='skip')
+    df = df.reindex(columns=GROUP_FILE_SCHEMA.names)
+    return pa.Table.from_pandas(df, schema=GROUP_FILE_SCHEMA, preserve_index=False)
+
+def read_group_table(tempahan_folder, file):
+    """Read one group file with the fixed schema, tagged with the gp_id and gp_name in its file name."""
+    file_path = os.path.join(tempahan_folder, file)
+    header = read_header(file_path)
+    if not header or 'name' not in header:
+        print(f"Warning: File {file} has no 'name' column, skipped.")
+        return GUEST_SCHEMA.empty_table()
+
+    try:
+        table = pacsv.read_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(column_names=header, skip_rows=1, use_threads=False),
+            parse_options=pacsv.ParseOptions(invalid_row_handler=skip_long_row),
+            convert_options=pacsv.ConvertOptions(
+                column_types=GROUP_FILE_SCHEMA,
+                include_columns=GROUP_FILE_SCHEMA.names,
+                include_missing_columns=True,
+                strings_can_be_null=True,
+            ),
+        )
+    except pa.ArrowInvalid as e:
+        print(f"Warning: File {file} has rows with missing fields ({e}), read it row by row.")
+        table = read_untidy_group_table(file_path, header)
+    table = clean_group_table(table)
+    if table.num_rows == 0:
+        print(f"Warning: File {file} contained no valid guest records after cleaning.")
+
+    gp_id, gp_name = parse_group_filename(file)
+    return table.append_column('gp_id', pa.array([gp_id] * table.num_rows, pa.int64())) \
+                .append_column('gp_name', pa.array([gp_name] * table.num_rows, pa.string()))
+
+def load_group_files(tempahan_folder, files=None, max_workers=MAX_WORKERS, with_source=False):
+    """Read group files concurrently into one Arrow-backed guests DataFrame.
+
+    Files are read in list_group_files order (or the order given) and every guest gets
+    an original_order across all files, as process_guest_files expects. with_source adds
+    a source_file column naming the file each guest came from.
+    """
+    if files is None:
+        files = list_group_files(tempahan_folder)
+    if not files:
+        return pd.DataFrame()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        tables = list(pool.map(lambda file: read_group_table(tempahan_folder, file), files))
+
+    table = pa.concat_tables(tables)
+    if with_source:
+        sources = [file for file, t in zip(files, tables) for _ in range(t.num_rows)]
+        table = table.append_column('source_file', pa.array(sources, pa.string()))
+    table = table.append_column('original_order', pa.array(range(table.num_rows), pa.int64()))
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
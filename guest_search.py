@@ -0,0 +1,163 @@
+"""In-memory guest search for main.py: ranked, typo-tolerant lookup by name, table and group.
+
+The index is built once per data version. Every word of every field is folded (case,
+accents and punctuation removed) and titles and ranks such as Dato', Kol, Lt Jen (B) only
+count when the query is nothing but titles, so "ahmad", "Ahmad" and "Dato' Ahmad" find
+the same guests in the same order. A query word
+matches an indexed word exactly, as a prefix, or with a typo or two; every query word
+has to match for a guest to be listed.
+"""
+import bisect
+from collections import defaultdict
+
+import numpy as np
+
+from name_normalizer import HONORIFICS, fold_name, fold_names
+
+# --- CONFIGURATION ---
+# Ranks and joining words that do not identify anyone
+RANK_WORDS = {
+    'lt', 'kol', 'jen', 'mej', 'brig', 'kapt', 'kapten', 'kdr', 'laks', 'laksda', 'laksma',
+    'laksamana', 'sjn', 'kpl', 'ptd', 'b', 'tudm', 'tldm', 'tdm', 'bin', 'binti', 'bt', 'bte',
+    'a', 'l', 'p', 'isteri',
+}
+TITLE_WORDS = {word for title in HONORIFICS for word in title.split()} | RANK_WORDS
+TABLE_COLUMN = 'Meja'
+# Matches in the guest's own name rank above matches in the group or menu
+FIELD_WEIGHTS = {'Nama': 1.0, 'Kluster': 0.8, 'Menu': 0.5}
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+TYPO_SCORE = 0.4
+TITLE_WEIGHT = 0.2  # a title or rank in a name counts for little when ranking
+TABLE_SCORE = 2.0
+MIN_PREFIX = 2   # shortest query word matched as a prefix
+MIN_TYPO = 4     # shortest query word allowed a typo
+RESULT_LIMIT = 100
+
+def query_words(folded):
+    """Words of a folded query, leaving out titles and ranks unless there is nothing else."""
+    tokens = folded.split()
+    return [t for t in tokens if t not in TITLE_WORDS] or tokens
+
+def trigrams(word):
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance between a and b, or limit + 1 once it is known to be larger."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+class GuestIndex:
+    """Word index over a guest DataFrame (main.py's Nama, Meja, Menu and Kluster columns)."""
+
+    def __init__(self, df, table_column=TABLE_COLUMN, field_weights=FIELD_WEIGHTS):
+        self.df = df.reset_index(drop=True)
+        self.table_column = table_column
+        self.fields = [col for col in field_weights if col in self.df.columns]
+
+        # word -> {row: (weight, field)} keeping the best field a row has the word in
+        best = defaultdict(dict)
+        for code, field in enumerate(self.fields):
+            weight = field_weights[field]
+            folded = fold_names(self.df[field].astype(str).to_numpy(dtype=object)).to_pylist()
+            for row, text in enumerate(folded):
+                for word in set(text.split()):
+                    word_weight = weight * TITLE_WEIGHT if word in TITLE_WORDS else weight
+                    current = best[word].get(row)
+                    if current is None or current[0] < word_weight:
+                        best[word][row] = (word_weight, code)
+
+        # word -> (rows, weights, field codes) as arrays, so a search adds up scores with numpy
+        self.postings = {}
+        for word, rows in best.items():
+            weights, codes = zip(*rows.values())
+            self.postings[word] = (np.fromiter(rows, np.int64, len(rows)),
+                                   np.array(weights, np.float32), np.array(codes, np.int8))
+        self.sorted_words = sorted(self.postings)
+
+        self.trigram_words = defaultdict(list)
+        for word in self.sorted_words:
+            for gram in trigrams(word):
+                self.trigram_words[gram].append(word)
+
+        self.table_rows = defaultdict(list)
+        if table_column in self.df.columns:
+            for row, table in enumerate(self.df[table_column].astype(str)):
+                self.table_rows[fold_name(table)].append(row)
+
+        self._match_cache = {}
+
+    def word_matches(self, query_word):
+        """Indexed words matching one query word, with their match scores."""
+        cached = self._match_cache.get(query_word)
+        if cached is not None:
+            return cached
+
+        matches = {}
+        if query_word in self.postings:
+            matches[query_word] = EXACT_SCORE
+        if len(query_word) >= MIN_PREFIX:
+            start = bisect.bisect_left(self.sorted_words, query_word)
+            for word in self.sorted_words[start:]:
+                if not word.startswith(query_word):
+                    break
+                matches.setdefault(word, PREFIX_SCORE + (EXACT_SCORE - PREFIX_SCORE) * len(query_word) / len(word))
+        # Only words are allowed a typo: intake27 must not find intake12
+        if len(query_word) >= MIN_TYPO and query_word.isalpha():
+            limit = 1 if len(query_word) < 7 else 2
+            candidates = {word for gram in trigrams(query_word) for word in self.trigram_words.get(gram, ())}
+            for word in candidates - matches.keys():
+                distance = edit_distance(query_word, word, limit)
+                if distance <= limit:
+                    matches[word] = TYPO_SCORE / distance
+
+        if len(self._match_cache) > 10000:
+            self._match_cache.clear()
+        self._match_cache[query_word] = matches
+        return matches
+
+    def search(self, query, column=None, limit=RESULT_LIMIT):
+        """Rows matching every word of the query, best first, as a DataFrame.
+
+        column limits the search to one field; a table number also finds the guests at that table.
+        """
+        folded = fold_name(query)
+        wanted = query_words(folded)
+        if not wanted:
+            return self.df.head(0)
+
+        scores = np.zeros(len(self.df), np.float32)
+        if column != self.table_column:
+            code = self.fields.index(column) if column in self.fields else None
+            if column is not None and code is None:
+                return self.df.head(0)
+            for i, query_word in enumerate(wanted):
+                word_scores = np.zeros(len(self.df), np.float32)
+                for word, match_score in self.word_matches(query_word).items():
+                    rows, weights, codes = self.postings[word]
+                    if code is not None:
+                        keep = codes == code
+                        rows, weights = rows[keep], weights[keep]
+                    word_scores[rows] = np.maximum(word_scores[rows], weights * match_score)
+                if i == 0:
+                    scores = word_scores
+                else:
+                    scores = np.where((scores > 0) & (word_scores > 0), scores + word_scores, 0)
+
+        if column in (None, self.table_column):
+            table_rows = self.table_rows.get(folded, [])
+            scores[table_rows] = np.maximum(scores[table_rows], TABLE_SCORE)
+
+        hits = np.flatnonzero(scores)
+        ranked = hits[np.lexsort((hits, -scores[hits]))][:limit]
+        return self.df.iloc[ranked]
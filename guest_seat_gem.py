@@ -1,12 +1,22 @@
+import numpy as np
 import pandas as pd
 import os
-import re
+from contextlib import closing
+
+import event_store
+import seating_db
+from guest_loader import DEFAULT_MENU, TEMPAHAN_FOLDER, load_group_files
+from name_normalizer import normalize_names
+from stage_trace import span, traced
 
 # --- CONFIGURATION ---
 STANDARD_TABLE_CAPACITY = 8
 DIRAJA_TABLE_CAPACITY = 9
+DIRAJA_GROUPS = ['diraja', 'ramli']
 RESERVE_FILE_NAME = 'data/reserve.csv' 
-DEFAULT_MENU = 'Daging'
+SEATING_FILE_NAME = 'guest_seat.csv'
+MENU_AWARE_FILL = False  # seat reserve guests at tables that already serve their menu
+SOLVER_MODE = False  # seat with seat_solver.py (shared tables, venue capacities) instead of whole tables per group
 
 def read_csv_file(filename):
     """Read a CSV file and return a DataFrame."""
@@ -23,7 +33,19 @@ def write_csv_file(df, filename):
     except Exception as e:
         print(f"Error writing to file {filename}: {e}")
 
+def write_seating_file(df):
+    """Write the seating to the event store (guest_seat.parquet) and its guest_seat.csv export,
+    and to the seating database when there is one."""
+    try:
+        event_store.write_seating(df, csv_file=SEATING_FILE_NAME)
+        if os.path.exists(seating_db.DB_FILE):
+            with closing(seating_db.connect()) as conn:
+                seating_db.import_seating(conn, df)
+    except Exception as e:
+        print(f"Error writing the seating to {event_store.STORE_FILE}: {e}")
+
 # --- DATA CLEANING ROUTINE (FIXED) ---
+@traced('clean')
 def clean_guest_data(df):
     """
     Performs essential data cleaning and standardization on the raw guest DataFrame.
@@ -56,61 +78,79 @@ def clean_guest_data(df):
     return df
 # --- END DATA CLEANING ROUTINE ---
 
-def assign_seats(guests_df):
-    """Assign table and seat numbers to guests, ensuring groups sit together."""
+def table_capacity(gp_names):
+    """Seats per table for each group name; Diraja and Ramli tables take one more."""
+    is_diraja = gp_names.str.lower().isin(DIRAJA_GROUPS)
+    return np.where(is_diraja, DIRAJA_TABLE_CAPACITY, STANDARD_TABLE_CAPACITY)
+
+@traced('assign')
+def assign_seats(guests_df, first_tables=None):
+    """Assign table and seat numbers to guests, ensuring groups sit together.
+
+    Every group is rounded up to whole tables and the spare seats are padded with
+    'Simpanan' rows. Table numbers, seat numbers and padding are computed for all
+    groups at once from the per-group sizes.
+
+    first_tables optionally maps gp_id to the table a group would like to start at
+    (by default its gp_id); a group only moves further up when the groups before it
+    need the room.
+    """
     
     if guests_df.empty:
         return pd.DataFrame()
-        
-    main_guests = []
-    
-    min_gp_id = guests_df['gp_id'].min()
-    table_counter = min_gp_id
-    
-    for gp_id, group_df in guests_df.groupby('gp_id'):
-        
-        # Ensure table assignment starts at least from the gp_id
-        table_counter = max(table_counter, gp_id)
-        
-        group_df = group_df.sort_values(by='original_order').reset_index(drop=True)
-        gp_name = group_df['gp_name'].iloc[0]
-        
-        if gp_name.lower() == "diraja" or gp_name.lower()=="ramli":
-            guests_per_table = DIRAJA_TABLE_CAPACITY
-        else:
-            guests_per_table = STANDARD_TABLE_CAPACITY
-            
-        num_guests = len(group_df)
-        num_tables = (num_guests + guests_per_table - 1) // guests_per_table
-        
-        total_seats_needed = num_tables * guests_per_table
-        remaining_seats = total_seats_needed - num_guests
-        
-        if remaining_seats > 0:
-            reserve_data = [{'name': 'Simpanan', 'menu': 'N/A', 'gp_id': 0, 'gp_name': 'RESERVE_SEAT', 'original_order': -1}] * remaining_seats
-            group_df = pd.concat([group_df, pd.DataFrame(reserve_data)], 
-                                   ignore_index=True)
-        
-        for table_num_in_group in range(num_tables):
-            start_index = table_num_in_group * guests_per_table
-            
-            table_df = group_df.iloc[start_index:start_index + guests_per_table].copy()
-            
-            current_table_number = table_counter
-            table_df['table_number'] = current_table_number
-            
-            table_df['seat'] = table_df.index - start_index + 1
-            
-            main_guests.append(table_df)
-            table_counter += 1
-    
-    main_guests_df = pd.concat(main_guests, ignore_index=True)
-    
-    main_guests_df = main_guests_df.sort_values(by=['table_number', 'seat']).reset_index(drop=True)
+
+    # Groups in gp_id order, guests in reading order within each group
+    guests_df = guests_df.sort_values(by=['gp_id', 'original_order'], kind='stable').reset_index(drop=True)
+
+    groups = guests_df.groupby('gp_id', sort=True)
+    sizes = groups.size().to_numpy()
+    gp_ids = groups.size().index.to_numpy()
+    capacity = table_capacity(groups['gp_name'].first())
+
+    num_tables = -(-sizes // capacity)
+    total_seats = num_tables * capacity
+    padding = total_seats - sizes
+
+    if first_tables is None:
+        preferred = gp_ids
+    else:
+        preferred = np.array([first_tables.get(gp_id, gp_id) for gp_id in gp_ids], dtype=gp_ids.dtype)
+
+    # A group's tables follow on from the previous group's, but never start below its preferred table:
+    # first_table[i] = max(first_table[i-1] + num_tables[i-1], preferred[i])
+    tables_before = np.cumsum(num_tables) - num_tables
+    first_table = tables_before + np.maximum.accumulate(preferred - tables_before)
+
+    # Position of each row within its group's block of seats; padding goes after the guests
+    group_idx = np.repeat(np.arange(len(sizes)), sizes)
+    position = np.arange(len(guests_df)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+    rows_df = guests_df[['name', 'menu', 'gp_id', 'gp_name']].copy()
+    num_padding = padding.sum()
+    if num_padding > 0:
+        pad_idx = np.repeat(np.arange(len(sizes)), padding)
+        pad_position = (np.arange(num_padding) - np.repeat(np.cumsum(padding) - padding, padding)
+                        + np.repeat(sizes, padding))
+        reserve_df = pd.DataFrame({'name': 'Simpanan', 'menu': 'N/A', 'gp_id': 0, 'gp_name': 'RESERVE_SEAT'},
+                                  index=range(num_padding))
+        rows_df = pd.concat([rows_df, reserve_df], ignore_index=True)
+        group_idx = np.concatenate([group_idx, pad_idx])
+        position = np.concatenate([position, pad_position])
+
+    table_capacity_per_row = capacity[group_idx]
+    rows_df['table_number'] = first_table[group_idx] + position // table_capacity_per_row
+    rows_df['seat'] = position % table_capacity_per_row + 1
+
+    # Seat blocks are laid out group after group, so each row's final place is known directly
+    seat_offset = np.cumsum(total_seats) - total_seats
+    order = np.empty(len(rows_df), dtype=np.int64)
+    order[seat_offset[group_idx] + position] = np.arange(len(rows_df))
+    main_guests_df = rows_df.iloc[order].reset_index(drop=True)
     
     final_columns = ['table_number', 'seat', 'name', 'menu', 'gp_id', 'gp_name']
     return main_guests_df[final_columns]
 
+@traced('read')
 def process_reserve_guests():
     """Read reserve.csv and prepare reserve guests list."""
     reserve_df = read_csv_file(RESERVE_FILE_NAME)
@@ -125,86 +165,121 @@ def process_reserve_guests():
     
     return valid_reserve_guests
 
-def fill_vacant_seats(assigned_df, reserve_guests_list):
-    """Replace 'Simpanan' entries in the assigned DataFrame with reserve guests."""
+def plan_menu_aware_fill(assigned_df, vacant_rows, reserve_menus):
+    """Pick a vacant seat for each reserve guest, preferring tables already serving their menu.
+
+    vacant_rows are positions of 'Simpanan' rows in assigned_df. Returns matching arrays of
+    seat positions and reserve guest positions.
+    """
+    tables = assigned_df['table_number'].to_numpy()
+    seated = assigned_df['name'].to_numpy() != 'Simpanan'
+    menu_mix = pd.crosstab(tables[seated], assigned_df['menu'].to_numpy()[seated])
+
+    # Per-table index of vacancies, in seat order
+    vacancies = pd.Series(vacant_rows).groupby(tables[vacant_rows]).apply(list).to_dict()
+    next_free = dict.fromkeys(vacancies, 0)
+
+    seat_rows, guest_rows = [], []
+    menus = pd.Series(reserve_menus)
+    # Menus with the most reserve guests get first pick of the matching tables
+    for menu in menus.value_counts().index:
+        guests = menus.index[menus == menu].to_numpy()
+        served = menu_mix[menu] if menu in menu_mix.columns else pd.Series(dtype=int)
+        ranked = sorted(vacancies, key=lambda table: (-served.get(table, 0), table))
+
+        taken = 0
+        for table in ranked:
+            if taken == len(guests):
+                break
+            free = vacancies[table][next_free[table]:]
+            count = min(len(free), len(guests) - taken)
+            seat_rows.extend(free[:count])
+            guest_rows.extend(guests[taken:taken + count])
+            next_free[table] += count
+            taken += count
+
+    return np.array(seat_rows, dtype=np.int64), np.array(guest_rows, dtype=np.int64)
+
+@traced('fill')
+def fill_vacant_seats(assigned_df, reserve_guests_list, menu_aware=MENU_AWARE_FILL):
+    """Replace 'Simpanan' entries in the assigned DataFrame with reserve guests.
+
+    By default reserve guests take the vacant seats in table order. With menu_aware, each
+    reserve guest goes to a table that already serves their menu where possible.
+    """
     
-    if not reserve_guests_list:
+    if len(reserve_guests_list) == 0:
         print("No reserve guests available to fill vacant seats.")
         return assigned_df
         
-    simpanan_indices = assigned_df[assigned_df['name'] == 'Simpanan'].index
+    reserve_df = pd.DataFrame(reserve_guests_list).reset_index(drop=True)
+    reserve_menus = reserve_df['menu'].fillna(DEFAULT_MENU) if 'menu' in reserve_df.columns \
+        else pd.Series(DEFAULT_MENU, index=reserve_df.index)
     
-    filled_count = 0
+    vacant_rows = np.flatnonzero(assigned_df['name'].to_numpy() == 'Simpanan')
     
-    for i in range(min(len(simpanan_indices), len(reserve_guests_list))):
-        idx_to_replace = simpanan_indices[i]
-        reserve_guest = reserve_guests_list[i]
-        
-        assigned_df.loc[idx_to_replace, 'name'] = reserve_guest.get('name')
-        assigned_df.loc[idx_to_replace, 'menu'] = reserve_guest.get('menu', DEFAULT_MENU) 
-        assigned_df.loc[idx_to_replace, 'gp_id'] = 999 
-        assigned_df.loc[idx_to_replace, 'gp_name'] = 'Reserve'
-        
-        filled_count += 1
-        
+    if menu_aware:
+        seat_rows, guest_rows = plan_menu_aware_fill(assigned_df, vacant_rows, reserve_menus.to_numpy())
+    else:
+        filled = min(len(vacant_rows), len(reserve_df))
+        seat_rows, guest_rows = vacant_rows[:filled], np.arange(filled)
+    
+    # One indexed write for all reserve guests
+    fill_df = pd.DataFrame({
+        'name': reserve_df['name'].to_numpy()[guest_rows],
+        'menu': reserve_menus.to_numpy()[guest_rows],
+        'gp_id': 999,
+        'gp_name': 'Reserve',
+    }, index=assigned_df.index[seat_rows])
+    assigned_df.loc[fill_df.index, fill_df.columns] = fill_df
+    
+    filled_count = len(seat_rows)
+    wasted = len(vacant_rows) - filled_count
+    fill_rate = filled_count / len(vacant_rows) * 100 if len(vacant_rows) else 100.0
     print(f"Successfully filled {filled_count} vacant seats with reserve guests.")
+    print(f"Fill rate: {fill_rate:.1f}% of {len(vacant_rows)} vacant seats, {wasted} seats left as Simpanan, "
+          f"{len(reserve_df) - filled_count} reserve guests without a seat.")
     
     return assigned_df
 
-def process_guest_files():
-    """Process all guest files, assign seating, and fill vacant seats with reserves."""
-    tempahan_folder = 'tempahan'
-    
-    if not os.path.exists(tempahan_folder):
-        print(f"Error: Folder '{tempahan_folder}' not found. Please create it and place CSV files inside.")
+def process_guest_files(solver=SOLVER_MODE, venue_file=None, time_budget=None):
+    """Process all guest files, assign seating, and fill vacant seats with reserves.
+
+    With solver, groups may share tables and large groups are split into whole tables
+    (seat_solver.py, using the venue file's capacities and sharing rules).
+    """
+    if not os.path.exists(TEMPAHAN_FOLDER):
+        print(f"Error: Folder '{TEMPAHAN_FOLDER}' not found. Please create it and place CSV files inside.")
         return pd.DataFrame()
-        
-    group_files = [f for f in os.listdir(tempahan_folder) if f.startswith('grp') and f.endswith('.csv')]
     
-    group_files.sort(key=lambda x: int(re.search(r'\d+', x).group()) if re.search(r'\d+', x) else 0)
-    
-    guests = []
-    global_guest_counter = 0 
-    
-    for file in group_files:
-        file_path = os.path.join(tempahan_folder, file)
-        group_df = read_csv_file(file_path)
-        
-        if group_df.empty:
-            continue
-            
-        group_df = clean_guest_data(group_df)
-        if group_df.empty:
-            print(f"Warning: File {file} contained no valid guest records after cleaning.")
-            continue
-            
-        gp_id_match = re.search(r'grp(\d+)', file)
-        gp_id = int(gp_id_match.group(1)) if gp_id_match else 0
-        gp_name_match = re.search(r'-(.*?)\.csv$', file)
-        gp_name = gp_name_match.group(1).strip() if gp_name_match else "unknown"
-        
-        group_df['gp_id'] = gp_id
-        group_df['gp_name'] = gp_name
-        
-        valid_guests = group_df.copy()
-        valid_guests['original_order'] = range(global_guest_counter, global_guest_counter + len(valid_guests))
-        global_guest_counter += len(valid_guests)
-        
-        guests.append(valid_guests)
+    with span('read') as step:
+        guests_df = load_group_files(TEMPAHAN_FOLDER)
+        step.rows = len(guests_df)
     
-    if not guests:
+    if guests_df.empty:
         print("No valid main guest data found.")
         return pd.DataFrame()
-        
-    guests_df = pd.concat(guests, ignore_index=True)
     
-    assigned_seats_df = assign_seats(guests_df)
+    if solver:
+        import seat_solver  # seat_solver builds on this module
+        solver_args = {key: value for key, value in (('venue_file', venue_file), ('time_budget', time_budget))
+                       if value is not None}
+        assigned_seats_df, stats = seat_solver.solve_seating(guests_df, **solver_args)
+        seat_solver.report(guests_df, assigned_seats_df, stats)
+    else:
+        assigned_seats_df = assign_seats(guests_df)
     
     reserve_guests_list = process_reserve_guests()
     
     final_guests_df = fill_vacant_seats(assigned_seats_df, reserve_guests_list)
     
-    write_csv_file(final_guests_df, 'guest_seat.csv')
+    with span('clean') as step:
+        final_guests_df = normalize_names(final_guests_df)
+        step.rows = len(final_guests_df)
+    
+    with span('write') as step:
+        write_seating_file(final_guests_df)
+        step.rows = len(final_guests_df)
     
     return final_guests_df
 
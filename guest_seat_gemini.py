@@ -2,6 +2,8 @@ import pandas as pd
 import os
 import re
 
+from guest_seat_gem import write_seating_file  # the store, guest_seat.csv and seating.db
+
 # --- CONFIGURATION ---
 # Define table sizes and starting numbers
 TABLE_START_NUMBER = 13
@@ -16,13 +18,6 @@ def read_csv_file(filename):
         print(f"Error: File not found at {filename}")
         return pd.DataFrame()
 
-def write_csv_file(df, filename):
-    """Write a DataFrame to a CSV file."""
-    try:
-        df.to_csv(filename, index=False)
-    except Exception as e:
-        print(f"Error writing to file {filename}: {e}")
-
 def assign_seats(guests_df):
     """Assign table and seat numbers to guests, ensuring groups sit together."""
     main_guests = []
@@ -140,8 +135,8 @@ def process_guest_files():
     # Assign seats
     final_guests_df = assign_seats(guests_df)
     
-    # Save to guest_seat.csv
-    write_csv_file(final_guests_df, 'guest_seat.csv')
+    # Save to the event store, guest_seat.csv and seating.db, which every later stage reads
+    write_seating_file(final_guests_df)
     
     return final_guests_df
 
@@ -1,9 +1,22 @@
+import argparse
 import csv
 import datetime
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet
 
+import event_store
+from pdf_concat import concat_pdfs
+from stage_trace import span, traced
+
+# --- CONFIGURATION ---
+TABLES_PER_PAGE = 2
+CHUNK_PAGES = 25  # pages laid out by one worker task
+MAX_WORKERS = os.cpu_count() or 1
+
 def read_guest_list(csv_file):
     guests = {}
     with open(csv_file, newline='', encoding='utf-8') as f:
@@ -22,59 +35,124 @@ def read_guest_list(csv_file):
             guests[table]['entries'].append((name, seat, menu))
     return guests
 
-def generate_pdf(guests, output_file):
+@traced('prepare')
+def guests_from_frame(df):
+    """Build the same table -> entries mapping as read_guest_list from an in-memory DataFrame."""
+    guests = {}
+    for row in df[['table_number', 'gp_name', 'name', 'seat', 'menu']].astype(str).itertuples(index=False):
+        table = row.table_number
+        if table not in guests:
+            guests[table] = {
+                'gp_name': row.gp_name,
+                'entries': []
+            }
+        guests[table]['entries'].append((row.name, row.seat, row.menu))
+    return guests
+
+def table_elements(table_number, table_data, styles):
+    """Flowables for one table: its heading, the guest table and the space after it."""
+    gp_name = table_data['gp_name']
+    entries = table_data['entries']
+
+    # Table header
+    header = Paragraph(f"Meja: {table_number} | {gp_name}", styles['Heading2'])
+
+    # Table data
+    data = [["Siri", "Tetamu", "Menu"]]
+    for name, seat, menu in entries:
+        data.append([seat, name, menu])
+
+    # Create and style the table
+    table = Table(data, colWidths=(50,300,50))  # Fixed to have 3 column widths
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), '#cccccc'),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+        ('GRID', (0, 0), (-1, -1), 1, '#dddddd'),
+    ]))
+    return [header, Spacer(1, 12), table, Spacer(1, 24)]
+
+@traced('render')
+def build_pdf(tables, output_file, timestamp=None):
+    """Lay out (table_number, table_data) pairs, TABLES_PER_PAGE to a page.
+
+    The title and timestamp header is only added when a timestamp is given, so a chunk
+    that does not start the document has none.
+    """
     doc = SimpleDocTemplate(output_file, pagesize=letter)
     styles = getSampleStyleSheet()
     elements = []
 
     # Header content
-    title = Paragraph("Majlis Makan Malam RAFOC `25", styles['Heading1'])
-    timestamp = Paragraph(f"Berakhir pada: {datetime.datetime.now().strftime('%d-%m-%Y %H:%M')}", styles['Normal'])
-    
-    # Add header content
-    elements.append(title)
-    elements.append(Spacer(1, 12))
-    elements.append(timestamp)
-    elements.append(Spacer(1, 24))
-
-    table_count = 0  # Track number of tables added to current page
-
-    # Add tables with page break prevention
-    for table_number, table_data in guests.items():
-        gp_name = table_data['gp_name']
-        entries = table_data['entries']
-        
-        # Table header
-        header = Paragraph(f"Meja: {table_number} | {gp_name}", styles['Heading2'])
-        elements.append(header)
+    if timestamp is not None:
+        elements.append(Paragraph("Majlis Makan Malam RAFOC `25", styles['Heading1']))
         elements.append(Spacer(1, 12))
-
-        # Table data
-        data = [["Siri", "Tetamu", "Menu"]]
-        for name, seat, menu in entries:
-            data.append([seat, name, menu])
-
-        # Create and style the table
-        table = Table(data, colWidths=(50,300,50))  # Fixed to have 3 column widths
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), '#cccccc'),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-            ('GRID', (0, 0), (-1, -1), 1, '#dddddd'),
-        ]))
-        
-        # Add table with page break prevention
-        elements.append(table)
+        elements.append(Paragraph(f"Berakhir pada: {timestamp}", styles['Normal']))
         elements.append(Spacer(1, 24))
 
-        table_count += 1
-        if table_count == 2:
+    # Add tables with page break prevention
+    for count, (table_number, table_data) in enumerate(tables, start=1):
+        elements.extend(table_elements(table_number, table_data, styles))
+        if count % TABLES_PER_PAGE == 0:
             elements.append(PageBreak())
-            table_count = 0
 
     doc.build(elements)
 
+def render_chunk(tables, timestamp=None):
+    """Render one chunk of tables in a worker process and return the PDF bytes."""
+    buffer = io.BytesIO()
+    build_pdf(tables, buffer, timestamp)
+    return buffer.getvalue()
+
+def generate_pdf(guests, output_file, workers=1, cache=None):
+    """Write the seating plan PDF, rendering page-aligned chunks in parallel when workers > 1.
+
+    Every page break falls after TABLES_PER_PAGE tables, so chunks of a whole number of
+    pages lay out exactly as they would in one document and are joined in order.
+
+    cache is a dict the caller keeps between runs (seat_worker.py does): the rendered
+    chunks after the first, by their tables. Only the chunks whose tables changed are laid
+    out again; the first one always is, for its timestamp.
+    """
+    timestamp = datetime.datetime.now().strftime('%d-%m-%Y %H:%M')
+    tables = list(guests.items())
+    chunk_size = CHUNK_PAGES * TABLES_PER_PAGE
+
+    if cache is None and (workers <= 1 or len(tables) <= chunk_size):
+        build_pdf(tables, output_file, timestamp)
+        return
+
+    chunks = [tables[i:i + chunk_size] for i in range(0, len(tables), chunk_size)]
+    keys = [None] + [repr(chunk) for chunk in chunks[1:]]
+    parts = [None if cache is None else cache.get(key) for key in keys]
+    todo = [i for i, part in enumerate(parts) if part is None]
+    timestamps = [timestamp if i == 0 else None for i in todo]
+    if workers <= 1 or len(todo) <= 1:
+        rendered = list(map(render_chunk, [chunks[i] for i in todo], timestamps))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(render_chunk, [chunks[i] for i in todo], timestamps))
+    for i, part in zip(todo, rendered):
+        parts[i] = part
+
+    if cache is not None:
+        cache.clear()  # keep only this seating's chunks
+        cache.update(zip(keys[1:], parts[1:]))
+    if len(parts) == 1:
+        with open(output_file, 'wb') as f:
+            f.write(parts[0])
+    else:
+        concat_pdfs(parts, output_file)
+
 if __name__ == "__main__":
-    guests = read_guest_list("guest_seat.csv")
-    generate_pdf(guests, "guest_seat.pdf")
+    parser = argparse.ArgumentParser(description="Write the seating plan PDF.")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help="processes laying out pages (1 = single process)")
+    args = parser.parse_args()
+
+    with span('read') as step:
+        df = event_store.load_seating()
+        step.rows = len(df)
+    guests = guests_from_frame(df)
+    generate_pdf(guests, "guest_seat.pdf", args.workers)
@@ -1,4 +1,27 @@
 import csv
+import os
+import re
+from contextlib import ExitStack
+
+import event_store
+from stage_trace import span, traced
+
+# --- CONFIGURATION ---
+DIRAJA_FILE = 'diraja.csv'
+
+# Tag files the glabels templates merge from. They are always written, even when empty;
+# any other menu found in the data gets its own OTHER_MENU_FOLDER/menu_<menu>.csv, kept
+# apart from the pipeline's inputs (diraja.csv, tajaan.csv...).
+MENU_FILES = {
+    'Daging': 'daging.csv',
+    'Ayam': 'ayam.csv',
+    'Ikan': 'ikan.csv',
+    'Vegetarian': 'vege.csv'
+}
+OTHER_MENU_FOLDER = 'tags'
+# Menu values that are not a menu (reserve seats and blanks)
+NO_MENU = {'', 'N/A', 'nan'}
+WRITE_BUFFER_SIZE = 1 << 16
 
 def get_menu_color(menu):
     color_map = {
@@ -9,42 +32,106 @@ def get_menu_color(menu):
     }
     return color_map.get(menu, 'unknown')
 
-def main():
-    input_file = 'all_seat.csv'
-    
-    # Create separate output files for each menu type
-    output_files = {
-        'Daging': 'daging.csv',
-        'Ayam': 'ayam.csv',
-        'Ikan': 'ikan.csv',
-        'Vegetarian': 'vege.csv'
-    }
-    
-    with open(input_file, 'r', newline='', encoding='utf-8') as infile:
-        reader = csv.DictReader(infile)
-        fieldnames = reader.fieldnames
-        
-        # Create writers for each output file
-        writers = {}
-        for menu_type in output_files:
-            outfile = output_files[menu_type]
-            with open(outfile, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writers[menu_type] = writer
-        
-        # Process each row
+def menu_slug(menu):
+    return re.sub(r'[^a-z0-9]+', '_', menu.strip().lower()).strip('_')
+
+KNOWN_MENU_FILES = {menu_slug(menu): file for menu, file in MENU_FILES.items()}
+
+def menu_file_name(menu):
+    """Output file for a menu: the glabels file for known menus however they are spelt
+    ('daging', ' Daging'), otherwise OTHER_MENU_FOLDER/menu_<menu>.csv."""
+    if menu in MENU_FILES:
+        return MENU_FILES[menu]
+    slug = menu_slug(menu)
+    return KNOWN_MENU_FILES.get(slug) or os.path.join(OTHER_MENU_FOLDER, f'menu_{slug}.csv')
+
+def _csv_rows(filename):
+    with open(filename, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader, None)
         for row in reader:
-            menu_type = row['menu']
-            if menu_type in output_files:
-                # Find the corresponding writer for this menu type
-                for mt, writer in writers.items():
-                    if mt == menu_type:
-                        # Write to the appropriate file
-                        with open(output_files[mt], 'a', newline='', encoding='utf-8') as f:
-                            writer = csv.DictWriter(f, fieldnames=fieldnames)
-                            writer.writerow(row)
-                        break
+            if row:
+                yield row
+
+def seating_rows(seating=None, diraja_file=DIRAJA_FILE):
+    """Return the header and a lazy iterator over the diraja.csv rows followed by the seating rows.
+
+    seating is a seating CSV file, the event store, the seating database or an in-memory
+    seating DataFrame (event_store.load_seating() by default). The header comes from
+    diraja.csv when it exists, as it did for the old all_seat.csv.
+    """
+    if seating is None or isinstance(seating, str) and not seating.endswith('.csv'):
+        seating = event_store.load_seating(seating)
+    if isinstance(seating, str):
+        with open(seating, newline='', encoding='utf-8') as f:
+            fieldnames = next(csv.reader(f))
+        seating_iter = _csv_rows(seating)
+    else:
+        # The tags carry the CSV export's columns, not the store's guest_id
+        seating = seating[[col for col in seating.columns if col in event_store.SEATING_COLUMNS]]
+        fieldnames = seating.columns.tolist()
+        seating_iter = seating.astype(str).itertuples(index=False, name=None)
+
+    has_diraja = diraja_file and os.path.exists(diraja_file)
+    if has_diraja:
+        with open(diraja_file, newline='', encoding='utf-8') as f:
+            fieldnames = next(csv.reader(f))
+
+    def rows():
+        if has_diraja:
+            yield from _csv_rows(diraja_file)
+        yield from seating_iter
+
+    return fieldnames, rows()
+
+@traced('write', rows=lambda counts: sum(counts.values()))
+def split_by_menu(rows, fieldnames):
+    """Stream rows into one CSV per menu in a single pass, returning the row count per menu.
+
+    Menus spelt differently that share a file ('Daging' and 'daging') share its writer and
+    are counted under the first spelling, so one never truncates the other's tags.
+    """
+    menu_col = fieldnames.index('menu')
+    counts = {}
+
+    with ExitStack() as stack:
+        by_path = {}  # output file -> (writer, menu counted)
+        targets = {}  # menu as spelt in the data -> (writer, menu counted), None for no menu
+
+        def target(menu):
+            path = menu_file_name(menu)
+            if path not in by_path:
+                if os.path.dirname(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                f = stack.enter_context(open(path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE))
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
+                counts[menu] = 0
+                by_path[path] = (writer, menu)
+            return by_path[path]
+
+        for menu in MENU_FILES:
+            targets[menu] = target(menu)
+
+        for row in rows:
+            menu = row[menu_col]
+            if menu not in targets:
+                targets[menu] = None if menu.strip() in NO_MENU else target(menu)
+            found = targets[menu]
+            if found is None:
+                continue
+            writer, counted = found
+            writer.writerow(row)
+            counts[counted] += 1
+
+    return counts
+
+def main(seating=None, diraja_file=DIRAJA_FILE):
+    with span('read'):
+        fieldnames, rows = seating_rows(seating, diraja_file)
+    counts = split_by_menu(rows, fieldnames)
+    for menu, count in counts.items():
+        print(f"{menu_file_name(menu)}: {count} tags")
 
 if __name__ == '__main__':
     main()
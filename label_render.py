@@ -0,0 +1,320 @@
+"""Render the glabels menu tag templates (ayam/daging/ikan/vege.glabels) straight to PDF.
+
+Each template is read as-is: the page layout, text, box and image objects come from the
+.glabels file, and every row of the matching tag CSV (ayam.csv for ayam.glabels, ...)
+becomes one label. The Merge src inside the templates points at one laptop, so the
+tag file next to the template is used instead.
+
+Usage: python label_render.py [template.glabels ...]
+"""
+import argparse
+import base64
+import csv
+import glob
+import gzip
+import os
+import re
+import struct
+import xml.etree.ElementTree as ET
+
+from PIL import Image
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+
+# --- CONFIGURATION ---
+GLABELS_NS = {'gl': 'http://glabels.org/xmlns/3.0/'}
+PAGE_SIZES = {'A4': (595.2756, 841.8898), 'US-Letter': (612.0, 792.0)}
+# Tag files written by guest_tab_tag.py start with this header line
+TAG_FILE_HEADER = ['table_number', 'seat', 'name', 'menu', 'gp_id', 'gp_name']
+FONTS = {
+    (False, False): 'Helvetica',
+    (True, False): 'Helvetica-Bold',
+    (False, True): 'Helvetica-Oblique',
+    (True, True): 'Helvetica-BoldOblique',
+}
+LINE_HEIGHT = 1.2  # line pitch as a multiple of the font size
+
+UNITS = {'in': 72.0, 'mm': 72.0 / 25.4, 'cm': 72.0 / 2.54, 'pt': 1.0, 'pc': 12.0}
+
+def length(value, default=0.0):
+    """Convert a glabels length such as '3.74016in' to points."""
+    if not value:
+        return default
+    match = re.fullmatch(r'\s*(-?[\d.]+)\s*([a-z]*)\s*', value)
+    number, unit = float(match.group(1)), match.group(2) or 'pt'
+    return number * UNITS[unit]
+
+def rgba(value):
+    """Convert '0xRRGGBBAA' to an (r, g, b, a) tuple of 0..1 floats."""
+    packed = int(value, 16)
+    return tuple(((packed >> shift) & 0xff) / 255.0 for shift in (24, 16, 8, 0))
+
+def decode_pixdata(data):
+    """Decode a GdkPixdata blob, as embedded by glabels, into a PIL image."""
+    magic, _, pixdata_type, rowstride, width, height = struct.unpack('>4sIIIII', data[:24])
+    if magic != b'GdkP':
+        raise ValueError("not a GdkPixdata image")
+    mode = 'RGBA' if pixdata_type & 0xff == 2 else 'RGB'
+    bpp = len(mode)
+    pixels = data[24:]
+
+    if (pixdata_type >> 24) & 0x0f == 2:
+        # Run-length encoded: a count byte, then one pixel repeated or count literal pixels
+        out = bytearray()
+        pos = 0
+        while len(out) < width * height * bpp:
+            count = pixels[pos]
+            pos += 1
+            if count & 0x80:
+                out += pixels[pos:pos + bpp] * (count & 0x7f)
+                pos += bpp
+            else:
+                out += pixels[pos:pos + count * bpp]
+                pos += count * bpp
+        pixels, rowstride = bytes(out), width * bpp
+
+    return Image.frombytes(mode, (width, height), pixels, 'raw', mode, rowstride)
+
+def text_span(obj):
+    """Flatten an Object-text into its style and a list of ('text', value) / ('field', name) parts."""
+    span = obj.find('gl:Span', GLABELS_NS)
+    parts = []
+    if span.text:
+        parts.append(('text', span.text))
+    for child in span:
+        if child.tag.endswith('Field'):
+            parts.append(('field', child.get('name')))
+        if child.tail:
+            parts.append(('text', child.tail))
+
+    # Whitespace-only runs are just XML indentation around the fields
+    parts = [(kind, value.strip('\n ') if kind == 'text' and not value.strip() else value) for kind, value in parts]
+    parts = [(kind, value) for kind, value in parts if value]
+
+    bold = span.get('font_weight', 'Regular') == 'Bold'
+    italic = span.get('font_italic', 'False') == 'True'
+    return {
+        'font': FONTS[(bold, italic)],
+        'size': float(span.get('font_size', '10')),
+        'color': rgba(span.get('color', '0x000000ff')) if span.get('color') else None,
+        'line_spacing': float(span.get('line_spacing', '1')),
+        'parts': parts,
+    }
+
+def load_template(path):
+    """Parse a .glabels file into the page layout and a list of drawable objects."""
+    with gzip.open(path) as f:
+        root = ET.parse(f).getroot()
+
+    template = root.find('gl:Template', GLABELS_NS)
+    label = template.find('gl:Label-rectangle', GLABELS_NS)
+    layouts = [
+        {
+            'nx': int(layout.get('nx')), 'ny': int(layout.get('ny')),
+            'x0': length(layout.get('x0')), 'y0': length(layout.get('y0')),
+            'dx': length(layout.get('dx')), 'dy': length(layout.get('dy')),
+        }
+        for layout in label.findall('gl:Layout', GLABELS_NS)
+    ]
+
+    images = {}
+    for pixdata in root.iterfind('gl:Data/gl:Pixdata', GLABELS_NS):
+        images[pixdata.get('name')] = decode_pixdata(base64.b64decode(pixdata.text))
+
+    objects = []
+    for obj in root.find('gl:Objects', GLABELS_NS):
+        kind = obj.tag.split('}')[1]
+        item = {
+            'kind': kind,
+            'x': length(obj.get('x')), 'y': length(obj.get('y')),
+            'w': length(obj.get('w')), 'h': length(obj.get('h')),
+            'matrix': tuple(float(obj.get(f'a{i}', '1' if i in (0, 3) else '0')) for i in range(6)),
+        }
+        if kind == 'Object-text':
+            item.update(text_span(obj))
+            item['justify'] = obj.get('justify', 'Left')
+            item['static'] = not any(part_kind == 'field' for part_kind, _ in item['parts'])
+        elif kind == 'Object-image':
+            src = obj.get('src')
+            image = images.get(src)
+            if image is None and src and os.path.exists(os.path.join(os.path.dirname(path), os.path.basename(src))):
+                image = Image.open(os.path.join(os.path.dirname(path), os.path.basename(src)))
+            if image is None:
+                print(f"Warning: image {src} in {path} not found, skipped.")
+                continue
+            item['image'] = image
+            item['static'] = True
+        elif kind == 'Object-box':
+            item['line_width'] = length(obj.get('line_width'))
+            item['line_color'] = rgba(obj.get('line_color', '0x00000000'))
+            item['fill_color'] = rgba(obj.get('fill_color', '0x00000000'))
+            item['static'] = True
+        else:
+            print(f"Warning: {kind} in {path} is not supported, skipped.")
+            continue
+        objects.append(item)
+
+    merge = root.find('gl:Merge', GLABELS_NS)
+    return {
+        'page_size': PAGE_SIZES.get(template.get('size'), PAGE_SIZES['A4']),
+        'width': length(label.get('width')),
+        'height': length(label.get('height')),
+        'layouts': layouts,
+        'objects': objects,
+        'merge_type': merge.get('type') if merge is not None else None,
+    }
+
+def label_origins(template):
+    """Top-left corner of every label on a page, in glabels order (across, then down)."""
+    origins = []
+    for layout in template['layouts']:
+        for iy in range(layout['ny']):
+            for ix in range(layout['nx']):
+                origins.append((layout['x0'] + ix * layout['dx'], layout['y0'] + iy * layout['dy']))
+    return origins
+
+def read_merge_rows(csv_path, merge_type):
+    """Read merge records as dicts keyed like glabels fields: '1', '2', ... or the header keys."""
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        rows = [row for row in csv.reader(f) if row]
+    if not rows:
+        return []
+
+    if merge_type and merge_type.endswith('Line1Keys'):
+        keys = rows[0]
+        return [dict(zip(keys, row)) for row in rows[1:]]
+
+    # Numbered fields; the tag files' own header line is not a guest
+    if [col.strip() for col in rows[0]] == TAG_FILE_HEADER:
+        rows = rows[1:]
+    return [{str(i): value for i, value in enumerate(row, start=1)} for row in rows]
+
+def _set_color(c, color, stroke=False):
+    r, g, b, a = color
+    if stroke:
+        c.setStrokeColorRGB(r, g, b, alpha=a)
+    else:
+        c.setFillColorRGB(r, g, b, alpha=a)
+
+def draw_text(c, item, record):
+    """Draw a text object at the origin of the current (y-down) object space."""
+    text = ''.join(value if kind == 'text' else record.get(value, '') for kind, value in item['parts'])
+    if not text.strip():
+        return
+    if item['color'] is not None:
+        _set_color(c, item['color'])
+
+    size = item['size']
+    ascent = pdfmetrics.getAscent(item['font']) * size / 1000.0
+    c.setFont(item['font'], size)
+    for line_no, line in enumerate(text.split('\n')):
+        width = pdfmetrics.stringWidth(line, item['font'], size)
+        if item['justify'] == 'Center':
+            x = (item['w'] - width) / 2
+        elif item['justify'] == 'Right':
+            x = item['w'] - width
+        else:
+            x = 0
+        baseline = ascent + line_no * size * LINE_HEIGHT * item['line_spacing']
+        c.saveState()
+        c.translate(x, baseline)
+        c.scale(1, -1)
+        c.drawString(0, 0, line)
+        c.restoreState()
+
+def draw_object(c, item, record, image_forms):
+    """Draw one template object inside a label whose space is already set up y-down."""
+    c.saveState()
+    c.translate(item['x'], item['y'])
+    c.transform(*item['matrix'])
+
+    if item['kind'] == 'Object-text':
+        draw_text(c, item, record)
+    elif item['kind'] == 'Object-image':
+        c.translate(0, item['h'])
+        c.scale(item['w'], -item['h'])
+        c.doForm(image_forms[id(item['image'])])
+    elif item['kind'] == 'Object-box':
+        stroke = item['line_color'][3] > 0 and item['line_width'] > 0
+        fill = item['fill_color'][3] > 0
+        if stroke:
+            _set_color(c, item['line_color'], stroke=True)
+            c.setLineWidth(item['line_width'])
+        if fill:
+            _set_color(c, item['fill_color'])
+        if stroke or fill:
+            c.rect(0, 0, item['w'], item['h'], stroke=int(stroke), fill=int(fill))
+
+    c.restoreState()
+
+def render_template(template_path, csv_path, output_path):
+    """Render every merge row of csv_path onto labels laid out by template_path."""
+    template = load_template(template_path)
+    records = read_merge_rows(csv_path, template['merge_type'])
+    page_width, page_height = template['page_size']
+    label_w, label_h = template['width'], template['height']
+    origins = label_origins(template)
+
+    c = canvas.Canvas(output_path, pagesize=template['page_size'])
+
+    # Each image becomes one form XObject (a unit square, scaled where it is used)
+    image_forms = {}
+    for item in template['objects']:
+        if item['kind'] == 'Object-image' and id(item['image']) not in image_forms:
+            name = f"image{len(image_forms)}"
+            c.beginForm(name, 0, 0, 1, 1)
+            c.drawImage(ImageReader(item['image']), 0, 0, 1, 1, mask='auto')
+            c.endForm()
+            image_forms[id(item['image'])] = name
+
+    # Everything that does not depend on the merge row is drawn once into a shared label form
+    c.beginForm('label_static', 0, 0, label_w, label_h)
+    c.translate(0, label_h)
+    c.scale(1, -1)
+    for item in template['objects']:
+        if item['static']:
+            draw_object(c, item, {}, image_forms)
+    c.endForm()
+
+    merged_items = [item for item in template['objects'] if not item['static']]
+    for i, record in enumerate(records):
+        slot = i % len(origins)
+        if i and slot == 0:
+            c.showPage()
+        left, top = origins[slot]
+
+        c.saveState()
+        c.translate(left, page_height - top - label_h)
+        p = c.beginPath()
+        p.rect(0, 0, label_w, label_h)
+        c.clipPath(p, stroke=0, fill=0)
+        c.doForm('label_static')
+        c.translate(0, label_h)
+        c.scale(1, -1)
+        for item in merged_items:
+            draw_object(c, item, record, image_forms)
+        c.restoreState()
+
+    c.save()
+    return len(records)
+
+def render_all(template_paths, data_dir=None):
+    """Render a batch of templates, each merged with the tag CSV of the same name."""
+    for template_path in template_paths:
+        stem = os.path.splitext(os.path.basename(template_path))[0]
+        csv_path = os.path.join(data_dir or os.path.dirname(template_path) or '.', f'{stem}.csv')
+        if not os.path.exists(csv_path):
+            print(f"Warning: {csv_path} not found, {template_path} skipped.")
+            continue
+        output_path = f'{stem}_labels.pdf'
+        count = render_template(template_path, csv_path, output_path)
+        print(f"{output_path}: {count} labels")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Render glabels menu tag templates to PDF.")
+    parser.add_argument('templates', nargs='*', help="templates to render (default: every *.glabels here)")
+    parser.add_argument('--data-dir', help="folder with the tag CSVs (default: next to each template)")
+    args = parser.parse_args()
+
+    render_all(args.templates or sorted(glob.glob('*.glabels')), args.data_dir)
@@ -2,24 +2,34 @@ import streamlit as st
 from streamlit_gsheets import GSheetsConnection
 from datetime import datetime
 
+import guest_search
+import sheet_source
+
 st.set_page_config(page_title="RAFOC 2025 Guest List", layout="centered")
 
 # --- DATABASE CONNECTION ---
-conn = st.connection("gsheets", type=GSheetsConnection)
+@st.cache_resource
+def get_source():
+    # One source per server: it serves the local snapshot and refreshes it in the background.
+    # Set SHEET_SOURCE=guest_seat.csv to try the page without the Google Sheet.
+    backend = sheet_source.backend_from_env(lambda: st.connection("gsheets", type=GSheetsConnection))
+    return sheet_source.SheetSource(backend).start()
 
-@st.cache_data(ttl=600)
-def load_data():
-    # No URL needed here anymore! It pulls from secrets automatically.
-    df = conn.read() 
-    df = df.rename(columns={
+@st.cache_resource(max_entries=2)
+def prepare(version, _raw):
+    # Renamed columns and the search index, built once per version of the sheet
+    df = _raw.rename(columns={
         'name': 'Nama', 
         'table_number': 'Meja', 
         'menu': 'Menu', 
         'gp_name': 'Kluster'
     })
-    return df[['Nama', 'Meja', 'Menu', 'Kluster']]
+    df = df[['Nama', 'Meja', 'Menu', 'Kluster']]
+    return df, guest_search.GuestIndex(df)
 
-df = load_data()
+source = get_source()
+raw, version = source.load()
+df, index = prepare(version, raw)
 
 # --- UI ELEMENTS ---
 st.title("Majlis Makan Malam RAFOC 2025")
@@ -39,14 +49,19 @@ else:
 
 st.subheader("WTC 14 Dis 2025")
 st.info(f"Countdown: {countdown_text}")
+if source.origin == 'fallback':
+    if raw.empty:
+        st.warning("Tiada senarai tetamu: guest_seat.csv tiada atau kosong, dan Google Sheet belum dicapai.")
+    else:
+        st.caption("Senarai tempatan (guest_seat.csv) — Google Sheet belum dicapai.")
 
 # --- SEARCH LOGIC ---
-column = st.selectbox("Saring Mengikut", df.columns)
+column = st.selectbox("Saring Mengikut", ['Semua'] + list(df.columns))
 query = st.text_input("Carian Nama atau No. Meja")
 
 if query:
-    # Filter the dataframe based on search
-    results = df[df[column].astype(str).str.contains(query, case=False, na=False)]
+    # Best matches first; spelling slips and titles such as Dato' or Kol are allowed for
+    results = index.search(query, column=None if column == 'Semua' else column)
 else:
     results = df
 
@@ -0,0 +1,154 @@
+"""Write a made-up event of any size, laid out like the real input files.
+
+    python make_synthetic_event.py event5k --guests 5000 [--seed 0]
+
+writes into the folder:
+    tempahan/grpN-<group>.csv   name,menu per group (Malay names with titles and ranks,
+                                spouses as "<name> | Isteri", some blank menus and untidy spacing)
+    tempahan.csv                one booking row per group (Nama, Kategori, Bil_tetamu, Wakil)
+    data/reserve.csv            reserve guests for the vacant seats
+    tajaan.csv                  sponsorship payments of the Tajaan groups
+    diraja.csv                  the head tables, already seated
+
+Group sizes are mostly a table or two of 8, with odd sizes, small groups and 9-seat
+Diraja/Ramli groups mixed in.
+"""
+import argparse
+import csv
+import os
+
+import numpy as np
+
+# --- CONFIGURATION ---
+TEMPAHAN_FOLDER = 'tempahan'
+RESERVE_FILE_NAME = 'data/reserve.csv'
+BOOKING_FILE_NAME = 'tempahan.csv'
+TAJAAN_FILE_NAME = 'tajaan.csv'
+DIRAJA_FILE_NAME = 'diraja.csv'
+RESERVE_SHARE = 0.02     # reserve guests per guest
+SPOUSE_SHARE = 0.3       # guests who bring their spouse
+DIRAJA_EVERY = 40        # one Diraja-style group of 9 per this many groups
+
+MALE_NAMES = ['Ahmad', 'Mohd', 'Muhammad', 'Abdul Rahman', 'Zulkifli', 'Hashim', 'Ismail', 'Rosli',
+              'Azman', 'Kamarul', 'Shahrul', 'Fauzi', 'Razak', 'Hamdan', 'Nazri', 'Suhaimi', 'Salleh',
+              'Adnan', 'Othman', 'Yusof', 'Ibrahim', 'Saifudin', 'Halim', 'Tengku Mohammad', 'Wan Hasmar']
+FEMALE_NAMES = ['Siti', 'Nur', 'Haslinda', 'Aminah', 'Rohani', 'Zainab', 'Faridah', 'Norlia',
+                'Salmah', 'Azizah', 'Rosnah', 'Hasnah', 'Noraini', 'Suraya']
+FATHER_NAMES = ['Abdullah', 'Abu Bakar', 'Hussin', 'Sani', 'Ali', 'Hassan', 'Yaakob', 'Samsudin',
+                'Ibrahim', 'Mat', 'Omar', 'Ghani', 'Takriff', 'Marzuke', 'Zain', 'Sujak']
+OTHER_NAMES = ['Lim Kim Fong', 'Ee Teck Chee', 'Kwok Hor Kee', 'Michael Raj', 'Raymond Tan', 'M.S. Murthi']
+TITLES = ["Dato'", 'Datuk', 'Dato', 'Tan Sri', 'Dr', 'Datuk Seri', 'Ir', 'Ts.', 'Hj']
+RANKS = ['Lt Kol (B)', 'Kol (B)', 'Brig Jen (B)', 'Mej Jen (B)', 'Lt Jen (B)', 'Kapten (B)',
+         'Lt Kdr (B)', 'Mejar (B)', 'Laksma (B) TLDM', 'Lt Kol (B) TUDM']
+TITLE_SHARE, RANK_SHARE = 0.25, 0.6
+MENUS = ['Daging', 'Ayam', 'Ikan', 'Vegetarian', '']
+MENU_SHARES = [0.45, 0.25, 0.18, 0.05, 0.07]
+
+GROUP_NAMES = ['intake{}', 'ajk', 'khas#{}', 'rose#{}', 'pvatm', 'rmnoa', 'kpramd', 'macva', 'thegunners',
+               'ssc{}tldm', 'blackhackleclub', 'unicam', 'srikandi', 'fleetsol', 'airod', 'op{}', 'yayasan-veteran',
+               'tetamu-perlis', 'zigmar', 'pvtkr', 'rmasandhurst', 'weststar', 'nadi', 'mmu']
+DIRAJA_NAMES = ['diraja', 'ramli']
+# Group sizes: mostly one or two tables, some odd sizes and small parties
+GROUP_SIZES = [8, 16, 24, 7, 9, 5, 11, 3, 12, 2]
+GROUP_SIZE_SHARES = [0.55, 0.12, 0.03, 0.08, 0.04, 0.05, 0.04, 0.04, 0.03, 0.02]
+
+def guest_name(rng, female=False):
+    """One name like "Dato' Ahmad Bin Hussin Brig Jen (B)"."""
+    if rng.random() < 0.08:
+        name = rng.choice(OTHER_NAMES)
+    elif female:
+        name = f"{rng.choice(FEMALE_NAMES)} Binti {rng.choice(FATHER_NAMES)}"
+    else:
+        name = f"{rng.choice(MALE_NAMES)} Bin {rng.choice(FATHER_NAMES)}"
+    if rng.random() < TITLE_SHARE:
+        name = f"{rng.choice(TITLES)} {name}"
+    if not female and rng.random() < RANK_SHARE:
+        name = f"{name} {rng.choice(RANKS)}"
+    # Booking sheets are typed by hand: some names in lower case or with stray spaces
+    if rng.random() < 0.05:
+        name = name.lower()
+    if rng.random() < 0.03:
+        name = f" {name}  "
+    return name
+
+def group_members(rng, size):
+    """Names of one group: guests, some followed by their spouse."""
+    names = []
+    while len(names) < size:
+        name = guest_name(rng)
+        names.append(name)
+        if len(names) < size and rng.random() < SPOUSE_SHARE:
+            names.append(f"{name.strip()} | Isteri")
+    return names
+
+def group_sizes(rng, num_guests):
+    """Group sizes adding up to num_guests."""
+    sizes = []
+    total = 0
+    while total < num_guests:
+        if len(sizes) % DIRAJA_EVERY == DIRAJA_EVERY // 2:
+            size = 9
+        else:
+            size = int(rng.choice(GROUP_SIZES, p=GROUP_SIZE_SHARES))
+        size = min(size, num_guests - total)
+        sizes.append(size)
+        total += size
+    return sizes
+
+def group_name(rng, number, size):
+    if number % DIRAJA_EVERY == DIRAJA_EVERY // 2:
+        return DIRAJA_NAMES[(number // DIRAJA_EVERY) % len(DIRAJA_NAMES)]
+    return rng.choice(GROUP_NAMES).format(int(rng.integers(1, 40)))
+
+def write_rows(path, header, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def make_event(folder, num_guests, seed=0):
+    """Write every input file for an event of num_guests guests into folder; returns the group count."""
+    rng = np.random.default_rng(seed)
+    tempahan_folder = os.path.join(folder, TEMPAHAN_FOLDER)
+    os.makedirs(tempahan_folder, exist_ok=True)
+    os.makedirs(os.path.dirname(os.path.join(folder, RESERVE_FILE_NAME)), exist_ok=True)
+
+    bookings, payments = [], []
+    sizes = group_sizes(rng, num_guests)
+    for number, size in enumerate(sizes):
+        gp_id = number + 1
+        gp_name = group_name(rng, number, size)
+        names = group_members(rng, size)
+        menus = rng.choice(MENUS, size=size, p=MENU_SHARES)
+        write_rows(os.path.join(tempahan_folder, f'grp{gp_id}-{gp_name}.csv'), ['name', 'menu'], zip(names, menus))
+
+        category = 'Tajaan' if rng.random() < 0.7 else 'Tetamu'
+        bookings.append([f"{gp_name.upper()} #{gp_id}", category, size, 'Sekretariat'])
+        if category == 'Tajaan':
+            payments.append([gp_name.upper(), f"{int(rng.integers(1, 29)):02d}/{int(rng.integers(8, 12)):02d}/2025",
+                             int(rng.choice([1000, 2000, 5000, 10000])), '', 'Tajaan Meja',
+                             rng.choice(['Presiden', 'Setiausaha', 'Pengurus Besar']), 'Byrn diterima'])
+
+    write_rows(os.path.join(folder, BOOKING_FILE_NAME), ['Nama', 'Kategori', 'Bil_tetamu', 'Wakil'], bookings)
+    write_rows(os.path.join(folder, TAJAAN_FILE_NAME),
+               ['Organisasi', 'Tarikh', 'Jumlah', 'Resit', 'Entiti', 'Jwtn', 'Tindakan'], payments)
+
+    num_reserve = max(1, int(num_guests * RESERVE_SHARE))
+    write_rows(os.path.join(folder, RESERVE_FILE_NAME), ['name', 'menu'],
+               [(guest_name(rng).strip().lower(), rng.choice(MENUS[:4])) for _ in range(num_reserve)])
+
+    head_tables = [(f'D{table}', seat, guest_name(rng, female=seat % 2 == 0).strip(), rng.choice(MENUS[:4]), 0, 'Diraja')
+                   for table in (1, 2) for seat in range(1, 10)]
+    write_rows(os.path.join(folder, DIRAJA_FILE_NAME),
+               ['table_number', 'seat', 'name', 'menu', 'gp_id', 'gp_name'], head_tables)
+    return len(sizes)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Write a synthetic event's input files.")
+    parser.add_argument('folder')
+    parser.add_argument('--guests', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    num_groups = make_event(args.folder, args.guests, args.seed)
+    print(f"✅ {args.guests} guests in {num_groups} groups written to {args.folder}")
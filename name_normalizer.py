@@ -0,0 +1,139 @@
+import csv
+import functools
+import os
+import re
+import unicodedata
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# --- CONFIGURATION ---
+ALIAS_FILE_NAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'name_aliases.csv')
+NORMALIZED_COLUMNS = ['name', 'gp_name']
+
+# An alias only matches as a whole word: it may not touch another letter on either side.
+# Digits and punctuation do count as boundaries, so 'khas#1' and 'ssc26l' still match.
+NOT_LETTER_BEFORE = r'(?<![^\W\d_])'
+NOT_LETTER_AFTER = r'(?![^\W\d_])'
+
+# Leading titles skipped when sorting names, so "Dato' Seri Dr Ahmad" files under Ahmad
+HONORIFICS = [
+    'tan sri', 'puan sri', 'dato seri', 'datuk seri', 'dato sri', 'datuk sri', 'dato', 'datuk',
+    'datin', 'datin paduka', 'dato paduka', 'dato pahlawan', 'tun', 'toh puan', 'tengku', 'tunku',
+    'dr', 'prof', 'ir', 'ts', 'haji', 'hj', 'hajah', 'hjh', 'tuan', 'puan', 'pn', 'encik', 'en',
+    'cik', 'mr', 'mrs', 'ms', 'mdm',
+]
+
+def load_aliases(filename=ALIAS_FILE_NAME):
+    """Read the alias -> replacement table, keyed by lower-case alias."""
+    aliases = {}
+    with open(filename, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            alias = row['alias'].strip().lower()
+            if alias:
+                aliases[alias] = row['replacement']
+    return aliases
+
+def trie_pattern(words):
+    """Build one regex alternation for many words, sharing common prefixes."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    return _node_pattern(trie)
+
+def _node_pattern(node):
+    ends_here = '' in node
+    branches = []
+    single_chars = []
+    for ch in sorted(k for k in node if k):
+        rest = _node_pattern(node[ch])
+        if rest:
+            branches.append(re.escape(ch) + rest)
+        else:
+            single_chars.append(re.escape(ch))
+
+    if single_chars:
+        branches.append(single_chars[0] if len(single_chars) == 1 else '[' + ''.join(single_chars) + ']')
+    if not branches:
+        return ''
+
+    if len(branches) == 1 and not ends_here:
+        return branches[0]
+    pattern = '(?:' + '|'.join(branches) + ')'
+    return pattern + '?' if ends_here else pattern
+
+def build_normalizer(aliases):
+    """Compile the alias table into a single matcher and return a text -> text function."""
+    if not aliases:
+        return lambda text: text
+
+    matcher = re.compile(NOT_LETTER_BEFORE + trie_pattern(aliases) + NOT_LETTER_AFTER, re.IGNORECASE)
+
+    def replace(match):
+        return aliases[match.group(0).lower()]
+
+    def normalize(text):
+        if not isinstance(text, str):
+            return text
+        result, count = matcher.subn(replace, text)
+        # Replacements such as 'Khas ' may leave doubled or trailing spaces behind
+        return ' '.join(result.split()) if count else result
+
+    return normalize
+
+@functools.lru_cache(maxsize=None)
+def default_normalizer():
+    """Normalizer for name_aliases.csv, compiled once per process."""
+    return build_normalizer(load_aliases())
+
+def normalize_series(series, normalize=None):
+    """Normalize a text column, running the matcher once per distinct value."""
+    normalize = normalize or default_normalizer()
+    uniques = series.dropna().unique()
+    return series.map(dict(zip(uniques, map(normalize, uniques))))
+
+def normalize_names(df, columns=NORMALIZED_COLUMNS, normalize=None):
+    """Expand abbreviations and aliases in the name columns of a seating DataFrame."""
+    for col in columns:
+        if col in df.columns:
+            df[col] = normalize_series(df[col], normalize)
+    return df
+
+NOT_LETTER_OR_DIGIT = re.compile(r'[\W_]+')
+HONORIFIC_PREFIX = r'^(?:(?:' + trie_pattern(sorted(HONORIFICS)) + r') )+'
+
+def fold_names(names):
+    """Lower-case, accent-free names with punctuation turned into single spaces.
+
+    Works on a list, Series or Arrow array and returns an Arrow array.
+    """
+    if not isinstance(names, (pa.Array, pa.ChunkedArray)):
+        names = pa.array(names, pa.string(), from_pandas=True)
+    folded = pc.utf8_normalize(pc.fill_null(names, ''), 'NFKD')
+    folded = pc.replace_substring_regex(folded, r'\p{Mn}+', '')
+    folded = pc.replace_substring(pc.utf8_lower(folded), "'", '')
+    folded = pc.replace_substring_regex(folded, r'[^\p{L}\p{N}]+', ' ')
+    return pc.utf8_trim_whitespace(folded)
+
+def fold_name(name):
+    """fold_names for a single string, in plain Python (an Arrow call costs milliseconds per string)."""
+    decomposed = unicodedata.normalize('NFKD', name or '')
+    folded = ''.join(ch for ch in decomposed if unicodedata.category(ch) != 'Mn').lower().replace("'", '')
+    return NOT_LETTER_OR_DIGIT.sub(' ', folded).strip()
+
+def collation_keys(names):
+    """Sort keys for a column of guest names: case, accents, punctuation and leading titles do not count.
+
+    The folded full name follows the key after a NUL, so "Dato Ali" and "Ali" still sort
+    in a fixed order. Works on a list, Series or Arrow array and returns an Arrow array.
+    """
+    folded = fold_names(names)
+    stripped = pc.replace_substring_regex(pc.binary_join_element_wise(folded, ' ', ''), HONORIFIC_PREFIX, '')
+    return pc.binary_join_element_wise(pc.utf8_rtrim_whitespace(stripped), folded, '\x00')
+
+def collation_key(name):
+    """collation_keys for a single name."""
+    return collation_keys([name])[0].as_py()
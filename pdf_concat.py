@@ -0,0 +1,152 @@
+"""Join PDFs written by reportlab into one document, keeping page order.
+
+Only what reportlab itself writes is supported: plain objects listed in a classic xref
+table (no object streams or incremental updates). The pages of every part are copied
+with the objects they use, renumbered, under a single page tree. Streams are skipped by
+their /Length, so content that happens to hold 'endobj' is copied whole, and the joined
+file is read back: if its object or page count is not what was written (reportlab changed
+its output layout), concat_pdfs raises ValueError rather than leave a broken PDF behind.
+"""
+import re
+
+from stage_trace import traced
+
+OBJECT_HEADER = re.compile(rb'(\d+)\s+(\d+)\s+obj\b')
+REFERENCE = re.compile(rb'(\d+)\s+0\s+R\b')
+STREAM_START = re.compile(rb'>>\s*stream\r?\n')
+PARENT = re.compile(rb'/Parent\s+\d+\s+0\s+R')
+LENGTH = re.compile(rb'/Length\s+(\d+)\b(?!\s+\d+\s+R)')  # a direct /Length, not a reference
+
+def object_end(data, start):
+    """Offset of the endobj that closes the object whose body starts at start."""
+    end = data.index(b'endobj', start)
+    stream = STREAM_START.search(data, start, end)
+    if stream is not None:
+        length = LENGTH.search(data, start, stream.start())
+        if length is not None:
+            end = data.index(b'endobj', stream.end() + int(length.group(1)))
+    return end
+
+def read_objects(data):
+    """Return {object number: object body} and the Root object number of one PDF."""
+    startxref = int(data[data.rindex(b'startxref') + len(b'startxref'):].split()[0])
+    xref_end = data.index(b'trailer', startxref)
+    lines = data[startxref:xref_end].split(b'\n')[1:]
+
+    offsets = {}
+    pos = 0
+    while pos < len(lines):
+        fields = lines[pos].split()
+        pos += 1
+        if len(fields) != 2:
+            continue
+        first, count = int(fields[0]), int(fields[1])
+        for i in range(count):
+            offset, _, kind = lines[pos + i].split()[:3]
+            if kind == b'n':
+                offsets[first + i] = int(offset)
+        pos += count
+
+    objects = {}
+    for num, offset in offsets.items():
+        header = OBJECT_HEADER.match(data, offset)
+        if header is None or int(header.group(1)) != num:
+            raise ValueError(f"xref entry for object {num} does not point at it")
+        end = object_end(data, header.end())
+        objects[num] = data[header.end():end].strip(b'\r\n ')
+
+    root = int(re.search(rb'/Root\s+(\d+)\s+0\s+R', data[xref_end:]).group(1))
+    return objects, root
+
+def split_stream(body):
+    """Split an object body into its dictionary part and its (untouched) stream part."""
+    match = STREAM_START.search(body)
+    if match is None:
+        return body, b''
+    return body[:match.start() + 2], body[match.start() + 2:]
+
+def references(body):
+    return [int(num) for num in REFERENCE.findall(split_stream(body)[0])]
+
+def page_numbers(objects, root):
+    """Object numbers of the pages of one PDF, in page order."""
+    pages_ref = int(re.search(rb'/Pages\s+(\d+)\s+0\s+R', objects[root]).group(1))
+    pages = []
+    stack = [pages_ref]
+    while stack:
+        num = stack.pop()
+        body = objects[num]
+        if re.search(rb'/Type\s*/Pages\b', body):
+            kids = re.search(rb'/Kids\s*\[(.*?)\]', body, re.S).group(1)
+            stack.extend(reversed([int(k) for k in REFERENCE.findall(kids)]))
+        else:
+            pages.append(num)
+    return pages
+
+@traced('write', rows=None)
+def concat_pdfs(parts, output_file):
+    """Write the pages of every PDF in parts (bytes or file names) to output_file, in order."""
+    # Object 1 is the new page tree and object 2 the catalog; the parts follow
+    out_objects = [None, b'<<\n/PageMode /UseNone /Pages 1 0 R /Type /Catalog\n>>']
+    kids = []
+
+    for part in parts:
+        if isinstance(part, str):
+            with open(part, 'rb') as f:
+                part = f.read()
+        objects, root = read_objects(part)
+        pages = page_numbers(objects, root)
+        # The old page tree is dropped; pages point at the new one once renumbered
+        for num in pages:
+            objects[num] = PARENT.sub(b'', objects[num], count=1)
+
+        # Copy only what the pages use, so the old catalog and info are left behind
+        page_set = set(pages)
+        keep = set(pages)
+        stack = list(pages)
+        while stack:
+            for ref in references(objects[stack.pop()]):
+                if ref in objects and ref not in keep:
+                    keep.add(ref)
+                    stack.append(ref)
+
+        base = len(out_objects)
+        new_numbers = {num: base + i + 1 for i, num in enumerate(sorted(keep))}
+        renumber = lambda m: b'%d 0 R' % new_numbers[int(m.group(1))]
+        for num in sorted(keep):
+            dictionary, stream = split_stream(objects[num])
+            dictionary = REFERENCE.sub(renumber, dictionary)
+            if num in page_set:
+                dictionary = dictionary.replace(b'<<', b'<<\n/Parent 1 0 R', 1)
+            out_objects.append(dictionary + stream)
+        kids.extend(new_numbers[num] for num in pages)
+
+    out_objects[0] = b'<<\n/Count %d /Kids [ %s ] /Type /Pages\n>>' % (
+        len(kids), b' '.join(b'%d 0 R' % k for k in kids))
+
+    with open(output_file, 'wb') as f:
+        f.write(b'%PDF-1.4\n%\x93\x8c\x8b\x9e\n')
+        offsets = []
+        for num, body in enumerate(out_objects, start=1):
+            offsets.append(f.tell())
+            f.write(b'%d 0 obj\n' % num + body + b'\nendobj\n')
+        xref = f.tell()
+        f.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(out_objects) + 1))
+        f.write(b''.join(b'%010d 00000 n \n' % offset for offset in offsets))
+        f.write(b'trailer\n<<\n/Root 2 0 R\n/Size %d\n>>\nstartxref\n%d\n%%%%EOF\n'
+                % (len(out_objects) + 1, xref))
+    check_joined(output_file, len(out_objects), len(kids))
+    return len(kids)
+
+def check_joined(output_file, num_objects, num_pages):
+    """Read the joined PDF back and raise ValueError unless it has the objects and pages written."""
+    with open(output_file, 'rb') as f:
+        data = f.read()
+    try:
+        objects, root = read_objects(data)
+        pages = page_numbers(objects, root)
+    except (ValueError, KeyError, AttributeError) as e:
+        raise ValueError(f"{output_file} cannot be read back after joining: {e}") from e
+    if len(objects) != num_objects or len(pages) != num_pages:
+        raise ValueError(f"{output_file} reads back as {len(objects)} objects and {len(pages)} pages, "
+                         f"not {num_objects} and {num_pages}")
@@ -0,0 +1,120 @@
+import argparse
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import event_store
+import guest_seat_gem
+import guest_seat_pdf
+import guest_summary_v1
+import guest_list
+import guest_tab_tag
+import seat_incremental
+
+# --- CONFIGURATION ---
+DIRAJA_FILE = 'diraja.csv'
+EXTRA_TAG_FILE = 'rs99.csv'
+EXTRA_TAG_TARGETS = ['ayam.csv', 'daging.csv', 'ikan.csv']
+MAX_WORKERS = 4
+
+def load_seating(filename=None):
+    """Read the seating once from the event store (or the seating database, when there is one)."""
+    return event_store.load_seating(filename)
+
+def assign_stage(incremental=False, solver=False):
+    """Run the seat assignment, returning the seating DataFrame."""
+    if incremental:
+        df = seat_incremental.process_guest_files_incremental()
+    else:
+        df = guest_seat_gem.process_guest_files(solver=solver)
+    # Every stage gets the typed frame, whichever way the seating was produced, without
+    # reading back what was just written
+    return df if df.empty else event_store.typed_frame(df)
+
+def seat_pdf_stage(df):
+    guest_seat_pdf.generate_pdf(guest_seat_pdf.guests_from_frame(df), "guest_seat.pdf")
+
+def summary_stage(df):
+    summary_df = guest_summary_v1.summarize_tables(df)
+    guest_summary_v1.write_summary_pdf(summary_df, "table_summary.pdf")
+
+def guest_list_stage(df):
+    guest_list.generate_guest_list(df)
+
+def menu_tag_stage(df):
+    """Split diraja.csv plus the seating rows into the per-menu tag CSVs."""
+    fieldnames, rows = guest_tab_tag.seating_rows(df, DIRAJA_FILE)
+    guest_tab_tag.split_by_menu(rows, fieldnames)
+
+    # append extra data to files
+    if os.path.exists(EXTRA_TAG_FILE):
+        for target in EXTRA_TAG_TARGETS:
+            with open(EXTRA_TAG_FILE, 'rb') as src, open(target, 'ab') as dst:
+                shutil.copyfileobj(src, dst)
+
+RENDER_STAGES = {
+    'guest_seat_pdf': seat_pdf_stage,
+    'guest_summary': summary_stage,
+    'guest_list': guest_list_stage,
+    'guest_tab_tag': menu_tag_stage,
+}
+
+def timed(fn, *args):
+    """Run fn and return (result, wall seconds)."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def run_render_stage(name, df):
+    """Worker entry point: run one render stage and report its wall time."""
+    _, elapsed = timed(RENDER_STAGES[name], df)
+    return name, elapsed
+
+def run_pipeline(skip_assign=False, incremental=False, workers=MAX_WORKERS, solver=False):
+    """Load the seating once and feed it to every downstream stage."""
+    pipeline_start = time.perf_counter()
+
+    if skip_assign:
+        df, elapsed = timed(load_seating)
+        print(f"⏱️  load {event_store.seating_file()}: {elapsed:.2f}s")
+    else:
+        df, elapsed = timed(assign_stage, incremental, solver)
+        print(f"⏱️  guest_seat_gem: {elapsed:.2f}s")
+
+    if df.empty:
+        print("❌ No seating data, downstream stages skipped.")
+        return False
+
+    if workers <= 1:
+        for name in RENDER_STAGES:
+            _, elapsed = run_render_stage(name, df)
+            print(f"⏱️  {name}: {elapsed:.2f}s")
+    else:
+        # The render stages only read the seating data and write different files,
+        # so they can run side by side.
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_render_stage, name, df) for name in RENDER_STAGES]
+            for future in as_completed(futures):
+                name, elapsed = future.result()
+                print(f"⏱️  {name}: {elapsed:.2f}s")
+
+    print(f"⏱️  total: {time.perf_counter() - pipeline_start:.2f}s")
+    return True
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the whole seating pipeline in one process.")
+    parser.add_argument('--skip-assign', action='store_true',
+                        help="reuse the existing seating instead of re-running the assignment")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only re-read and re-seat the tempahan groups whose files changed")
+    parser.add_argument('--solver', action='store_true',
+                        help="seat with seat_solver.py: groups share tables, capacities from venue.json")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help="processes for the render stages (1 runs them one after another)")
+    args = parser.parse_args()
+
+    print("seat allocation -- start")
+    if run_pipeline(skip_assign=args.skip_assign, incremental=args.incremental, workers=args.workers,
+                    solver=args.solver):
+        print("seat allocation -- done")
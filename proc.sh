@@ -1,20 +1,12 @@
 #!/bin/bash
 echo "seat allocation -- start"
-uv run guest_seat_gem.py
-# sed -E 's/\<[[:alpha:]]{3,}\>/\U&/gI'
-sed -i '
-    s/Pat/PAT/gI;s/Ptd/PTD/gI;s/Ptl/PTL/gI;s/rose/Rose /gI;s/Tudm/TUDM/gI;s/Mmu/MMU/gI;s/Tldm/TLDM/gI;s/khas/Khas /gI;s/diraja/Diraja/gI;
-    s/Othman-Yaakob/Othman Yaakob Lt Kol (B)/gI;s/Nawawi-Desa/Dato Nawawi Desa Lt Kol (B)/gI;s/pvrad/The Gunners/gI;
-    s/murthy/Mej Datuk M.S. Murthi/gI;s/bhc/Black Hackle Club/gI;s/abdullah-ltj/Abdullah Lt Jen (B)/gI;s/airod/AIROD/gI;
-    s/Jhev/JHEV/gI;s/Pvatm/PVATM/gI;s/Ramd/RAMD/gI;s/Pgb/PGB/gI;s/nv/NV/gI;s/rma-sandhurst/RMA Sandhurst/gI;s/dmhk/DMHK/gI;
-    s/Ramli-Kinta/Ramli Kinta Lt Kol (B)/gI;s/ssc26l/SSC 26 TLDM/gI;s/Pernama/PERNAMA/gI;s/Dymm/DYMM/gI;s/Yb/YB/gI;s/Adc/ADC/gI;s/Hs/HS/gI
-' guest_seat.csv
-# This line is modified to use standard grouping and echo for a newline
-(cat diraja.csv; echo; tail -n +2 guest_seat.csv) > all_seat.csv
-uv run guest_seat_pdf.py
-uv run guest_summary_v1.py
-uv run guest_list.py
-uv run guest_tab_tag.py
-# append extra data to files
-cat rs99.csv >> ayam.csv;cat rs99.csv >> daging.csv;cat rs99.csv >> ikan.csv
+# reassign: guest_seat_gem.py (names and group names are normalized, see name_aliases.csv);
+# the seating is written to guest_seat.parquet, which every later step reads, and to guest_seat.csv
+# pdf: guest_seat_pdf.py, guest_summary_v1.py, guest_list.py
+# tags: guest_tab_tag.py with diraja.csv, then rs99.csv appended to ayam/daging/ikan.csv
+# Runs on the warm worker when `uv run seat_worker.py start` has been run in this folder
+# (re-runs during the event then take a second or two), else cold in this one process.
+uv run seat_worker.py run reassign pdf tags
+# print-ready tags from the .glabels templates
+uv run label_render.py
 echo "seat allocation -- done"
\ No newline at end of file
@@ -1,11 +1,38 @@
+"""Seat tempahan.csv bookings (one row per booking with Bil_tetamu) table by table.
+
+Bookings are seated in file order. A booking that does not fit the seats left at the
+current table starts a new one and the rest of the table is padded with Simpanan; a
+booking larger than a table fills whole tables and carries on at the next. Seats are
+numbered 1..TABLE_CAPACITY at every table, and the last table is padded too.
+
+The default mode streams: bookings are read, expanded into seat rows and written one at a
+time through a buffered writer, in constant memory. --batch computes the same rows for the
+whole file at once with numpy and is faster when the file fits in memory.
+
+    python seat_alloc.py [--batch] [--input tempahan.csv] [--output guest_seat.csv]
+"""
+import argparse
 import csv
 import re
 
+import numpy as np
+import pandas as pd
+
+# --- CONFIGURATION ---
+INPUT_FILE = 'tempahan.csv'
+OUTPUT_FILE = 'guest_seat.csv'
+FIRST_TABLE = 13
+TABLE_CAPACITY = 8
+DEFAULT_CATEGORY = 'Tetamu'
+WRITE_BUFFER = 1 << 20  # bytes collected before each write to the output file
+FIELDNAMES = ['name', 'seat', 'table_number', 'menu', 'category']
+UNPRINTABLE = r'[^\x20-\x7E]+'
+
 def clean_txt(text):
     """
     Removes unprintable ASCII characters from a string using regex.
     """
-    pattern = r'[^\x20-\x7E]+'
+    pattern = UNPRINTABLE
     cleaned_text = re.sub(pattern, '', text)
     return cleaned_text
 
@@ -13,9 +40,9 @@ def get_menu(seat_number):
     """
     Determine menu type based on seat position within the table.
     Menu distribution:
-        daging: 1-5 (5 seats)
-        ayam: 6-8 (3 seats)
-        ikan: 9-8 (2 seats)
+        daging: 1-4 (4 seats)
+        ayam: 5-7 (3 seats)
+        ikan: 8 (1 seat)
     """
     pos = (seat_number - 1) % 8 + 1
     if 1 <= pos <= 4:
@@ -25,106 +52,126 @@ def get_menu(seat_number):
     else:
         return 'Ikan'
 
-def main():
-    csv_file = "tempahan.csv"
-    output_file = "guest_seat.csv"
-    
-    table_number = 13
-    seat_number = 1
-    table_guest_count = 0
-
-    with open(output_file, 'w', newline='') as outfile:
-        writer = csv.DictWriter(outfile, fieldnames=['name', 'seat', 'table_number', 'menu', 'category'])
-        writer.writeheader()
-
-        with open(csv_file, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                guest_name = row['Nama']
-                guest_name = clean_txt(guest_name)
-                value = row['Bil_tetamu'].strip()
-                number_guest = int(value) if value else 1
-
-                if table_guest_count + number_guest <= 8:
-                    # Add to current table
-                    for i in range(1, number_guest + 1):
-                        if i == 1:
-                            writer.writerow({
-                                'name': f"{guest_name.title()}",
-                                'seat': str(seat_number),
-                                'table_number': str(table_number),
-                                'category': 'Tetamu',
-                                'menu': get_menu(seat_number)
-                            })
-                        else:
-                            writer.writerow({
-                                'name': f"Tetamu #{i}",
-                                'seat': str(seat_number),
-                                'table_number': str(table_number),
-                                'category': 'Tetamu',
-                                'menu': get_menu(seat_number)
-                            })
-                        seat_number += 1
-                    table_guest_count += number_guest
-
-                elif table_guest_count < 8:
-                    remaining = 8 - table_guest_count
-                    for i in range(1, remaining + 1):
-                        writer.writerow({
-                            'name': f"Simpanan #{table_number}:{seat_number}",
-                            'seat': str(seat_number),
-                            'table_number': str(table_number),
-                            'category': 'Tetamu',
-                            'menu': ''
-                        })
-                        seat_number += 1
-                    table_guest_count = 0
-                    table_number += 1
-
-                    # Process current guest in new table
-                    for i in range(1, number_guest + 1):
-                        if i == 1:
-                            writer.writerow({
-                                'name': f"{guest_name.title()}",
-                                'seat': str(seat_number),
-                                'table_number': str(table_number),
-                                'category': 'Tetamu',
-                                'menu': get_menu(seat_number)
-                            })
-                        else:
-                            writer.writerow({
-                                'name': f"Tetamu #{i}",
-                                'seat': str(seat_number),
-                                'table_number': str(table_number),
-                                'category': 'Tetamu',
-                                'menu': get_menu(seat_number)
-                            })
-                        seat_number += 1
-                    table_guest_count = number_guest
-
-                else:
-                    table_number += 1
-                    table_guest_count = number_guest
-                    for i in range(1, number_guest + 1):
-                        if i == 1:
-                            writer.writerow({
-                                'name': f"{guest_name.title()}",
-                                'seat': str(seat_number),
-                                'table_number': str(table_number),
-                                'category': 'Tajaan',
-                                'menu': get_menu(seat_number)
-                            })
-                        else:
-                            writer.writerow({
-                                'name': f"Tetamu #{i} {guest_name.title()}",
-                                'seat': str(seat_number),
-                                'table_number': str(table_number),
-                                'category': 'Tajaan',
-                                'menu': get_menu(seat_number)
-                            })
-                        seat_number += 1
-
-        print(f"Total tables: {table_number}, Total guests: {seat_number}")
+def read_bookings(csv_file=INPUT_FILE):
+    """Yield (name, number of guests, category) for each booking, one row at a time."""
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            value = row['Bil_tetamu'].strip()
+            yield clean_txt(row['Nama']).title(), int(value) if value else 1, \
+                (row.get('Kategori') or '').strip() or DEFAULT_CATEGORY
+
+def seat_rows(bookings, capacity=TABLE_CAPACITY, first_table=FIRST_TABLE, totals=None):
+    """Expand bookings lazily into (name, seat, table_number, menu, category) rows, table by table.
+
+    The booker takes the first seat and the guests they bring are "Tetamu #2", "Tetamu #3"...
+    totals, when given, is updated with the number of tables and guests seated.
+    """
+    table, used, guests = first_table, 0, 0
+    last_category = DEFAULT_CATEGORY
+    for name, count, category in bookings:
+        if used and used + count > capacity:
+            # Padding seats belong with the booking before them
+            for seat in range(used + 1, capacity + 1):
+                yield f"Simpanan #{table}:{seat}", seat, table, '', last_category
+            table, used = table + 1, 0
+        for i in range(1, count + 1):
+            if used == capacity:
+                table, used = table + 1, 0
+            used += 1
+            yield name if i == 1 else f"Tetamu #{i}", used, table, get_menu(used), category
+        guests += count
+        if count:
+            last_category = category  # a booking with no guests leaves no seat to pad after
+    if used:
+        for seat in range(used + 1, capacity + 1):
+            yield f"Simpanan #{table}:{seat}", seat, table, '', last_category
+    if totals is not None:
+        totals['tables'] = table - first_table + 1 if guests else 0
+        totals['guests'] = guests
+
+def allocate_stream(csv_file=INPUT_FILE, output_file=OUTPUT_FILE, capacity=TABLE_CAPACITY, first_table=FIRST_TABLE):
+    """Seat the bookings one at a time and write the rows through one buffered writer."""
+    totals = {}
+    with open(output_file, 'w', newline='', buffering=WRITE_BUFFER) as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(FIELDNAMES)
+        writer.writerows(seat_rows(read_bookings(csv_file), capacity, first_table, totals))
+    return totals
+
+def booking_slots(counts, capacity=TABLE_CAPACITY):
+    """First slot (table offset * capacity + seat - 1) of every booking, and the slots used.
+
+    Where a booking starts depends on where the one before it ended, so this one step is a
+    loop over bookings; everything per seat is then done with whole arrays.
+    """
+    starts = np.empty(len(counts), dtype=np.int64)
+    slot = 0
+    for i, count in enumerate(counts.tolist()):
+        used = slot % capacity
+        if used and used + count > capacity:
+            slot += capacity - used
+        starts[i] = slot
+        slot += count
+    return starts, -(-slot // capacity) * capacity
+
+def write_columns(output_file, columns):
+    """Write FIELDNAMES columns (arrays or lists) as CSV rows, formatted like allocate_stream's."""
+    with open(output_file, 'w', newline='', buffering=WRITE_BUFFER) as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(FIELDNAMES)
+        writer.writerows(zip(*(np.asarray(column).tolist() for column in columns)))
+
+def allocate_batch(csv_file=INPUT_FILE, output_file=OUTPUT_FILE, capacity=TABLE_CAPACITY, first_table=FIRST_TABLE):
+    """Seat the whole file at once: the same rows as allocate_stream, computed with repeat/cumsum."""
+    bookings = pd.read_csv(csv_file, dtype=str, keep_default_na=False, encoding='utf-8')
+    names = bookings['Nama'].str.replace(UNPRINTABLE, '', regex=True).str.title().to_numpy(dtype=object)
+    counts = pd.to_numeric(bookings['Bil_tetamu'].str.strip().replace('', '1')).to_numpy(dtype=np.int64)
+    categories = (bookings['Kategori'].str.strip().replace('', DEFAULT_CATEGORY)
+                  if 'Kategori' in bookings.columns
+                  else pd.Series(DEFAULT_CATEGORY, index=bookings.index)).to_numpy(dtype=object)
+
+    starts, num_slots = booking_slots(counts, capacity)
+    if not num_slots:
+        write_columns(output_file, [[] for _ in FIELDNAMES])
+        return {'tables': 0, 'guests': 0}
+
+    # Each guest's slot: the booking's first slot plus the guest's place within the booking
+    booking_of_guest = np.repeat(np.arange(len(counts)), counts)
+    place = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    guest_slots = starts[booking_of_guest] + place
+
+    # Every slot starts as padding; a padding seat takes the category of the booking before it
+    slot_table = first_table + np.arange(num_slots) // capacity
+    slot_seat = np.arange(num_slots) % capacity + 1
+    owner = np.zeros(num_slots, dtype=np.int64)
+    owner[guest_slots] = booking_of_guest
+    owner = np.maximum.accumulate(owner)
+    padding = np.ones(num_slots, dtype=bool)
+    padding[guest_slots] = False
+
+    name = np.empty(num_slots, dtype=object)
+    name[padding] = [f"Simpanan #{table}:{seat}"
+                     for table, seat in zip(slot_table[padding].tolist(), slot_seat[padding].tolist())]
+    guest_names = np.array([None] + [f"Tetamu #{i}" for i in range(1, counts.max() + 1)], dtype=object)
+    guest_names = guest_names[place + 1]
+    guest_names[place == 0] = names[counts > 0]
+    name[guest_slots] = guest_names
+    menu_by_seat = np.array([''] + [get_menu(seat) for seat in range(1, capacity + 1)], dtype=object)
+    menu = np.where(padding, '', menu_by_seat[slot_seat])
+
+    write_columns(output_file, [name, slot_seat, slot_table, menu, categories[owner]])
+    return {'tables': num_slots // capacity, 'guests': int(counts.sum())}
+
+def main(batch=False, csv_file=INPUT_FILE, output_file=OUTPUT_FILE, capacity=TABLE_CAPACITY):
+    allocate = allocate_batch if batch else allocate_stream
+    totals = allocate(csv_file, output_file, capacity)
+    print(f"Total tables: {totals['tables']}, Total guests: {totals['guests']}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Seat the tempahan.csv bookings table by table.")
+    parser.add_argument('--batch', action='store_true', help="seat the whole file at once (needs it in memory)")
+    parser.add_argument('--input', default=INPUT_FILE)
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--capacity', type=int, default=TABLE_CAPACITY)
+    args = parser.parse_args()
+    main(args.batch, args.input, args.output, args.capacity)
@@ -0,0 +1,209 @@
+"""Seat cards: one card per seated guest with name, table, seat, menu and a QR code of the guest id.
+
+The QR code holds the same guest_id the door check-in server looks guests up by, so a
+tablet that scans a card can POST /checkin {"guest_id": ...} directly (checkin_server.py).
+Codes are built with reportlab's own QR encoder (reportlab.graphics.barcode), the cards
+are imposed CARD_COLUMNS x CARD_ROWS on A4 and chunks of pages are drawn in parallel.
+
+    python seat_cards.py [--output seat_cards.pdf] [--workers 4]
+"""
+import argparse
+import io
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from reportlab import rl_config
+from reportlab.graphics.barcode.qr import QrCodeWidget
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+
+import event_store
+import seating_db
+from guest_list import pdf_string
+from pdf_concat import concat_pdfs
+
+# --- CONFIGURATION ---
+OUTPUT_FILE = 'seat_cards.pdf'
+EVENT_TITLE = "Majlis Makan Malam RAFOC `25"
+CARD_COLUMNS = 2
+CARD_ROWS = 4
+PAGE_MARGIN = 10 * mm
+CHUNK_PAGES = 50   # pages drawn by one worker task
+MAX_WORKERS = os.cpu_count() or 1
+
+# QR code: level M survives a crease or a smudge; a fixed mask pattern skips reportlab's
+# search over all eight masks (90% of the encoding time). None searches as usual.
+# qr_modules and draw_card use reportlab internals (the encoder's makeImpl, the document's
+# font names), hence the pinned reportlab in requirements.txt; bench_seat_cards.py checks
+# the codes against QrCodeWidget and the text against the fonts the PDF defines.
+QR_LEVEL = 'M'
+QR_MASK = 0
+QR_SIZE = 30 * mm
+QR_BORDER = 2      # quiet zone, in modules
+
+# Card layout (points, from the bottom left of a card)
+PADDING = 5 * mm
+FONT = 'Helvetica'
+BOLD_FONT = 'Helvetica-Bold'
+NAME_SIZE = 13
+MIN_NAME_SIZE = 8
+
+def card_size(columns=CARD_COLUMNS, rows=CARD_ROWS):
+    page_width, page_height = A4
+    return (page_width - 2 * PAGE_MARGIN) / columns, (page_height - 2 * PAGE_MARGIN) / rows
+
+def card_origins(columns=CARD_COLUMNS, rows=CARD_ROWS):
+    """Bottom-left corner of every card on a page, left to right and top to bottom."""
+    card_w, card_h = card_size(columns, rows)
+    top = A4[1] - PAGE_MARGIN
+    return [(PAGE_MARGIN + col * card_w, top - (row + 1) * card_h)
+            for row in range(rows) for col in range(columns)]
+
+def seated_guests(df):
+    """(guest_id, name, group, table, seat, menu) of every seated guest, by table and seat.
+
+    Vacant 'Simpanan' seats get no card. guest_id is signed, as in seating.db and the check-in server.
+    """
+    vacant = ((df['name'].astype(str) == seating_db.VACANT_NAME)
+              & (df['gp_name'].astype(str) == seating_db.VACANT_GROUP[1]))
+    seated = df[~vacant].sort_values(['table_number', 'seat'], kind='stable')
+    ids = seating_db.signed_ids(seated['guest_id'].to_numpy()).tolist()
+    columns = [seated[col].astype(str).tolist() for col in ('name', 'gp_name', 'table_number', 'seat', 'menu')]
+    return list(zip(ids, *columns))
+
+def qr_modules(value):
+    """The QR code of value as rows of booleans (True = dark module)."""
+    qr = QrCodeWidget(value, barLevel=QR_LEVEL).qr
+    if QR_MASK is None:
+        qr.make()
+    else:
+        qr.version = qr.version or qr.calculate_version()
+        qr.makeImpl(False, QR_MASK)
+    return qr.modules
+
+def qr_path(modules):
+    """PDF path operators filling the dark runs of each row, in module units with row 0 at the top."""
+    size = len(modules)
+    ops = []
+    for r, row in enumerate(modules):
+        col = 0
+        for dark, run in itertools.groupby(row):
+            count = len(list(run))
+            if dark:
+                ops.append(f'{col} {size - r - 1} {count} 1 re')
+            col += count
+    return ' '.join(ops) + ' f'
+
+def fit_size(text, font, size, max_width, min_size=MIN_NAME_SIZE):
+    """The largest font size down to min_size at which text fits max_width."""
+    width = pdfmetrics.stringWidth(text, font, size)
+    if width <= max_width:
+        return size
+    return max(min_size, size * max_width / width)
+
+def draw_static_card(c, card_w, card_h):
+    """Everything that is the same on every card, drawn once into the 'seat_card' form."""
+    c.beginForm('seat_card', 0, 0, card_w, card_h)
+    c.setDash(2, 2)
+    c.setLineWidth(0.3)
+    c.setStrokeGray(0.6)
+    c.rect(0, 0, card_w, card_h)  # cut line
+    c.setDash()
+    c.setStrokeGray(0)
+    c.setFont(FONT, 8)
+    c.drawString(PADDING, card_h - PADDING - 8, EVENT_TITLE)
+    c.line(PADDING, card_h - PADDING - 12, card_w - PADDING, card_h - PADDING - 12)
+    c.setFont(FONT, 8)
+    c.drawString(PADDING, PADDING + 52, "MEJA")
+    c.drawString(PADDING + 70, PADDING + 52, "KERUSI")
+    c.drawString(PADDING, PADDING + 12, "MENU")
+    c.endForm()
+
+def draw_card(c, card, card_w, card_h):
+    """One guest's fields and QR code over the shared form, at the current origin.
+
+    The fields go out as one text block and the QR code as one filled path, written
+    straight into the page stream.
+    """
+    guest_id, name, group, table, seat, menu = card
+    qr_x = card_w - PADDING - QR_SIZE
+    full_width = card_w - 2 * PADDING
+    fields = [
+        (BOLD_FONT, fit_size(name, BOLD_FONT, NAME_SIZE, full_width), PADDING, card_h - PADDING - 32, name),
+        (FONT, fit_size(group, FONT, 9, full_width, 6), PADDING, card_h - PADDING - 46, group),
+        (BOLD_FONT, 28, PADDING, PADDING + 24, table),
+        (BOLD_FONT, 28, PADDING + 70, PADDING + 24, seat),
+        (BOLD_FONT, 12, PADDING + 30, PADDING + 12, menu),
+        (FONT, 6, qr_x + QR_BORDER, PADDING - 6, str(guest_id)),
+    ]
+    font_refs = c._doc.getInternalFontName
+    c.doForm('seat_card')
+    c.addLiteral('BT ' + ' '.join(f'{font_refs(font)} {size:.2f} Tf 1 0 0 1 {x:.2f} {y:.2f} Tm ({pdf_string(text)}) Tj'
+                                  for font, size, x, y, text in fields) + ' ET')
+
+    modules = qr_modules(str(guest_id))
+    unit = QR_SIZE / (len(modules) + 2 * QR_BORDER)
+    c.addLiteral(f'q {unit:.4f} 0 0 {unit:.4f} {qr_x + QR_BORDER * unit:.2f} {PADDING + QR_BORDER * unit:.2f} cm '
+                 f'{qr_path(modules)} Q')
+
+def render_cards(cards, columns=CARD_COLUMNS, rows=CARD_ROWS):
+    """Draw cards, columns x rows to an A4 page, and return the PDF bytes."""
+    card_w, card_h = card_size(columns, rows)
+    origins = card_origins(columns, rows)
+    buffer = io.BytesIO()
+    # Binary page streams: reportlab's pure-Python ASCII85 encoder costs more than drawing
+    use_a85 = rl_config.useA85
+    rl_config.useA85 = 0
+    try:
+        c = canvas.Canvas(buffer, pagesize=A4)
+        draw_static_card(c, card_w, card_h)
+        for i, card in enumerate(cards):
+            slot = i % len(origins)
+            if i and slot == 0:
+                c.showPage()
+            x, y = origins[slot]
+            c.saveState()
+            c.translate(x, y)
+            draw_card(c, card, card_w, card_h)
+            c.restoreState()
+        c.save()
+    finally:
+        rl_config.useA85 = use_a85
+    return buffer.getvalue()
+
+def generate_cards(cards, output_file=OUTPUT_FILE, workers=1, columns=CARD_COLUMNS, rows=CARD_ROWS):
+    """Write the seat cards PDF, drawing chunks of CHUNK_PAGES pages in parallel when workers > 1.
+
+    Chunks hold whole pages, so they impose exactly as one document would and are joined in order.
+    Returns the number of cards.
+    """
+    chunk_size = CHUNK_PAGES * columns * rows
+    chunks = [cards[i:i + chunk_size] for i in range(0, len(cards), chunk_size)] or [[]]
+
+    if workers <= 1 or len(chunks) == 1:
+        parts = [render_cards(chunk, columns, rows) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(render_cards, chunks, [columns] * len(chunks), [rows] * len(chunks)))
+
+    if len(parts) == 1:
+        with open(output_file, 'wb') as f:
+            f.write(parts[0])
+    else:
+        concat_pdfs(parts, output_file)
+    return len(cards)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Write a QR seat card for every seated guest.")
+    parser.add_argument('source', nargs='?', default=None,
+                        help="seating database, parquet or CSV (default: event_store.seating_file())")
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help="processes drawing pages (1 = single process)")
+    args = parser.parse_args()
+
+    count = generate_cards(seated_guests(event_store.load_seating(args.source)), args.output, args.workers)
+    print(f"✅ {count} seat cards written to {args.output}")
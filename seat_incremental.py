@@ -0,0 +1,174 @@
+import argparse
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+import guest_seat_gem
+from guest_loader import TEMPAHAN_FOLDER, list_group_files, load_group_files
+from name_normalizer import normalize_names
+
+# --- CONFIGURATION ---
+CACHE_FOLDER = '.seat_cache'
+MANIFEST_FILE_NAME = 'manifest.json'
+GUESTS_CACHE_NAME = 'guests.parquet'
+ASSIGNED_CACHE_NAME = 'assigned.parquet'
+DELTA_FILE_NAME = 'guest_seat_delta.csv'
+
+GUEST_COLUMNS = ['name', 'menu', 'gp_id', 'gp_name']
+SEAT_KEY = ['table_number', 'seat']
+FINAL_COLUMNS = ['table_number', 'seat', 'name', 'menu', 'gp_id', 'gp_name']
+
+def file_hash(file_path):
+    """Return the sha256 of a file's content."""
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_cache(cache_folder=CACHE_FOLDER):
+    """Read the manifest and cached frames from the last run, or (None, None, None) if there is none."""
+    manifest_path = os.path.join(cache_folder, MANIFEST_FILE_NAME)
+    guests_path = os.path.join(cache_folder, GUESTS_CACHE_NAME)
+    assigned_path = os.path.join(cache_folder, ASSIGNED_CACHE_NAME)
+    if not all(os.path.exists(p) for p in (manifest_path, guests_path, assigned_path)):
+        return None, None, None
+
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    return manifest, pd.read_parquet(guests_path), pd.read_parquet(assigned_path)
+
+def save_cache(manifest, guests_df, assigned_df, cache_folder=CACHE_FOLDER):
+    """Persist the manifest, the cleaned guests per file and the seating of this run."""
+    os.makedirs(cache_folder, exist_ok=True)
+    guests_df.to_parquet(os.path.join(cache_folder, GUESTS_CACHE_NAME), index=False)
+    assigned_df.to_parquet(os.path.join(cache_folder, ASSIGNED_CACHE_NAME), index=False)
+    with open(os.path.join(cache_folder, MANIFEST_FILE_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+def table_ranges(assigned_df):
+    """First table and number of tables for every group, taken before reserve guests are filled in."""
+    seated = assigned_df[assigned_df['gp_id'] != 0]
+    ranges = seated.groupby('gp_id')['table_number'].agg(['min', 'max'])
+    return {
+        str(gp_id): {'first_table': int(row['min']), 'num_tables': int(row['max'] - row['min'] + 1)}
+        for gp_id, row in ranges.iterrows()
+    }
+
+def seating_delta(old_df, new_df):
+    """Rows added, removed or changed between two seatings, keyed by table and seat."""
+    if old_df is None or old_df.empty:
+        delta = new_df[FINAL_COLUMNS].copy()
+        delta.insert(0, 'change', 'added')
+        return delta
+
+    old_df = old_df[FINAL_COLUMNS].astype(str)
+    new_df = new_df[FINAL_COLUMNS].astype(str)
+    merged = old_df.merge(new_df, on=SEAT_KEY, how='outer', suffixes=('_old', ''), indicator=True)
+
+    value_columns = ['name', 'menu', 'gp_id', 'gp_name']
+    differs = pd.Series(False, index=merged.index)
+    for col in value_columns:
+        differs |= merged[col] != merged[f'{col}_old']
+
+    # Removed seats keep their old values so the delta says who lost a seat
+    removed = merged['_merge'] == 'left_only'
+    for col in value_columns:
+        merged.loc[removed, col] = merged.loc[removed, f'{col}_old']
+
+    merged['change'] = 'changed'
+    merged.loc[merged['_merge'] == 'right_only', 'change'] = 'added'
+    merged.loc[removed, 'change'] = 'removed'
+    delta = merged[(merged['_merge'] != 'both') | differs]
+
+    delta = delta.assign(
+        table_number=delta['table_number'].astype(int),
+        seat=delta['seat'].astype(int),
+    ).sort_values(SEAT_KEY)
+    return delta[['change'] + FINAL_COLUMNS].reset_index(drop=True)
+
+def process_guest_files_incremental(tempahan_folder=TEMPAHAN_FOLDER, cache_folder=CACHE_FOLDER):
+    """Re-seat only the groups whose files changed since the last run.
+
+    Unchanged files are taken from the cache instead of being re-read, and every group
+    keeps the first table it had last time unless a growing group before it needs the room.
+    Returns the final seating; the rows that changed are written to guest_seat_delta.csv.
+    """
+    if not os.path.exists(tempahan_folder):
+        print(f"Error: Folder '{tempahan_folder}' not found. Please create it and place CSV files inside.")
+        return pd.DataFrame()
+
+    manifest, cached_guests, previous_df = load_cache(cache_folder)
+    if manifest is None:
+        manifest = {'files': {}, 'groups': {}}
+        cached_guests = pd.DataFrame(columns=GUEST_COLUMNS + ['source_file'])
+
+    group_files = list_group_files(tempahan_folder)
+    file_entries = {file: {'sha256': file_hash(os.path.join(tempahan_folder, file))} for file in group_files}
+    changed = {file for file in group_files
+               if manifest['files'].get(file, {}).get('sha256') != file_entries[file]['sha256']}
+
+    # Changed files are read together, everything else comes from the cache
+    fresh_by_file = {}
+    if changed:
+        fresh_df = load_group_files(tempahan_folder, [file for file in group_files if file in changed],
+                                    with_source=True)
+        if not fresh_df.empty:
+            fresh_by_file = dict(tuple(fresh_df[GUEST_COLUMNS + ['source_file']].groupby('source_file', sort=False)))
+    cached_by_file = dict(tuple(cached_guests.groupby('source_file', sort=False)))
+
+    guests = []
+    for file in group_files:
+        group_df = fresh_by_file.get(file) if file in changed else cached_by_file.get(file)
+        if group_df is not None and not group_df.empty:
+            guests.append(group_df)
+
+    removed = [f for f in manifest['files'] if f not in file_entries]
+    print(f"Re-read {len(changed)} of {len(group_files)} group files ({len(removed)} removed).")
+
+    if not guests:
+        print("No valid main guest data found.")
+        return pd.DataFrame()
+
+    guests_df = pd.concat(guests, ignore_index=True)
+    guests_df['original_order'] = range(len(guests_df))
+
+    # Groups seated last time ask for the same first table again
+    first_tables = {int(gp_id): group['first_table'] for gp_id, group in manifest['groups'].items()}
+    assigned_seats_df = guest_seat_gem.assign_seats(guests_df, first_tables)
+    groups = table_ranges(assigned_seats_df)
+
+    moved = [gp_id for gp_id, group in groups.items()
+             if gp_id in manifest['groups'] and manifest['groups'][gp_id]['first_table'] != group['first_table']]
+    if moved:
+        print(f"Groups moved to make room: {', '.join(moved)}")
+
+    reserve_guests_list = guest_seat_gem.process_reserve_guests()
+    final_guests_df = guest_seat_gem.fill_vacant_seats(assigned_seats_df, reserve_guests_list)
+    final_guests_df = normalize_names(final_guests_df)
+
+    delta_df = seating_delta(previous_df, final_guests_df)
+    guest_seat_gem.write_csv_file(delta_df, DELTA_FILE_NAME)
+    print(f"{len(delta_df)} seats changed. See {DELTA_FILE_NAME} for details.")
+
+    guest_seat_gem.write_seating_file(final_guests_df)
+    save_cache({'files': file_entries, 'groups': groups},
+               guests_df[GUEST_COLUMNS + ['source_file']], final_guests_df, cache_folder)
+
+    return final_guests_df
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Re-seat only the tempahan groups that changed since the last run.")
+    parser.add_argument('--full', action='store_true', help="ignore the manifest and re-read every group file")
+    args = parser.parse_args()
+
+    if args.full:
+        for name in (MANIFEST_FILE_NAME, GUESTS_CACHE_NAME, ASSIGNED_CACHE_NAME):
+            path = os.path.join(CACHE_FOLDER, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    final_guests = process_guest_files_incremental()
+    if not final_guests.empty:
+        print("✅ Guest seating assignment completed. See guest_seat.csv for details.")
+    else:
+        print("❌ Guest seating assignment failed or no data processed.")
@@ -0,0 +1,334 @@
+"""Table-minimizing seat solver, an alternative to giving every group its own whole tables.
+
+guest_seat_gem.assign_seats rounds every group up to whole tables and pads the rest with
+'Simpanan'. The solver fills whole tables with a group's guests and seats what is left of
+the group (fewer guests than a table holds) together with the left-overs of other groups,
+as far as the sharing rules in the venue file (venue.json, see floor_plan.py) allow:
+
+    {"table_capacity": 8, "table_capacities": {"1": 9, "2": 9},
+     "never_share": ["diraja"], "share_classes": {"ajk": "urusetia"}, "max_groups_per_table": 3}
+
+- table_capacity is the seats at every table, table_capacities the exceptions by table number;
+- groups named in never_share keep their tables to themselves;
+- only groups of the same share class sit together (unlisted groups are all one class);
+- max_groups_per_table caps how many groups a table is shared between.
+
+The search is anytime: it starts from the greedy layout (no sharing), then builds and
+repairs layouts for different group orders until it reaches the lower bound on tables or
+TIME_BUDGET runs out, keeping the best so far.
+
+    python seat_solver.py [--budget 2]   # compare with the current seating, write nothing
+    python seat_solver.py --write        # seat with the solver and write the seating files
+"""
+import argparse
+import random
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+import guest_seat_gem
+from floor_plan import VENUE_FILE, grid_cells, load_venue
+from guest_loader import TEMPAHAN_FOLDER, load_group_files
+from stage_trace import traced
+
+# --- CONFIGURATION ---
+TIME_BUDGET = 2.0        # seconds of search after the first solver layout
+TABLE_CAPACITY = guest_seat_gem.STANDARD_TABLE_CAPACITY
+NEVER_SHARE = ['diraja']
+MAX_GROUPS_PER_TABLE = 3
+DEFAULT_SHARE_CLASS = 'umum'
+ORDER_NOISE = 3.0        # seats of random jitter on a group's left-over when reordering
+SEED = 0
+
+def seating_rules(venue):
+    """Table capacity and sharing rules from a venue definition, with this module's defaults."""
+    return {
+        'table_capacity': int(venue.get('table_capacity', TABLE_CAPACITY)),
+        'table_capacities': {int(k): int(v) for k, v in venue.get('table_capacities', {}).items()},
+        'never_share': {name.lower() for name in venue.get('never_share', NEVER_SHARE)},
+        'share_classes': {k.lower(): v for k, v in venue.get('share_classes', {}).items()},
+        'max_groups_per_table': int(venue.get('max_groups_per_table', MAX_GROUPS_PER_TABLE)),
+    }
+
+def venue_tables(venue, rules):
+    """(table_number, capacity) of every numbered table in the venue, in number order."""
+    numbers = sorted(number for _, _, number in grid_cells(venue) if number is not None)
+    return [(number, rules['table_capacities'].get(number, rules['table_capacity'])) for number in numbers]
+
+def share_class(gp_name, rules):
+    """The class of groups a group may share a table with, or None when it never shares."""
+    name = str(gp_name).lower()
+    if name in rules['never_share']:
+        return None
+    return rules['share_classes'].get(name, DEFAULT_SHARE_CLASS)
+
+class TablePool:
+    """Free tables by capacity, lowest number first.
+
+    When the venue runs out, extra tables of the standard capacity are numbered on from
+    its last table.
+    """
+
+    def __init__(self, tables, default_capacity):
+        self.free = {}
+        for number, capacity in tables:
+            self.free.setdefault(capacity, deque()).append(number)
+        self.default_capacity = default_capacity
+        self.next_extra = max((number for number, _ in tables), default=0) + 1
+
+    def capacities(self):
+        return {capacity for capacity, numbers in self.free.items() if numbers} | {self.default_capacity}
+
+    def take(self, capacity):
+        numbers = self.free.get(capacity)
+        if numbers:
+            return numbers.popleft()
+        self.next_extra += 1
+        return self.next_extra - 1
+
+def build_layout(groups, tables, rules, order, share=True):
+    """Seat the groups in the given order: whole tables first, then the left-over seats.
+
+    groups is a list of (size, share class). A group takes the largest free table it can
+    fill completely, as often as it can; what is left goes to the shared table of its class
+    it fits most tightly, or else to the smallest free table that holds it.
+    Returns {table_number: {'capacity', 'free', 'share_class', 'parts': [(group, seats)]}}.
+    """
+    pool = TablePool(tables, rules['table_capacity'])
+    max_groups = rules['max_groups_per_table']
+    layout = {}
+    open_tables = {}  # share class -> numbers of shared tables with free seats
+    for group in order:
+        size, group_class = groups[group]
+        remaining = size
+        while remaining:
+            fitting = [capacity for capacity in pool.capacities() if capacity <= remaining]
+            if not fitting:
+                break
+            capacity = max(fitting)
+            layout[pool.take(capacity)] = {'capacity': capacity, 'free': 0, 'share_class': None,
+                                           'parts': [(group, capacity)]}
+            remaining -= capacity
+        if not remaining:
+            continue
+
+        target = None
+        if share and group_class is not None:
+            candidates = [number for number in open_tables.get(group_class, ())
+                          if layout[number]['free'] >= remaining and len(layout[number]['parts']) < max_groups]
+            if candidates:
+                target = min(candidates, key=lambda number: (layout[number]['free'], number))
+        if target is None:
+            capacity = min(capacity for capacity in pool.capacities() if capacity >= remaining)
+            target = pool.take(capacity)
+            layout[target] = {'capacity': capacity, 'free': capacity, 'share_class': group_class if share else None,
+                              'parts': []}
+            if layout[target]['share_class'] is not None:
+                open_tables.setdefault(group_class, []).append(target)
+        table = layout[target]
+        table['parts'].append((group, remaining))
+        table['free'] -= remaining
+        if not table['free'] and table['share_class'] is not None:
+            open_tables[group_class].remove(target)
+    return layout
+
+def empty_tables(layout, rules):
+    """Free shared tables by moving their groups into the free seats of other shared tables.
+
+    The emptiest tables are tried first; a table is only given up when every group on it
+    finds room elsewhere. Returns the number of tables freed.
+    """
+    max_groups = rules['max_groups_per_table']
+    freed = 0
+    improved = True
+    while improved:
+        improved = False
+        shared = sorted((number for number, table in layout.items() if table['share_class'] is not None),
+                        key=lambda number: (layout[number]['capacity'] - layout[number]['free'], number))
+        for number in shared:
+            if number not in layout:
+                continue
+            table = layout[number]
+            others = [other for other in layout if other != number and layout[other]['free']
+                      and layout[other]['share_class'] == table['share_class']]
+            free = {other: layout[other]['free'] for other in others}
+            mix = {other: len(layout[other]['parts']) for other in others}
+            moves = []
+            for group, seats in sorted(table['parts'], key=lambda part: -part[1]):
+                fits = [other for other in others if free[other] >= seats and mix[other] < max_groups]
+                if not fits:
+                    moves = None
+                    break
+                other = min(fits, key=lambda other: (free[other] - seats, other))
+                free[other] -= seats
+                mix[other] += 1
+                moves.append((other, group, seats))
+            if not moves:
+                continue
+            for other, group, seats in moves:
+                layout[other]['parts'].append((group, seats))
+                layout[other]['free'] -= seats
+            del layout[number]
+            freed += 1
+            improved = True
+    return freed
+
+def layout_score(layout):
+    """Tables used, then seats laid (smaller tables are better)."""
+    return len(layout), sum(table['capacity'] for table in layout.values())
+
+def lower_bound(groups, tables, rules):
+    """No layout uses fewer tables: enough of the largest tables for every guest, and a
+    table of its own for every group that never shares."""
+    total = sum(size for size, _ in groups)
+    capacities = sorted((capacity for _, capacity in tables), reverse=True)
+    largest = max(capacities + [rules['table_capacity']])
+    count = seats = 0
+    for capacity in capacities:
+        if seats >= total:
+            break
+        seats += capacity
+        count += 1
+    if seats < total:
+        count += -(-(total - seats) // rules['table_capacity'])
+    solo = sum(-(-size // largest) for size, group_class in groups if group_class is None)
+    return max(count, solo)
+
+def first_group(table):
+    """Sort key of a table: its lowest group, a whole table of that group before its left-over."""
+    group = min(group for group, _ in table['parts'])
+    return group, -sum(seats for other, seats in table['parts'] if other == group)
+
+def number_tables(layout, tables, rules):
+    """Give the tables used the lowest venue numbers of their capacity, in order of the
+    first group seated at each, so the numbering has no gaps and follows the groups."""
+    numbers = {}
+    for number, capacity in tables:
+        numbers.setdefault(capacity, []).append(number)
+    last = max((number for number, _ in tables), default=0)
+    renumbered = {}
+    for capacity in sorted({table['capacity'] for table in layout.values()}):
+        used = sorted((number for number, table in layout.items() if table['capacity'] == capacity),
+                      key=lambda number: first_group(layout[number]) + (number,))
+        available = numbers.get(capacity, [])
+        for i, number in enumerate(used):
+            if i < len(available):
+                renumbered[available[i]] = layout[number]
+            else:
+                last += 1
+                renumbered[last] = layout[number]
+    return dict(sorted(renumbered.items()))
+
+def search(groups, tables, rules, time_budget=TIME_BUDGET, seed=SEED):
+    """Anytime search for the layout using fewest tables. Returns (layout, stats)."""
+    start = time.perf_counter()
+    deadline = start + time_budget
+    greedy = build_layout(groups, tables, rules, range(len(groups)), share=False)
+    best, best_score = greedy, layout_score(greedy)
+    bound = lower_bound(groups, tables, rules)
+
+    # First fit decreasing on the left-over seats, then random orders close to it
+    left_over = [size % rules['table_capacity'] for size, _ in groups]
+    order = sorted(range(len(groups)), key=lambda group: -left_over[group])
+    rng = random.Random(seed)
+    iterations = 0
+    while True:
+        layout = build_layout(groups, tables, rules, order)
+        empty_tables(layout, rules)
+        iterations += 1
+        score = layout_score(layout)
+        if score < best_score:
+            best, best_score = layout, score
+        if best_score[0] <= bound or time.perf_counter() >= deadline:
+            break
+        noise = [left_over[group] + rng.uniform(0, ORDER_NOISE) for group in range(len(groups))]
+        order = sorted(range(len(groups)), key=lambda group: -noise[group])
+
+    stats = {'greedy_tables': len(greedy), 'tables': best_score[0], 'seats': best_score[1],
+             'lower_bound': bound, 'iterations': iterations, 'seconds': time.perf_counter() - start}
+    return number_tables(best, tables, rules), stats
+
+def seating_rows(guests_df, layout):
+    """The seating DataFrame (columns as guest_seat_gem.assign_seats) for a numbered layout.
+
+    Groups keep their guests in reading order across their tables; the empty seats of
+    every table are padded with 'Simpanan'.
+    """
+    sizes = guests_df.groupby('gp_id', sort=True).size().to_numpy()
+    next_row = np.cumsum(sizes) - sizes
+    table_numbers, seats, rows = [], [], []
+    for number, table in layout.items():
+        for group, count in sorted(table['parts']):
+            rows.extend(range(next_row[group], next_row[group] + count))
+            next_row[group] += count
+        rows.extend([-1] * table['free'])
+        table_numbers.extend([number] * table['capacity'])
+        seats.extend(range(1, table['capacity'] + 1))
+
+    rows = np.array(rows, dtype=np.int64)
+    guests = guests_df[['name', 'menu', 'gp_id', 'gp_name']].reset_index(drop=True)
+    reserve = pd.DataFrame({'name': 'Simpanan', 'menu': 'N/A', 'gp_id': 0, 'gp_name': 'RESERVE_SEAT'}, index=[0])
+    seating_df = pd.concat([guests, reserve], ignore_index=True).iloc[np.where(rows < 0, len(guests), rows)]
+    seating_df = seating_df.reset_index(drop=True)
+    seating_df.insert(0, 'seat', seats)
+    seating_df.insert(0, 'table_number', table_numbers)
+    return seating_df[['table_number', 'seat', 'name', 'menu', 'gp_id', 'gp_name']]
+
+@traced('solve')
+def solve_seating(guests_df, venue_file=VENUE_FILE, time_budget=TIME_BUDGET):
+    """Seat guests (as from guest_loader.load_group_files) on as few tables as the rules allow.
+
+    Returns the seating DataFrame, shaped like guest_seat_gem.assign_seats output, and the
+    search statistics.
+    """
+    if guests_df.empty:
+        return pd.DataFrame(), {}
+    guests_df = guests_df.sort_values(by=['gp_id', 'original_order'], kind='stable').reset_index(drop=True)
+    venue = load_venue(venue_file)
+    rules = seating_rules(venue)
+    tables = venue_tables(venue, rules)
+
+    group_sizes = guests_df.groupby('gp_id', sort=True)['gp_name'].agg(['size', 'first'])
+    groups = [(int(size), share_class(gp_name, rules)) for size, gp_name in group_sizes.itertuples(index=False)]
+    layout, stats = search(groups, tables, rules, time_budget)
+    venue_numbers = {number for number, _ in tables}
+    stats['extra_tables'] = sum(number not in venue_numbers for number in layout)
+    return seating_rows(guests_df, layout), stats
+
+def report(guests_df, seating_df, stats):
+    """Print the solver's layout against the current greedy seating of the same guests."""
+    current = guest_seat_gem.assign_seats(guests_df.copy())
+    current_tables = current['table_number'].nunique()
+    current_padding = int((current['name'] == 'Simpanan').sum())
+    padding = int((seating_df['name'] == 'Simpanan').sum())
+    print(f"Tables: {current_tables} now (numbered up to {current['table_number'].max()}), "
+          f"{stats['tables']} with the solver, lower bound {stats['lower_bound']}.")
+    print(f"Simpanan seats: {current_padding} now, {padding} with the solver "
+          f"({current_padding - padding} seats saved).")
+    print(f"⏱️  {stats['iterations']} layouts in {stats['seconds']:.2f}s")
+    if stats.get('extra_tables'):
+        print(f"⚠️ {stats['extra_tables']} tables more than the venue has; numbered after its last table.")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Seat the groups on as few tables as the venue rules allow.")
+    parser.add_argument('--budget', type=float, default=TIME_BUDGET, help="seconds of search")
+    parser.add_argument('--venue', default=VENUE_FILE)
+    parser.add_argument('--write', action='store_true',
+                        help="seat with the solver and write the seating files as guest_seat_gem.py does")
+    args = parser.parse_args()
+
+    if args.write:
+        final_guests = guest_seat_gem.process_guest_files(solver=True, venue_file=args.venue, time_budget=args.budget)
+        if final_guests.empty:
+            print("❌ Guest seating assignment failed or no data processed.")
+        else:
+            print("✅ Guest seating assignment completed. See guest_seat.csv for details.")
+    else:
+        guests_df = load_group_files(TEMPAHAN_FOLDER)
+        if guests_df.empty:
+            print("❌ No valid main guest data found.")
+        else:
+            seating_df, stats = solve_seating(guests_df, args.venue, args.budget)
+            report(guests_df, seating_df, stats)
@@ -0,0 +1,141 @@
+"""Guest, reserve and menu counts per table and per group, in one pass over the seating.
+
+guest_summary.py, guest_summary_v1.py and guest_seat_analyzer.py all build their PDFs
+from summarize().
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from stage_trace import traced
+
+# --- CONFIGURATION ---
+RESERVE_NAME = 'simpanan'  # seats still held in reserve carry this in the name
+# Known menus keep this column order; any other menu found in the data follows them
+MENU_ORDER = ['Daging', 'Ayam', 'Ikan', 'Vegetarian']
+NO_MENU = {'', 'n/a', 'nan', 'none'}
+
+def menu_categories(menu):
+    """Map every menu value to its display category; values that are not a menu map to None.
+
+    Known menus match case-insensitively on their name (as the old per-table scans did),
+    anything else becomes its own category.
+    """
+    values = pd.Series(menu.astype(str).unique())
+    folded = values.str.strip().str.lower()
+    categories = pd.Series([None] * len(values), dtype=object)
+    for known in reversed(MENU_ORDER):
+        categories[folded.str.contains(known.lower(), regex=False)] = known
+    other = categories.isna() & ~folded.isin(NO_MENU)
+    categories[other] = values[other].str.strip().str.title()
+    return dict(zip(values, categories))
+
+def ordered_menus(categories):
+    """Menu columns: the known menus, then any others found, alphabetically."""
+    found = {c for c in categories if c is not None}
+    return MENU_ORDER + sorted(found - set(MENU_ORDER))
+
+def _count_matrix(keys, menu_codes, reserved, num_menus):
+    """Guests, reserved seats and guests per menu for every distinct key, via bincount."""
+    codes, uniques = pd.factorize(keys, sort=True)
+    n = len(uniques)
+    menus = np.bincount(codes * (num_menus + 1) + menu_codes, minlength=n * (num_menus + 1))
+    menus = menus.reshape(n, num_menus + 1)[:, 1:]  # code 0 is 'no menu'
+    total = np.bincount(codes, minlength=n)
+    reserve = np.bincount(codes, weights=reserved, minlength=n).astype(int)
+    return uniques, total, reserve, menus
+
+@traced('summarize')
+def summarize(df):
+    """Build the per-table and per-group summaries of a seating DataFrame.
+
+    Returns (tables, groups). tables is indexed by table_number with gp_name (the group of
+    the table's first seat), Total Guests, Reserved, one column per menu and Adjusted Total.
+    groups is indexed by gp_name with the same count columns.
+    """
+    reserved = df['name'].astype(str).str.contains(RESERVE_NAME, case=False, regex=False).to_numpy()
+    mapping = menu_categories(df['menu'])
+    menus = ordered_menus(mapping.values())
+    menu_index = {menu: i + 1 for i, menu in enumerate(menus)}
+    value_codes = {value: menu_index.get(category, 0) for value, category in mapping.items()}
+    menu_codes = df['menu'].astype(str).map(value_codes).to_numpy()
+
+    def frame(uniques, total, reserve, counts, index_name):
+        result = pd.DataFrame(counts, columns=menus, index=pd.Index(uniques, name=index_name))
+        result.insert(0, 'Total Guests', total)
+        result.insert(1, 'Reserved', reserve)
+        result['Adjusted Total'] = result['Total Guests'] - result['Reserved']
+        return result
+
+    tables = frame(*_count_matrix(df['table_number'].to_numpy(), menu_codes, reserved, len(menus)), 'table_number')
+    first_seat = df.drop_duplicates('table_number').set_index('table_number')['gp_name']
+    tables.insert(0, 'gp_name', first_seat.reindex(tables.index).astype(str).to_numpy())
+
+    groups = frame(*_count_matrix(df['gp_name'].astype(str).to_numpy(), menu_codes, reserved, len(menus)), 'gp_name')
+    return tables, groups
+
+def summary_report(summary, label_columns):
+    """Flatten a summary into report rows with a Total row at the end.
+
+    label_columns maps the summary's index and text columns to report headers, for
+    example {'table_number': 'Table Number', 'gp_name': 'Table Name'}.
+    """
+    counts = summary.drop(columns=[c for c in summary.columns if c in label_columns or c == 'gp_name'])
+    report = summary.reset_index()[list(label_columns)].rename(columns=label_columns)
+    report = pd.concat([report, counts.reset_index(drop=True)], axis=1)
+
+    total_row = {header: '' for header in label_columns.values()}
+    total_row[next(iter(label_columns.values()))] = 'Total'
+    total_row.update(counts.sum().to_dict())
+    return pd.concat([report, pd.DataFrame([total_row])], ignore_index=True)
+
+def summary_table(report, label_widths=None):
+    """A styled reportlab Table for a summary report; long headers wrap onto two lines.
+
+    Columns are 50 points wide unless label_widths names another width for them.
+    """
+    styles = getSampleStyleSheet()
+    header_style = ParagraphStyle('SummaryHeader', parent=styles['Normal'],
+                                  fontSize=8, leading=9, alignment=TA_CENTER)
+    header_row = [Paragraph(name.replace(' ', '<br/>', 1), header_style) for name in report.columns]
+    data = [header_row] + report.values.tolist()
+
+    label_widths = label_widths or {}
+    col_widths = [label_widths.get(name, 50) for name in report.columns]
+
+    table = Table(data, colWidths=col_widths, repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), '#cccccc'),
+        ('TEXTCOLOR', (0, 0), (-1, 0), '#000000'),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), '#ffffff'),
+        ('GRID', (0, 0), (-1, -1), 1, '#000000'),
+    ]))
+    return table
+
+@traced('render', rows=None)
+def write_summary_pdf(sections, output_file):
+    """Write (title, report, label_widths) sections to one PDF, the timestamp under the first title."""
+    pdf = SimpleDocTemplate(output_file, pagesize=letter)
+    styles = getSampleStyleSheet()
+    elements = []
+
+    for number, (title, report, label_widths) in enumerate(sections):
+        if number:
+            elements.append(Spacer(1, 24))
+        elements.append(Paragraph(title, styles['Heading1']))
+        elements.append(Spacer(1, 12))
+        if number == 0:
+            timestamp = datetime.datetime.now().strftime('%d-%m-%Y %H:%M')
+            elements.append(Paragraph(f"Berakhir pada: {timestamp}", styles['Normal']))
+            elements.append(Spacer(1, 24))
+        elements.append(summary_table(report, label_widths))
+
+    pdf.build(elements)
@@ -0,0 +1,267 @@
+"""Warm worker for quick re-runs of the seating pipeline during the event.
+
+Every script run pays for importing pandas and reportlab and for reading the seating
+again, which is most of the time on a small event. The worker is one long-lived process
+per event folder that keeps the pipeline modules imported and the last seating it read in
+memory, and takes jobs over a Unix socket:
+
+    python seat_worker.py start                  # start the worker in the background
+    python seat_worker.py run reassign pdf tags  # the jobs, in order
+    python seat_worker.py status
+    python seat_worker.py stop
+
+Jobs:
+    reassign   seat the tempahan groups again (--incremental, --solver as in pipeline.py)
+    pdf        guest_seat.pdf, table_summary.pdf and guest_list.pdf
+    tags       the per-menu tag CSVs, with rs99.csv appended
+
+The seating is read again only when its file has changed since the worker last read it,
+so edits made by other tools are picked up, and guest_seat.pdf only lays out again the
+pages whose tables changed. A changed name_aliases.csv is compiled again at the next
+reassign. When no worker is running, `run` does the jobs in its own process, as
+pipeline.py would, so proc.sh works either way.
+
+The client side imports nothing but the standard library; the pipeline is imported only
+where the jobs run.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+import traceback
+
+# --- CONFIGURATION ---
+SOCKET_FILE = '.seat_worker.sock'
+LOG_FILE = 'seat_worker.log'
+START_TIMEOUT = 30.0    # seconds to wait for a new worker to answer
+JOB_STAGES = {
+    'reassign': [],
+    'pdf': ['guest_seat_pdf', 'guest_summary', 'guest_list'],
+    'tags': ['guest_tab_tag'],
+}
+
+def file_signature(path):
+    """(size, mtime) of path and of its SQLite write-ahead log, to tell when it has changed."""
+    signature = []
+    for name in (path, path + '-wal'):
+        try:
+            stat = os.stat(name)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_size, stat.st_mtime_ns))
+    return path, tuple(signature)
+
+class SeatWorker:
+    """The pipeline stages with the seating kept between jobs."""
+
+    def __init__(self):
+        import event_store
+        import guest_seat_pdf
+        import name_normalizer
+        import pipeline
+        self.event_store = event_store
+        self.guest_seat_pdf = guest_seat_pdf
+        self.name_normalizer = name_normalizer
+        self.pipeline = pipeline
+        self.aliases = file_signature(name_normalizer.ALIAS_FILE_NAME)
+        self.pdf_chunks = {}  # guest_seat.pdf chunks already rendered, by their tables
+        self.df = None
+        self.signature = None
+        self.loads = 0
+        self.jobs = 0
+        self.started = time.time()
+
+    def remember(self, df):
+        self.df = df
+        self.signature = file_signature(self.event_store.seating_file())
+
+    def seating(self):
+        """The seating DataFrame, read again only if its file changed since the last read."""
+        if self.df is None or file_signature(self.event_store.seating_file()) != self.signature:
+            self.remember(self.pipeline.load_seating())
+            self.loads += 1
+        return self.df
+
+    def refresh_aliases(self):
+        """Forget the compiled name_aliases.csv if it changed, so a reassign uses the edit."""
+        aliases = file_signature(self.name_normalizer.ALIAS_FILE_NAME)
+        if aliases != self.aliases:
+            self.name_normalizer.default_normalizer.cache_clear()
+            self.aliases = aliases
+
+    def seat_pdf(self, df):
+        """guest_seat.pdf, laying out again only the chunks of tables that changed."""
+        guests = self.guest_seat_pdf.guests_from_frame(df)
+        self.guest_seat_pdf.generate_pdf(guests, "guest_seat.pdf", cache=self.pdf_chunks)
+
+    def run(self, jobs, incremental=False, solver=False):
+        """Run jobs in order; returns (ok, {step: wall seconds})."""
+        timings = {}
+        for job in jobs:
+            if job == 'reassign':
+                self.refresh_aliases()
+                df, timings['reassign'] = self.pipeline.timed(self.pipeline.assign_stage, incremental, solver)
+                if df.empty:
+                    print("❌ No seating data, later jobs skipped.")
+                    self.df = None
+                    return False, timings
+                self.remember(df)
+                continue
+            df = self.seating()
+            if df.empty:
+                print("❌ No seating data, later jobs skipped.")
+                return False, timings
+            for stage in JOB_STAGES[job]:
+                if stage == 'guest_seat_pdf':
+                    _, timings[stage] = self.pipeline.timed(self.seat_pdf, df)
+                else:
+                    _, timings[stage] = self.pipeline.run_render_stage(stage, df)
+        self.jobs += 1
+        return True, timings
+
+    def status(self):
+        rows = 0 if self.df is None else len(self.df)
+        return (f"worker {os.getpid()} up {time.time() - self.started:.0f}s, {self.jobs} jobs, "
+                f"seating read {self.loads} times, {rows} rows in memory")
+
+class JobHandler(socketserver.StreamRequestHandler):
+    """One request per connection: a JSON line in, a JSON line out."""
+
+    def handle(self):
+        worker = self.server.worker
+        output = io.StringIO()
+        try:
+            request = json.loads(self.rfile.readline())
+            command = request.get('command', 'run')
+            if command == 'status':
+                response = {'ok': True, 'output': worker.status() + '\n'}
+            elif command == 'stop':
+                self.server.stopping = True
+                response = {'ok': True, 'output': f"worker {os.getpid()} stopped\n"}
+            else:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(output):
+                    ok, timings = worker.run(request['jobs'], request.get('incremental', False),
+                                             request.get('solver', False))
+                response = {'ok': ok, 'output': output.getvalue(), 'timings': timings,
+                            'total': time.perf_counter() - start}
+        except Exception:
+            response = {'ok': False, 'output': output.getvalue() + traceback.format_exc()}
+        self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+def request(message, socket_file=SOCKET_FILE, timeout=None):
+    """Send one request to the worker and return its answer, or None if no worker is listening."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_file)
+            sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as answer:
+                line = answer.readline()
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    return json.loads(line) if line else None
+
+def serve(socket_file=SOCKET_FILE):
+    """Run the worker in this process until a stop request."""
+    if request({'command': 'status'}, socket_file) is not None:
+        print(f"⚠️ A worker is already listening on {socket_file}")
+        return False
+    if os.path.exists(socket_file):
+        os.unlink(socket_file)  # left behind by a worker that did not stop cleanly
+    worker = SeatWorker()
+    server = socketserver.UnixStreamServer(socket_file, JobHandler)
+    server.worker = worker
+    server.stopping = False
+    print(f"✅ Seat worker {os.getpid()} listening on {socket_file}", flush=True)
+    try:
+        # Jobs are handled one at a time: each one writes the shared output files
+        while not server.stopping:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_file):
+            os.unlink(socket_file)
+    print("Seat worker stopped.", flush=True)
+    return True
+
+def start(socket_file=SOCKET_FILE, log_file=LOG_FILE, timeout=START_TIMEOUT):
+    """Start a worker in the background and wait until it answers."""
+    if request({'command': 'status'}, socket_file) is not None:
+        print(f"✅ Seat worker already running on {socket_file}")
+        return True
+    with open(log_file, 'ab') as log:
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), 'serve', '--socket', socket_file],
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                         start_new_session=True)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        answer = request({'command': 'status'}, socket_file)
+        if answer is not None:
+            print(f"✅ Seat {answer['output'].strip()}")
+            return True
+        time.sleep(0.1)
+    print(f"❌ The seat worker did not start, see {log_file}")
+    return False
+
+def run(jobs, incremental=False, solver=False, socket_file=SOCKET_FILE, cold=True):
+    """Run jobs on the worker, or in this process when no worker is running (and cold is set)."""
+    message = {'command': 'run', 'jobs': jobs, 'incremental': incremental, 'solver': solver}
+    answer = request(message, socket_file)
+    if answer is not None:
+        print(answer['output'], end='')
+        for step, elapsed in answer.get('timings', {}).items():
+            print(f"⏱️  {step}: {elapsed:.2f}s")
+        if 'total' in answer:
+            print(f"⏱️  total (warm worker): {answer['total']:.2f}s")
+        return answer['ok']
+    if not cold:
+        print(f"❌ No seat worker on {socket_file}; start one with: python seat_worker.py start")
+        return False
+
+    start_time = time.perf_counter()
+    ok, timings = SeatWorker().run(jobs, incremental, solver)
+    for step, elapsed in timings.items():
+        print(f"⏱️  {step}: {elapsed:.2f}s")
+    print(f"⏱️  total (no worker, cold): {time.perf_counter() - start_time:.2f}s")
+    return ok
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Warm worker for the seating pipeline.")
+    parser.add_argument('command', choices=['run', 'start', 'serve', 'status', 'stop'])
+    parser.add_argument('jobs', nargs='*', metavar='job',
+                        help=f"jobs for run, in order: {', '.join(JOB_STAGES)}")
+    parser.add_argument('--incremental', action='store_true',
+                        help="reassign only re-seats the tempahan groups that changed")
+    parser.add_argument('--solver', action='store_true', help="reassign with seat_solver.py")
+    parser.add_argument('--no-cold', action='store_true',
+                        help="fail instead of running the jobs here when no worker is running")
+    parser.add_argument('--socket', default=SOCKET_FILE)
+    args = parser.parse_intermixed_args()
+    unknown = [job for job in args.jobs if job not in JOB_STAGES]
+    if unknown:
+        parser.error(f"unknown job {unknown[0]!r} (choose from {', '.join(JOB_STAGES)})")
+
+    if args.command == 'serve':
+        ok = serve(args.socket)
+    elif args.command == 'start':
+        ok = start(args.socket)
+    elif args.command == 'run':
+        ok = run(args.jobs or list(JOB_STAGES), args.incremental, args.solver, args.socket, not args.no_cold)
+    else:
+        answer = request({'command': args.command}, args.socket)
+        ok = answer is not None
+        if ok:
+            print(answer['output'], end='')
+        else:
+            print(f"⚠️ No seat worker on {args.socket}")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,383 @@
+"""SQLite database of the event: groups, guests, tables, seats, sponsorships and attendance.
+
+The CSV files stay the exchange format: `python seating_db.py import` builds seating.db
+from the seating (guest_seat.parquet, or guest_seat.csv), tempahan.csv, tajaan.csv and
+tetamu.csv, and `python seating_db.py export` writes them back in the same layout, so
+every other script keeps working. In between, single-guest edits are small transactions
+instead of a rewrite of the whole file:
+
+    python seating_db.py find "ahmad"
+    python seating_db.py table 12
+    python seating_db.py move <guest_id> 14 3      # swaps with whoever sits there
+    python seating_db.py checkin <guest_id>
+
+guest_id is the event store's stable id, stored as a signed 64-bit integer. A seat with no
+guest is a vacant 'Simpanan' seat.
+
+The database keeps SQLite's default rollback journal rather than WAL, so a commit changes
+seating.db itself and the dashboard's file version (file_util.file_version) notices it.
+"""
+import argparse
+import datetime
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+import event_store
+from name_normalizer import fold_name, fold_names
+
+# --- CONFIGURATION ---
+DB_FILE = event_store.DB_FILE
+TEMPAHAN_FILE = 'tempahan.csv'
+TAJAAN_FILE = 'tajaan.csv'
+TETAMU_FILE = 'tetamu.csv'
+VACANT_NAME = 'Simpanan'
+VACANT_MENU = 'N/A'
+VACANT_GROUP = (0, 'RESERVE_SEAT')
+CHECKED_IN = 'Hadir'
+
+# CSV column -> database column, in CSV order, for the files kept as text as they are
+TEMPAHAN_COLUMNS = {'Nama': 'booking', 'Kategori': 'kategori', 'Bil_tetamu': 'bil_tetamu', 'Wakil': 'wakil'}
+TAJAAN_COLUMNS = {'Organisasi': 'organisasi', 'Tarikh': 'tarikh', 'Jumlah': 'jumlah', 'Resit': 'resit',
+                  'Entiti': 'entiti', 'Jwtn': 'jwtn', 'Tindakan': 'tindakan'}
+TETAMU_COLUMNS = {'Nama': 'nama', 'Kategori': 'kategori', 'Menu': 'menu', 'No_Meja': 'no_meja',
+                  'Status': 'status', 'Tindakan': 'tindakan'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('revision', 0);
+
+-- A gp_id can carry more than one name (two booking files with the same number)
+CREATE TABLE IF NOT EXISTS groups (
+    gp_id INTEGER NOT NULL,
+    gp_name TEXT NOT NULL,
+    PRIMARY KEY (gp_id, gp_name)
+);
+CREATE TABLE IF NOT EXISTS guests (
+    guest_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,          -- fold_name(name), for case and accent free lookups
+    menu TEXT NOT NULL,
+    gp_id INTEGER NOT NULL,
+    gp_name TEXT NOT NULL,
+    FOREIGN KEY (gp_id, gp_name) REFERENCES groups (gp_id, gp_name)
+);
+CREATE INDEX IF NOT EXISTS guests_name ON guests (name);
+CREATE INDEX IF NOT EXISTS guests_name_key ON guests (name_key);
+CREATE INDEX IF NOT EXISTS guests_gp_id ON guests (gp_id);
+
+-- tempahan.csv: row n books table n
+CREATE TABLE IF NOT EXISTS tables (
+    table_number INTEGER PRIMARY KEY,
+    booking TEXT, kategori TEXT, bil_tetamu TEXT, wakil TEXT
+);
+-- The primary key doubles as the table_number index
+CREATE TABLE IF NOT EXISTS seats (
+    table_number INTEGER NOT NULL,
+    seat INTEGER NOT NULL,
+    guest_id INTEGER UNIQUE REFERENCES guests (guest_id) ON DELETE SET NULL,
+    PRIMARY KEY (table_number, seat)
+);
+CREATE TABLE IF NOT EXISTS sponsorships (
+    sponsorship_id INTEGER PRIMARY KEY,
+    organisasi TEXT, tarikh TEXT, jumlah TEXT, resit TEXT, entiti TEXT, jwtn TEXT, tindakan TEXT
+);
+-- tetamu.csv rows, plus a row per guest checked in at the door
+CREATE TABLE IF NOT EXISTS attendance (
+    attendance_id INTEGER PRIMARY KEY,
+    nama TEXT, kategori TEXT, menu TEXT, no_meja TEXT, status TEXT, tindakan TEXT,
+    guest_id INTEGER UNIQUE REFERENCES guests (guest_id) ON DELETE SET NULL,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS attendance_nama ON attendance (nama);
+"""
+
+SEATING_QUERY = f"""
+SELECT s.table_number, s.seat,
+       COALESCE(g.name, '{VACANT_NAME}') AS name,
+       COALESCE(g.menu, '{VACANT_MENU}') AS menu,
+       COALESCE(g.gp_id, {VACANT_GROUP[0]}) AS gp_id,
+       COALESCE(g.gp_name, '{VACANT_GROUP[1]}') AS gp_name,
+       g.guest_id
+FROM seats s
+LEFT JOIN guests g ON g.guest_id = s.guest_id
+"""
+
+def connect(db_file=DB_FILE):
+    """Open (and if needed create) the database, with foreign keys enforced."""
+    conn = sqlite3.connect(db_file)
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.executescript(SCHEMA)
+    return conn
+
+def bump_revision(conn):
+    """Count a change; call inside the transaction making it."""
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'revision'")
+
+def revision(conn):
+    return conn.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()[0]
+
+def signed_ids(guest_ids):
+    """event_store guest ids (uint64) as the signed 64-bit integers SQLite stores."""
+    return np.asarray(guest_ids, dtype=np.uint64).view(np.int64)
+
+def line_ending(path):
+    """The line ending a CSV file uses, so an export writes it back the same way."""
+    with open(path, 'rb') as f:
+        return '\r\n' if b'\r\n' in f.readline() else '\n'
+
+def read_text_csv(path, columns):
+    """A CSV read as text, as it is, with its columns renamed for the database."""
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return df.reindex(columns=list(columns), fill_value='').rename(columns=columns)
+
+def replace_rows(conn, table, df):
+    """Replace every row of a table with the rows of df (columns named as in the table)."""
+    conn.execute(f'DELETE FROM {table}')
+    placeholders = ', '.join('?' * len(df.columns))
+    conn.executemany(f"INSERT INTO {table} ({', '.join(df.columns)}) VALUES ({placeholders})",
+                     df.itertuples(index=False, name=None))
+
+def import_seating(conn, seating_df):
+    """Replace groups, guests and seats with a seating DataFrame, in one transaction.
+
+    Padding seats ('Simpanan' in the RESERVE_SEAT group) become vacant seats.
+    """
+    df = seating_df.reset_index(drop=True)
+    ids = event_store.guest_ids(df) if 'guest_id' not in df.columns else df['guest_id'].to_numpy()
+    ids = signed_ids(ids)
+    gp_id = df['gp_id'].to_numpy().astype(np.int64)
+    gp_name = df['gp_name'].astype(str).to_numpy()
+    name = df['name'].astype(str).to_numpy()
+    vacant = (name == VACANT_NAME) & (gp_id == VACANT_GROUP[0]) & (gp_name == VACANT_GROUP[1])
+    guests = ~vacant
+
+    groups = pd.DataFrame({'gp_id': gp_id[guests], 'gp_name': gp_name[guests]}).drop_duplicates()
+    guest_rows = pd.DataFrame({
+        'guest_id': ids[guests],
+        'name': name[guests],
+        'name_key': fold_names(name[guests].astype(object)).to_pylist(),
+        'menu': df['menu'].astype(str).to_numpy()[guests],
+        'gp_id': gp_id[guests],
+        'gp_name': gp_name[guests],
+    })
+    seat_rows = pd.DataFrame({
+        'table_number': df['table_number'].to_numpy().astype(np.int64),
+        'seat': df['seat'].to_numpy().astype(np.int64),
+        'guest_id': np.where(guests, ids.astype(object), None),
+    })
+
+    with conn:
+        conn.execute('UPDATE attendance SET guest_id = NULL')
+        for table in ('seats', 'guests', 'groups'):
+            conn.execute(f'DELETE FROM {table}')
+        replace_rows(conn, 'groups', groups)
+        replace_rows(conn, 'guests', guest_rows)
+        replace_rows(conn, 'seats', seat_rows)
+        # Re-link door check-ins to the guests that are still there
+        conn.execute('UPDATE OR IGNORE attendance SET guest_id = (SELECT guest_id FROM guests g '
+                     "WHERE g.name = attendance.nama) WHERE tindakan = ?", (CHECKED_IN,))
+        bump_revision(conn)
+    return int(guests.sum())
+
+def import_csvs(conn, seating=None, tempahan_file=TEMPAHAN_FILE, tajaan_file=TAJAAN_FILE, tetamu_file=TETAMU_FILE):
+    """Load the seating and the booking, sponsorship and guest CSVs that exist into the database."""
+    # Never the database itself: it is what is being rebuilt
+    seating_df = event_store.load_seating(seating or event_store.seating_file(db_file=None))
+    count = import_seating(conn, seating_df)
+    with conn:
+        if os.path.exists(tempahan_file):
+            tables = read_text_csv(tempahan_file, TEMPAHAN_COLUMNS)
+            tables.insert(0, 'table_number', range(1, len(tables) + 1))
+            replace_rows(conn, 'tables', tables)
+        if os.path.exists(tajaan_file):
+            replace_rows(conn, 'sponsorships', read_text_csv(tajaan_file, TAJAAN_COLUMNS))
+        if os.path.exists(tetamu_file):
+            replace_rows(conn, 'attendance', read_text_csv(tetamu_file, TETAMU_COLUMNS))
+        bump_revision(conn)
+    return count
+
+def read_seating_query(conn, sql, params=()):
+    """A seating query's rows as a DataFrame, with guest_id as nullable Int64.
+
+    read_sql_query reads guest_id as float64 as soon as a vacant seat makes it NULL, and a
+    float64 cannot hold every 64-bit id, so the ids are built from the rows' Python ints.
+    """
+    cursor = conn.execute(sql, params)
+    columns = [column[0] for column in cursor.description]
+    rows = cursor.fetchall()
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    return pd.DataFrame({column: pd.array(list(value), dtype='Int64') if column == 'guest_id' else list(value)
+                         for column, value in zip(columns, values)})
+
+def seating_frame(conn):
+    """The seating in guest_seat.csv layout, plus the guest_id column (uint64, as in the event store)."""
+    df = read_seating_query(conn, SEATING_QUERY + ' ORDER BY s.table_number, s.seat')
+    stored = df.pop('guest_id')
+    # Vacant seats get the id a CSV import would give them
+    ids = event_store.guest_ids(df)
+    seated = stored.notna().to_numpy()
+    ids[seated] = stored[seated].to_numpy(dtype=np.int64).view(np.uint64)
+    df['guest_id'] = ids
+    return df
+
+def text_frame(conn, table, columns):
+    """A text table back in its CSV layout."""
+    df = pd.read_sql_query(f"SELECT {', '.join(columns.values())} FROM {table} ORDER BY rowid", conn)
+    return df.rename(columns={db: col for col, db in columns.items()})
+
+def export_csvs(conn, store_file=event_store.STORE_FILE, csv_file=event_store.CSV_EXPORT_FILE,
+                tempahan_file=TEMPAHAN_FILE, tajaan_file=TAJAAN_FILE, tetamu_file=TETAMU_FILE):
+    """Write the seating (event store and CSV) and the other CSVs back from the database."""
+    df = seating_frame(conn)
+    event_store.write_seating(df, store_file, csv_file)
+    for path, table, columns in ((tempahan_file, 'tables', TEMPAHAN_COLUMNS),
+                                 (tajaan_file, 'sponsorships', TAJAAN_COLUMNS),
+                                 (tetamu_file, 'attendance', TETAMU_COLUMNS)):
+        text = text_frame(conn, table, columns)
+        if table == 'tables':
+            text = text[text['Nama'].notna()]
+        if os.path.exists(path):
+            text.to_csv(path, index=False, lineterminator=line_ending(path))
+        else:
+            text.to_csv(path, index=False)
+    return len(df)
+
+# --- QUERIES ---
+def find_guests(conn, text, limit=20):
+    """Guests whose folded name starts with, or failing that contains, the folded text."""
+    key = fold_name(text)
+    query = SEATING_QUERY.replace('FROM seats s\nLEFT JOIN guests g', 'FROM guests g\nLEFT JOIN seats s')
+    # A prefix range uses the name_key index; the substring scan is the fallback
+    rows = read_seating_query(conn, query + ' WHERE g.name_key >= ? AND g.name_key < ? ORDER BY g.name_key LIMIT ?',
+                              (key, key + '\uffff', limit))
+    if rows.empty:
+        rows = read_seating_query(conn, query + ' WHERE g.name_key LIKE ? ORDER BY g.name_key LIMIT ?',
+                                  (f'%{key}%', limit))
+    return rows
+
+def table_guests(conn, table_number):
+    return read_seating_query(conn, SEATING_QUERY + ' WHERE s.table_number = ? ORDER BY s.seat', (table_number,))
+
+def group_guests(conn, gp_id):
+    return read_seating_query(conn, SEATING_QUERY + ' WHERE g.gp_id = ? ORDER BY s.table_number, s.seat', (gp_id,))
+
+def guest_seat(conn, guest_id):
+    """(table_number, seat) of a guest, or None if the guest has no seat."""
+    return conn.execute('SELECT table_number, seat FROM seats WHERE guest_id = ?', (guest_id,)).fetchone()
+
+# --- EDITS (one transaction each) ---
+def move_guest(conn, guest_id, table_number, seat):
+    """Seat a guest at (table_number, seat); whoever sat there takes the guest's old seat."""
+    with conn:
+        if conn.execute('SELECT 1 FROM seats WHERE table_number = ? AND seat = ?', (table_number, seat)).fetchone() is None:
+            raise ValueError(f"No seat {seat} at table {table_number}")
+        old = guest_seat(conn, guest_id)
+        occupant = conn.execute('SELECT guest_id FROM seats WHERE table_number = ? AND seat = ?',
+                                (table_number, seat)).fetchone()[0]
+        conn.execute('UPDATE seats SET guest_id = NULL WHERE guest_id IN (?, ?)', (guest_id, occupant))
+        conn.execute('UPDATE seats SET guest_id = ? WHERE table_number = ? AND seat = ?', (guest_id, table_number, seat))
+        if old is not None and occupant is not None:
+            conn.execute('UPDATE seats SET guest_id = ? WHERE table_number = ? AND seat = ?', (occupant, *old))
+        bump_revision(conn)
+
+def update_guest(conn, guest_id, name=None, menu=None):
+    """Change a guest's name and/or menu."""
+    with conn:
+        if name is not None:
+            conn.execute('UPDATE guests SET name = ?, name_key = ? WHERE guest_id = ?', (name, fold_name(name), guest_id))
+        if menu is not None:
+            conn.execute('UPDATE guests SET menu = ? WHERE guest_id = ?', (menu, guest_id))
+        bump_revision(conn)
+
+def add_guest(conn, name, menu, gp_id, gp_name=None, table_number=None, seat=None):
+    """Add a guest to a group, at the given seat or the first vacant seat; returns the guest_id."""
+    with conn:
+        found = conn.execute('SELECT gp_name FROM groups WHERE gp_id = ? AND gp_name = COALESCE(?, gp_name)',
+                             (gp_id, gp_name)).fetchone()
+        if found is None:
+            raise ValueError(f"No group {gp_id} {gp_name or ''}".rstrip())
+        gp_name = found[0]
+        nth = conn.execute('SELECT COUNT(*) FROM guests WHERE gp_name = ? AND name = ?', (gp_name, name)).fetchone()[0]
+        keys = pd.DataFrame({'gp_name': [gp_name] * (nth + 1), 'name': [name] * (nth + 1)})
+        guest_id = int(signed_ids(event_store.guest_ids(keys))[-1])
+        conn.execute('INSERT INTO guests VALUES (?, ?, ?, ?, ?, ?)',
+                     (guest_id, name, fold_name(name), menu, gp_id, gp_name))
+        if table_number is None:
+            free = conn.execute('SELECT table_number, seat FROM seats WHERE guest_id IS NULL '
+                                'ORDER BY table_number, seat LIMIT 1').fetchone()
+            if free is None:
+                raise ValueError("No vacant seat left")
+            table_number, seat = free
+        updated = conn.execute('UPDATE seats SET guest_id = ? WHERE table_number = ? AND seat = ? AND guest_id IS NULL',
+                               (guest_id, table_number, seat)).rowcount
+        if not updated:
+            raise ValueError(f"Seat {seat} at table {table_number} is not vacant")
+        bump_revision(conn)
+    return guest_id
+
+def remove_guest(conn, guest_id):
+    """Remove a guest; the seat becomes vacant."""
+    with conn:
+        conn.execute('DELETE FROM guests WHERE guest_id = ?', (guest_id,))
+        bump_revision(conn)
+
+def check_in(conn, guest_ids, status='Tetamu'):
+    """Mark guests as arrived (Tindakan 'Hadir'), adding their attendance rows as needed.
+
+    Returns the guest_ids that are not in the guests table: nothing is stored for them.
+    """
+    now = datetime.datetime.now().isoformat(timespec='seconds')
+    missing = []
+    with conn:
+        for guest_id in guest_ids:
+            cursor = conn.execute(
+                f"""INSERT INTO attendance (nama, kategori, menu, no_meja, status, tindakan, guest_id, updated_at)
+                    SELECT g.name, g.gp_name, g.menu, s.table_number, ?, '{CHECKED_IN}', g.guest_id, ?
+                    FROM guests g LEFT JOIN seats s ON s.guest_id = g.guest_id
+                    WHERE g.guest_id = ?
+                    ON CONFLICT (guest_id) DO UPDATE SET tindakan = '{CHECKED_IN}', updated_at = excluded.updated_at""",
+                (status, now, guest_id))
+            if cursor.rowcount == 0:
+                missing.append(guest_id)
+        bump_revision(conn)
+    return missing
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Seating database: import/export the CSVs, look up and edit guests.")
+    parser.add_argument('--db', default=DB_FILE)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('import', help="build the database from the seating and the CSV files")
+    commands.add_parser('export', help="write the seating and the CSV files back from the database")
+    find = commands.add_parser('find', help="look up guests by name")
+    find.add_argument('name')
+    table = commands.add_parser('table', help="list the guests at a table")
+    table.add_argument('table_number', type=int)
+    move = commands.add_parser('move', help="move a guest to a seat")
+    move.add_argument('guest_id', type=int)
+    move.add_argument('table_number', type=int)
+    move.add_argument('seat', type=int)
+    checkin = commands.add_parser('checkin', help="mark guests as arrived")
+    checkin.add_argument('guest_id', type=int, nargs='+')
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == 'import':
+        print(f"✅ {import_csvs(conn)} guests imported into {args.db}")
+    elif args.command == 'export':
+        print(f"✅ {export_csvs(conn)} seats written to {event_store.STORE_FILE} and {event_store.CSV_EXPORT_FILE}")
+    elif args.command == 'find':
+        print(find_guests(conn, args.name).to_string(index=False))
+    elif args.command == 'table':
+        print(table_guests(conn, args.table_number).to_string(index=False))
+    elif args.command == 'move':
+        move_guest(conn, args.guest_id, args.table_number, args.seat)
+        print(f"✅ Guest {args.guest_id} moved to table {args.table_number}, seat {args.seat}")
+    elif args.command == 'checkin':
+        missing = check_in(conn, args.guest_id)
+        print(f"✅ {len(args.guest_id) - len(missing)} guests checked in")
+        if missing:
+            print(f"❌ No guest with id {', '.join(map(str, missing))}")
+    conn.close()
@@ -0,0 +1,214 @@
+"""Guest sheet for main.py, served from a local Parquet snapshot and refreshed in the background.
+
+A page load never waits on Google Sheets: it gets the last snapshot (or guest_seat.csv when
+there is none yet) straight away, while a background thread polls the sheet every
+REFRESH_SECONDS and rewrites the snapshot only when the sheet's revision has changed.
+
+The sheet itself sits behind a small backend interface, fetch(known_revision), which returns
+(revision, frame) with frame None when nothing changed:
+
+- GSheetsBackend wraps the streamlit_gsheets connection. The connection does not expose the
+  sheet's revision, so the revision is a hash of the downloaded content; an unchanged sheet
+  still costs a download, but no snapshot write and no index rebuild.
+- LocalBackend reads a CSV or Parquet file or the seating database instead, so the page
+  can be tried offline or run from seating.db: SHEET_SOURCE=guest_seat.csv streamlit run main.py
+"""
+import hashlib
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import event_store
+from file_util import file_version
+
+# --- CONFIGURATION ---
+CACHE_FOLDER = '.sheet_cache'
+SNAPSHOT_FILE_NAME = 'guest_sheet.parquet'
+FALLBACK_FILE = 'guest_seat.csv'
+# Columns main.py shows; a fallback file without them is served as an empty list with them
+FALLBACK_COLUMNS = ['name', 'table_number', 'menu', 'gp_name']
+SOURCE_ENV = 'SHEET_SOURCE'  # path of a local stand-in for the sheet
+REFRESH_SECONDS = 120
+REVISION_KEY = b'sheet_revision'
+
+def frame_revision(df):
+    """Content hash of a frame, used as the revision of sources that have none of their own."""
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha256(hashes.tobytes())
+    digest.update(','.join(map(str, df.columns)).encode('utf-8'))
+    return digest.hexdigest()
+
+def read_table_file(path):
+    """A CSV or Parquet file or the seating database as a DataFrame."""
+    if path.endswith('.db'):
+        return event_store.load_seating(path)
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+class GSheetsBackend:
+    """The Google Sheet behind a streamlit_gsheets connection."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def fetch(self, known_revision):
+        df = self.conn.read(ttl=0)
+        revision = frame_revision(df)
+        if revision == known_revision:
+            return revision, None
+        return revision, df
+
+class LocalBackend:
+    """Stand-in for the sheet: a local file, re-read only when its content changes."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self, known_revision):
+        revision = file_version(self.path)
+        if revision is None:
+            raise FileNotFoundError(self.path)
+        if revision == known_revision:
+            return revision, None
+        return revision, read_table_file(self.path)
+
+class SheetSource:
+    """Latest known copy of the sheet, kept in memory and in a Parquet snapshot."""
+
+    def __init__(self, backend, cache_folder=CACHE_FOLDER, fallback_file=FALLBACK_FILE,
+                 interval=REFRESH_SECONDS):
+        self.backend = backend
+        self.snapshot_path = os.path.join(cache_folder, SNAPSHOT_FILE_NAME)
+        self.fallback_file = fallback_file
+        self.interval = interval
+        self.df = None
+        self.revision = None
+        self.origin = None  # 'sheet', 'snapshot' or 'fallback'
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def load_snapshot(self):
+        """Frame and revision of the snapshot on disk, or (None, None) if there is no usable one."""
+        if not os.path.exists(self.snapshot_path):
+            return None, None
+        try:
+            table = pq.read_table(self.snapshot_path)
+        except (OSError, pa.ArrowException) as e:
+            print(f"⚠️ Ignoring unreadable snapshot {self.snapshot_path}: {e}")
+            return None, None
+        revision = (table.schema.metadata or {}).get(REVISION_KEY, b'').decode() or None
+        return table.to_pandas(), revision
+
+    def save_snapshot(self, df, revision):
+        """Write the snapshot through a temporary file, so a reader never sees half of it.
+
+        Text columns are written as strings: a sheet column can hold numbers and text
+        (table_number 1 and 'Diraja 1'), which Parquet cannot store as one type.
+        """
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        df = df.copy()
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), REVISION_KEY: revision.encode()})
+        tmp_path = self.snapshot_path + '.tmp'
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def read_fallback(self, version):
+        """The fallback file as a frame; an empty one with FALLBACK_COLUMNS, and a warning,
+        when the file is missing, empty, unreadable or lacks those columns."""
+        if version is None:
+            problem = "not found"
+        else:
+            try:
+                df = read_table_file(self.fallback_file)
+            except (OSError, ValueError, pa.ArrowException) as e:
+                problem = f"unreadable ({e})"
+            else:
+                missing = [col for col in FALLBACK_COLUMNS if col not in df.columns]
+                if not missing:
+                    return df
+                problem = f"has no {', '.join(missing)} column" if df.columns.size else "is empty"
+        print(f"⚠️ Fallback {self.fallback_file} {problem}: serving an empty guest list")
+        return pd.DataFrame(columns=FALLBACK_COLUMNS)
+
+    def load(self):
+        """The current frame and its version, without touching the network.
+
+        The first call reads the snapshot, or the fallback file when there is none yet. The
+        fallback's version is its content hash, so it is read again whenever it changes.
+        """
+        with self._lock:
+            if self.df is None:
+                df, revision = self.load_snapshot()
+                if df is not None:
+                    self.df, self.revision, self.origin = df, revision, 'snapshot'
+            if self.df is None or self.origin == 'fallback':
+                version = file_version(self.fallback_file) if self.fallback_file else None
+                if self.df is None or version != self.revision:
+                    self.df, self.revision, self.origin = self.read_fallback(version), version, 'fallback'
+            return self.df, self.revision or self.origin
+
+    def refresh(self):
+        """Ask the backend for a new revision; True when the frame was replaced."""
+        self.load()
+        with self._lock:
+            known_revision = self.revision
+        try:
+            revision, df = self.backend.fetch(known_revision)
+        except Exception as e:  # offline, bad credentials, sheet gone: keep serving what we have
+            print(f"⚠️ Sheet refresh failed, serving the {self.origin} copy: {e}")
+            return False
+
+        if df is None:
+            with self._lock:
+                self.origin = 'sheet'
+            return False
+        try:
+            self.save_snapshot(df, revision)
+        except Exception as e:  # the new sheet is still served, only the next start reads an older copy
+            print(f"⚠️ Could not write the snapshot {self.snapshot_path}: {e}")
+        with self._lock:
+            self.df, self.revision, self.origin = df, revision, 'sheet'
+        print(f"🔄 Sheet updated ({len(df)} rows)")
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:  # one bad refresh must not end the refreshes
+                print(f"⚠️ Sheet refresh stopped with an error, retrying in {self.interval}s: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Refresh now and every interval seconds in a background thread."""
+        if self.backend is not None and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='sheet-refresh', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+def backend_from_env(connect):
+    """LocalBackend for $SHEET_SOURCE when it is set, otherwise a GSheetsBackend from connect().
+
+    Returns None when the connection cannot be set up; the source then serves its local copies.
+    """
+    path = os.environ.get(SOURCE_ENV)
+    if path:
+        return LocalBackend(path)
+    try:
+        return GSheetsBackend(connect())
+    except Exception as e:
+        print(f"⚠️ No Google Sheets connection, using local copies only: {e}")
+        return None
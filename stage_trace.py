@@ -0,0 +1,181 @@
+"""Opt-in tracing of the pipeline steps: wall time, CPU time, peak RSS and rows per step.
+
+Off unless SEAT_TRACE is set, to a trace file name or to 1 (for stage_trace.json):
+
+    SEAT_TRACE=1 ./proc.sh
+
+Every traced step (read, clean, assign, fill, render, write...) of every script is appended
+to the trace as a Chrome trace event, one row per process, so one file covers a whole
+proc.sh or pipeline.py run; open it in chrome://tracing or ui.perfetto.dev. Each script
+also prints a one-line summary of its steps when it exits.
+
+When tracing is off, traced() hands back the function itself and span() a shared object
+that does nothing, so the scripts run exactly as before.
+"""
+import atexit
+import fcntl
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from functools import wraps
+
+# --- CONFIGURATION ---
+TRACE_ENV = 'SEAT_TRACE'
+TRACE_FILE = 'stage_trace.json'
+
+def trace_path(value):
+    """The trace file for a SEAT_TRACE value, or None when tracing is off."""
+    if not value or value.lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return TRACE_FILE if value.lower() in ('1', 'true', 'yes', 'on') else value
+
+TRACE_PATH = trace_path(os.environ.get(TRACE_ENV))
+ENABLED = TRACE_PATH is not None
+
+_totals = {}            # step name -> [calls, wall seconds, rows], for this process's summary line
+_process_named = None   # pid the process_name event was written for (forked workers get their own)
+
+def script_name():
+    return os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0] or 'python'
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, in MB (ru_maxrss is in KB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def count_rows(result):
+    """Rows in a step's result: a count, or the length of a DataFrame, list or dict
+    (of the first item for a tuple); None when there is nothing to count."""
+    if isinstance(result, bool) or result is None:
+        return None
+    if isinstance(result, int):
+        return result
+    if isinstance(result, tuple):
+        return count_rows(result[0]) if result else None
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+def _append(events):
+    """Append events to the trace as lines of one JSON array.
+
+    The array is left open, which chrome://tracing and Perfetto accept, so every process
+    can add to the file without rewriting it.
+    """
+    with open(TRACE_PATH, 'a', encoding='utf-8') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            if f.tell() == 0:
+                f.write('[\n')
+            f.write(''.join(json.dumps(event) + ',\n' for event in events))
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+def _record(name, category, function, start_us, wall, cpu, rows):
+    global _process_named
+    pid = os.getpid()
+    events = []
+    if _process_named != pid:
+        _process_named = pid
+        _totals.clear()  # a forked worker reports its own steps only
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': f'{script_name()} ({pid})'}})
+    args = {'function': function, 'cpu_ms': round(cpu * 1000, 3), 'peak_rss_mb': round(peak_rss_mb(), 1)}
+    if rows is not None:
+        args['rows'] = rows
+    events.append({'name': name, 'cat': category, 'ph': 'X', 'ts': start_us, 'dur': round(wall * 1e6, 1),
+                   'pid': pid, 'tid': threading.get_native_id(), 'args': args})
+    _append(events)
+
+    total = _totals.setdefault(name, [0, 0.0, None])
+    total[0] += 1
+    total[1] += wall
+    if rows is not None:
+        total[2] = (total[2] or 0) + rows
+
+class Span:
+    """Times the block it wraps; set .rows inside the block to record a row count."""
+    __slots__ = ('name', 'category', 'function', 'rows', '_start_us', '_wall', '_cpu')
+
+    def __init__(self, name, category, function=None):
+        self.name = name
+        self.category = category
+        self.function = function or name
+        self.rows = None
+
+    def __enter__(self):
+        self._start_us = time.time_ns() // 1000
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        _record(self.name, self.category, self.function, self._start_us, wall, cpu, self.rows)
+        return False
+
+class _NoSpan:
+    """What span() returns when tracing is off."""
+    __slots__ = ()
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+_NO_SPAN = _NoSpan()
+
+def span(name):
+    """Context manager timing a block as step name: with span('read') as step: ...; step.rows = n"""
+    if not ENABLED:
+        return _NO_SPAN
+    return Span(name, script_name())
+
+def traced(name, rows=count_rows):
+    """Decorator timing every call of a function as step name.
+
+    rows turns the function's result into a row count (count_rows by default, None for no
+    count); a function that returns nothing is counted by its first argument instead. With
+    tracing off the function is returned unchanged.
+    """
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        category = script_name() if fn.__module__ == '__main__' else fn.__module__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with Span(name, category, fn.__qualname__) as step:
+                result = fn(*args, **kwargs)
+                if rows is not None:
+                    step.rows = rows(result) if result is not None or not args else count_rows(args[0])
+            return result
+        return wrapper
+    return decorate
+
+def summary_line():
+    """One line with every step's time and rows in this process, and its peak memory."""
+    parts = []
+    for name, (calls, wall, rows) in _totals.items():
+        part = f"{name} {wall:.2f}s"
+        if calls > 1:
+            part += f" x{calls}"
+        if rows is not None:
+            part += f" ({rows} rows)"
+        parts.append(part)
+    return f"⏱️  {script_name()}: " + ' | '.join(parts) + f" | peak {peak_rss_mb():.0f} MB -> {TRACE_PATH}"
+
+def _print_summary():
+    if _totals and _process_named == os.getpid():
+        print(summary_line())
+
+if ENABLED:
+    atexit.register(_print_summary)